@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from app.config import settings
+from app.core.profiling import profile_store
+from app.services.jobs import job_manager
+from typing import Any, Dict, Optional
+import hmac
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Hide the admin endpoints unless profiling is on, and check the admin token when one is configured"""
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.admin_token and not hmac.compare_digest(x_admin_token or "", settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/admin/profiles")
+async def list_profiles():
+    """Summaries of the most recent slow-job profiles"""
+    return {
+        "profiling_enabled": settings.profiling_enabled,
+        "threshold_seconds": settings.profiling_threshold_seconds,
+        "profiles": profile_store.summaries()
+    }
+
+
+@router.get("/admin/profiles/{job_id}")
+async def get_profile(job_id: str) -> Dict[str, Any]:
+    """Full profile of a slow fact-check or upload job: stacks, task dump and loop lag"""
+    profile = profile_store.get(job_id)
+    if profile is None:
+        job = job_manager.get_job(job_id)
+        profile = job.profile if job else None
+
+    if profile is None:
+        raise HTTPException(status_code=404, detail="No profile recorded for this job")
+    return profile
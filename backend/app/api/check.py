@@ -1,8 +1,18 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Header, Request
 from app.models.requests import FactCheckRequest
-from app.models.responses import JobResponse, JobStatus
+from app.models.responses import FactCheckResult, JobResponse, JobStatus
 from app.services.jobs import job_manager
 from app.services.llm import fact_check_service
+from app.config import settings
+from app.core.metrics import CHECK_SECONDS
+from app.core.tracing import start_job_span
+from app.core.profiling import profile_job
+from app.core.scheduler import llm_scheduler
+from app.core.deadline import DeadlineExceeded, job_deadline
+from opentelemetry import trace
+from typing import Optional
+import asyncio
+import time
 import uuid
 import logging
 
@@ -10,28 +20,79 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-async def process_fact_check(job_id: str, request: FactCheckRequest):
+def client_id(http_request: Request, api_key: Optional[str]) -> str:
+    """Who a submission is accounted to for fair scheduling: its API key if the server knows it, else its address"""
+    if api_key and api_key in settings.client_api_keys:
+        return f"key:{api_key}"
+    return f"addr:{http_request.client.host if http_request.client else 'unknown'}"
+
+
+async def run_fact_check(job_id: str, request: FactCheckRequest) -> FactCheckResult:
+    """The fact-check pipeline of one job, bounded by its deadline"""
+    deadline = settings.job_deadline_seconds
+    if request.deadline_seconds:
+        deadline = min(request.deadline_seconds, deadline) if deadline else request.deadline_seconds
+    
+    async with profile_job(
+        job_id, "fact_check", on_profile=lambda profile: job_manager.attach_profile(job_id, profile)
+    ):
+        async with job_deadline(deadline):
+            # Update job status to running
+            job_manager.update_job(job_id, status=JobStatus.RUNNING, progress=10)
+            
+            # Process the fact-check
+            return await fact_check_service.check_claim(request)
+
+
+async def process_fact_check(job_id: str, request: FactCheckRequest, client: str = "anonymous"):
     """Background task to process fact-check request"""
-    try:
-        # Update job status to running
-        job_manager.update_job(job_id, status=JobStatus.RUNNING, progress=10)
-        
-        # Process the fact-check
-        result = await fact_check_service.check_claim(request)
-        
-        # Complete the job
-        job_manager.complete_job(job_id, result)
-        logger.info(f"Fact-check job {job_id} completed successfully")
-        
-    except Exception as e:
-        logger.error(f"Fact-check job {job_id} failed: {str(e)}")
-        job_manager.fail_job(job_id, str(e))
+    job = job_manager.get_job(job_id)
+    if job is None or job.status == JobStatus.CANCELLED:
+        logger.info(f"Fact-check job {job_id} was cancelled before it started")
+        return
+    
+    span = start_job_span(
+        job_id, "fact_check", queued_at=job.created_at,
+        **{"input.type": request.type.value, "job.priority": request.priority}
+    )
+    started = time.perf_counter()
+    with trace.use_span(span, end_on_exit=True), llm_scheduler.job_context(request.priority, client) as lane:
+        span.set_attribute("job.lane", lane)
+        labels = {"input_type": request.type.value, "lane": lane}
+        try:
+            # Its own task so that cancelling the job stops the pipeline wherever it is waiting
+            task = asyncio.create_task(run_fact_check(job_id, request))
+            job_manager.track_task(job_id, task)
+            result = await task
+            
+            # Complete the job
+            await job_manager.complete_job(job_id, result)
+            CHECK_SECONDS.labels(status="completed", **labels).observe(time.perf_counter() - started)
+            logger.info(f"Fact-check job {job_id} completed successfully")
+            
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # The server is shutting down, not a cancelled job
+                raise
+            span.set_status(trace.StatusCode.ERROR, "Cancelled")
+            CHECK_SECONDS.labels(status="cancelled", **labels).observe(time.perf_counter() - started)
+            logger.info(f"Fact-check job {job_id} stopped after cancellation")
+            
+        except Exception as e:
+            logger.error(f"Fact-check job {job_id} failed: {str(e)}")
+            span.record_exception(e)
+            span.set_status(trace.StatusCode.ERROR, str(e))
+            job_manager.fail_job(job_id, str(e))
+            status = "timeout" if isinstance(e, DeadlineExceeded) else "failed"
+            CHECK_SECONDS.labels(status=status, **labels).observe(time.perf_counter() - started)
 
 
 @router.post("/check", response_model=JobResponse)
 async def submit_fact_check(
     request: FactCheckRequest, 
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    http_request: Request,
+    x_api_key: Optional[str] = Header(None)
 ):
     """Submit a fact-check request and return a job ID for tracking"""
     try:
@@ -42,9 +103,9 @@ async def submit_fact_check(
         job_manager.create_job(job_id, estimated_seconds=30)
         
         # Schedule background processing
-        background_tasks.add_task(process_fact_check, job_id, request)
+        background_tasks.add_task(process_fact_check, job_id, request, client_id(http_request, x_api_key))
         
-        logger.info(f"Fact-check job {job_id} queued for request: {request.type}")
+        logger.info(f"Fact-check job {job_id} queued in the {request.priority} lane for request: {request.type}")
         
         return JobResponse(
             job_id=job_id,
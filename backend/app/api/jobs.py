@@ -1,31 +1,90 @@
-from fastapi import APIRouter, HTTPException
-from app.models.responses import JobStatusResponse
-from app.services.jobs import job_manager
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from app.models.responses import JobStatus, JobStatusResponse
+from app.services.jobs import FINISHED_STATUSES, job_manager, Job
+from app.utils.http import FINAL_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, etag_matches, not_modified
+from typing import Optional, Sequence
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+JOB_FIELDS = ("job_id", "status", "result", "error", "progress")
+
+
+async def serialize_job(job: Job, fields: Sequence[str] = JOB_FIELDS) -> bytes:
+    """Encode the requested job fields, splicing in the result serialized at completion"""
+    parts = []
+    for field in fields:
+        if field == "result":
+            value = await job_manager.load_result(job) or b"null"
+        else:
+            value = orjson.dumps(getattr(job, field))
+        parts.append(b'"%s":%s' % (field.encode(), value))
+    return b"{" + b",".join(parts) + b"}"
+
 
 @router.get("/job/{job_id}", response_model=JobStatusResponse)
-async def get_job_status(job_id: str):
+async def get_job_status(
+    job_id: str,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated subset of job_id,status,result,error,progress, e.g. status,progress"
+    ),
+    if_none_match: Optional[str] = Header(None)
+):
     """Get the status of a background job"""
     try:
+        selected = JOB_FIELDS
+        if fields:
+            selected = tuple(field.strip() for field in fields.split(",") if field.strip())
+            unknown = [field for field in selected if field not in JOB_FIELDS]
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {list(JOB_FIELDS)}"
+                )
+        
         job = job_manager.get_job(job_id)
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        return JobStatusResponse(
-            job_id=job_id,
-            status=job.status,
-            result=job.result,
-            error=job.error,
-            progress=job.progress
+        # Each field selection is its own representation of the job version
+        etag = f'"{job.job_id}.{job.version}.{"-".join(selected)}"'
+        cache_control = FINAL_CACHE_CONTROL if job.status in FINISHED_STATUSES else REVALIDATE_CACHE_CONTROL
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, cache_control)
+        
+        return Response(
+            content=await serialize_job(job, selected),
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": cache_control}
         )
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching job status for {job_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch job status")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch job status")
+
+
+@router.delete("/job/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job, freeing its LLM slot"""
+    try:
+        job = job_manager.cancel_job(job_id)
+        
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        if job.status != JobStatus.CANCELLED:
+            raise HTTPException(status_code=409, detail=f"Job already {job.status.value}")
+        
+        logger.info(f"Fact-check job {job_id} cancelled")
+        return Response(content=await serialize_job(job), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error cancelling job {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to cancel job")
@@ -1,10 +1,12 @@
 import traceback
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
 from app.models.requests import WhitelistSourceRequest
 from app.models.responses import UploadResponse
 from app.services.vector_store import vector_store_service
 from app.utils.web import web_scraper
+from app.utils.http import BOOT_ID, REVALIDATE_CACHE_CONTROL, etag_matches, not_modified
 import logging
 import uuid
 
@@ -13,11 +15,17 @@ router = APIRouter()
 
 
 @router.get("/library", response_model=List[dict])
-async def get_library():
+async def get_library(if_none_match: Optional[str] = Header(None)):
     """Get all uploaded documents and sources in the library"""
     try:
+        # The listing only changes when the library version does, so skip the scroll on a match
+        etag = f'"{BOOT_ID}.{vector_store_service.library_version}"'
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+        
+        # A failed listing raises rather than returning [], so it is never cached under this ETag
         sources = await vector_store_service.get_all_sources()
-        return sources
+        return ORJSONResponse(sources, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL})
         
     except Exception as e:
         logger.error(f"Error fetching library: {str(e)}")
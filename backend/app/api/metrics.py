@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from app.models.responses import JobStatus
+from app.services.jobs import job_manager
+from app.services.triage import triage_service
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+class PipelineStateCollector:
+    """Reads job and cache state at scrape time instead of mirroring it into gauges"""
+
+    def collect(self):
+        counts = job_manager.count_by_status()
+        jobs = GaugeMetricFamily("factguard_jobs", "Tracked fact-check jobs by status", labels=["status"])
+        for status, count in counts.items():
+            jobs.add_metric([status.value], count)
+        yield jobs
+
+        yield GaugeMetricFamily(
+            "factguard_queue_depth",
+            "Fact-check jobs waiting to start",
+            value=counts[JobStatus.QUEUED]
+        )
+
+        store = job_manager.get_stats()
+        yield GaugeMetricFamily(
+            "factguard_job_result_memory_bytes", "Serialized job results held in memory",
+            value=store["result_memory_bytes"]
+        )
+        yield CounterMetricFamily(
+            "factguard_job_results_spilled", "Job results moved to the spill directory", value=store["results_spilled"]
+        )
+        yield CounterMetricFamily("factguard_jobs_expired", "Jobs removed after their TTL", value=store["expired"])
+
+        triage = triage_service.get_stats()
+        decisions = CounterMetricFamily(
+            "factguard_triage_decisions", "Claims resolved at each triage step", labels=["decision"]
+        )
+        for decision, count in triage["decisions"].items():
+            decisions.add_metric([decision], count)
+        yield decisions
+
+        cache = triage["verdict_cache"]
+        hit_rates = GaugeMetricFamily(
+            "factguard_verdict_cache_hit_rate", "Verdict cache hit rate by lookup kind", labels=["kind"]
+        )
+        hit_rates.add_metric(["exact"], cache["hit_rate"])
+        hit_rates.add_metric(["semantic"], cache["semantic_hit_rate"])
+        hit_rates.add_metric(["overall"], cache["overall_hit_rate"])
+        yield hit_rates
+
+        yield GaugeMetricFamily("factguard_verdict_cache_size", "Cached verdicts", value=cache["size"])
+
+
+REGISTRY.register(PipelineStateCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from app.services.reranker import reranker_service
+from app.services.triage import triage_service
+from app.services.llm import fact_check_service
+from app.core.loop_monitor import loop_monitor
+from app.core.scheduler import llm_scheduler
+from app.services.jobs import job_manager
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_pipeline_stats():
+    """Get counters and latency for the retrieval pipeline stages"""
+    return {
+        "rerank": reranker_service.get_stats(),
+        "triage": triage_service.get_stats(),
+        "self_consistency": fact_check_service.get_consistency_stats(),
+        "event_loop": loop_monitor.get_stats(),
+        "jobs": job_manager.get_stats(),
+        "llm_scheduler": llm_scheduler.get_stats()
+    }
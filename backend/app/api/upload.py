@@ -3,6 +3,7 @@ from app.models.requests import UploadMetadata
 from app.models.responses import UploadResponse
 from app.services.document import document_service
 from app.config import settings
+from typing import Optional
 import uuid
 import logging
 
@@ -16,15 +17,17 @@ async def upload_document(
     source_name: str = Form(...),
     source_type: str = Form(...),
     description: str = Form(None),
-    is_trusted: bool = Form(True)
+    is_trusted: bool = Form(True),
+    index_numeric_columns: Optional[bool] = Form(None)
 ):
     """Upload and process a document (PDF, CSV, etc.)"""
     try:
         # Validate file size
-        if file.size and file.size > settings.max_upload_size:
+        max_size = settings.max_csv_upload_size if source_type == "csv" else settings.max_upload_size
+        if file.size and file.size > max_size:
             raise HTTPException(
                 status_code=413, 
-                detail=f"File too large. Maximum size is {settings.max_upload_size} bytes"
+                detail=f"File too large. Maximum size is {max_size} bytes"
             )
         
         # Validate file type
@@ -40,7 +43,8 @@ async def upload_document(
             source_name=source_name,
             source_type=source_type,
             description=description,
-            is_trusted=is_trusted
+            is_trusted=is_trusted,
+            index_numeric_columns=index_numeric_columns
         )
         
         # Generate upload ID
@@ -58,6 +62,8 @@ async def upload_document(
             filename=file.filename or "unknown",
             size=file.size or 0,
             chunks_processed=result.get("chunks_processed", 0),
+            duplicates_merged=result.get("duplicates_merged", 0),
+            dedup_ratio=result.get("dedup_ratio", 0.0),
             status="completed"
         )
         
@@ -1,24 +1,135 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional, Literal
 
 
 class Settings(BaseSettings):
     # Ollama Configuration
     ollama_base_url: str = "http://host.docker.internal:11434"
     ollama_model: str = "gemma2:2b"
+    llm_max_concurrency: int = 2  # Global limit on concurrent Ollama calls
+    ollama_timeout_seconds: Optional[float] = None  # Per HTTP request, jobs are also bounded by their deadline
+    
+    # LLM scheduling: weighted fair share of the Ollama slots between lanes and clients
+    llm_interactive_weight: float = 8.0
+    llm_batch_weight: float = 1.0
+    llm_interactive_client_limit: int = 4  # A client's interactive checks beyond this many running are run as batch
+    llm_client_weights: Dict[str, float] = {}  # By client, "key:<API key>" or "addr:<IP>"; unlisted weigh 1
+    client_api_keys: List[str] = []  # X-API-Key values accounted as their own client; others count by address
     
     # Qdrant Configuration  
+    vector_store_backend: Literal["server", "local"] = "server"
+    qdrant_path: Optional[str] = None  # Local backend storage path, None keeps it in memory
     qdrant_host: str = "host.docker.internal"
     qdrant_port: int = 6333
     qdrant_collection_name: str = "fact_guard_docs"
     
+    # Qdrant index tuning
+    qdrant_quantization: Literal["none", "scalar", "binary"] = "none"
+    qdrant_quantization_always_ram: bool = True
+    qdrant_quantization_rescore: bool = True
+    qdrant_quantization_oversampling: float = 2.0
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 100
+    qdrant_hnsw_ef: Optional[int] = None  # Search-time ef, None uses Qdrant's default
+    qdrant_hnsw_on_disk: bool = False
+    qdrant_on_disk_vectors: bool = False
+    qdrant_migrate_collection: bool = True  # Apply tuning changes to an existing collection
+    
+    # Retrieval
+    retrieval_score_threshold: float = 0.5  # Minimum dense similarity for a hit
+    hybrid_search_enabled: bool = True
+    lexical_candidates: int = 20
+    rrf_k: int = 60
+    
+    # Reranking
+    rerank_enabled: bool = True
+    rerank_model: Optional[str] = None  # FastEmbed cross-encoder, None uses embedding scores
+    rerank_candidates: int = 30
+    rerank_min_results: int = 2
+    rerank_score_gap: float = 0.15  # Cut the list, and stop scoring the tail, at score drops larger than this
+    rerank_budget_ms: int = 250
+    rerank_batch_size: int = 8
+    
+    # Ingest deduplication
+    dedup_enabled: bool = True
+    dedup_threshold: float = 0.85  # Estimated Jaccard similarity of word shingles
+    dedup_num_perm: int = 64
+    dedup_bands: int = 8
+    dedup_shingle_size: int = 5
+    
     # Application Settings
     log_level: str = "INFO"
     debug: bool = False
     max_upload_size: int = 10485760  # 10MB
     chunk_size: int = 500
     chunk_overlap: int = 100
+    chunking_mode: Literal["words", "tokens"] = "words"  # "tokens" sizes chunks with the embedding tokenizer
+    chunk_max_tokens: Optional[int] = None  # None fills the embedding model's input window
+    chunk_overlap_tokens: int = 64
+    
+    # Triage and verdict cache
+    triage_enabled: bool = True  # Answer obvious cases without an LLM call
+    # A claim has evidence when any result passes one of these, each on its own scorer's scale
+    triage_min_evidence_score: float = 0.55  # Dense cosine similarity
+    triage_min_rerank_score: float = 0.5  # Cross-encoder relevance (sigmoid), when rerank_model is set
+    triage_min_term_coverage: float = 0.6  # Share of the claim's terms in a lexical hit
+    verdict_cache_enabled: bool = True
+    verdict_cache_size: int = 5000
+    verdict_cache_ttl_seconds: int = 86400
+    semantic_cache_enabled: bool = True  # Reuse verdicts of paraphrased claims
+    semantic_cache_threshold: float = 0.92  # Minimum cosine similarity between claim embeddings
+    
+    # Self-consistency: sample the verdict several times and score agreement
+    self_consistency_enabled: bool = False
+    self_consistency_samples: int = 3  # Maximum LLM samples per claim
+    self_consistency_min_agreement: int = 2  # Stop sampling once this many verdicts agree
+    self_consistency_budget_ms: int = 30000  # Per-job budget after which no more samples are awaited
+    self_consistency_temperature: float = 0.7
     
+    # URL checks
+    url_claim_candidates: int = 15  # Sentences kept by the heuristic prefilter
+    url_max_claims: int = 5
+    url_claim_llm_selection: bool = True  # Let the LLM pick from the prefiltered sentences
+    
+    # CSV ingestion
+    max_csv_upload_size: int = 209715200  # 200MB, CSVs are streamed so can exceed max_upload_size
+    csv_batch_rows: int = 5000  # Rows read, embedded and upserted per batch
+    csv_rows_per_chunk: int = 20  # Upper bound; chunks also stop at chunk_size words, or the token window in tokens mode
+    csv_index_numeric: bool = False  # Default for indexing numeric columns for exact lookup
+    numeric_lookup_enabled: bool = True  # Match numbers in the query against indexed numeric columns
+    numeric_lookup_candidates: int = 10
+    numeric_lookup_weight: float = 0.5  # RRF weight of the numeric ranking relative to dense and lexical
+    numeric_lookup_min_value: float = 10.0  # Smaller integers ("1", "3 times") are too common to look up
+    
+    # Tracing
+    tracing_exporter: Literal["none", "otlp", "console", "file"] = "none"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_file_path: str = "./traces.jsonl"
+    tracing_sample_ratio: float = 1.0  # Fraction of jobs traced
+    
+    # Slow job profiling
+    profiling_enabled: bool = False
+    profiling_threshold_seconds: float = 30.0  # Jobs running longer than this get a sampling profile
+    profiling_interval_ms: float = 10.0  # Stack sampling interval
+    profiling_max_samples: int = 30000  # Per job, bounds the cost of a job that never finishes
+    profiling_lag_interval_ms: float = 100.0  # Event-loop lag probe interval
+    profiling_lag_threshold_ms: float = 50.0  # Lag above this counts as the loop being blocked
+    profiling_max_profiles: int = 50
+    admin_token: Optional[str] = None  # Required as X-Admin-Token by /api/admin when set
+    
+    # Event-loop blocking detector
+    loop_monitor_mode: Literal["off", "production", "debug"] = "off"  # debug also logs every stack
+    loop_block_threshold_ms: float = 100.0  # Report the loop being stuck for longer than this
+    loop_monitor_interval_ms: float = 20.0  # Heartbeat period
+    loop_monitor_recent_blocks: int = 100
+    
+    # Job storage
+    job_ttl_seconds: int = 3600  # Jobs and their results are dropped this long after submission
+    job_expiry_interval_seconds: float = 30.0
+    job_result_memory_mb: int = 64  # Older results beyond this are spilled to disk
+    job_spill_dir: Optional[str] = None  # Defaults to <tmp>/factguard-jobs
+    job_deadline_seconds: float = 300.0  # Fact-checks still running after this are abandoned, 0 disables
+
     # External APIs (optional)
     pubmed_api_key: Optional[str] = None
     crossref_email: Optional[str] = None
@@ -1,7 +1,26 @@
 import re
-from typing import List
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Callable, Iterator, List, Optional, Tuple
 from app.config import settings
 
+SENTENCE_BOUNDARY = re.compile(r'[.!?]+\s+')
+# Splits after terminal punctuation, keeping it with the sentence
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+@dataclass
+class TextChunk:
+    text: str
+    start_char: int  # Offsets into the cleaned text
+    end_char: int
+    word_count: int
+    token_ids: Optional[List[int]] = None  # Model input ids, set by token-based chunking
+    page: int = 0  # First and last page, 0 when unknown
+    page_end: int = 0
+    headings: List[str] = field(default_factory=list)  # Section heading path
+
 
 class TextChunker:
     def __init__(self):
@@ -10,91 +29,362 @@ class TextChunker:
     
     def chunk_text(self, text: str) -> List[str]:
         """Chunk text into overlapping segments"""
+        return [chunk.text for chunk in self.iter_chunks(text)]
+    
+    def iter_chunks(self, text: str) -> Iterator[TextChunk]:
+        """Yield overlapping chunks with their character offsets.
+        
+        Sentences are located once; chunk boundaries and overlap are computed
+        over word offsets using prefix sums of sentence word counts.
+        """
         if not text.strip():
-            return []
+            return
         
         # Clean the text
         text = self._clean_text(text)
         
-        # Try sentence-aware chunking first
-        sentences = self._split_into_sentences(text)
-        chunks = self._create_sentence_chunks(sentences)
+        spans = list(self._sentence_spans(text))
+        sentences = [text[start:end] for start, end in spans]
+        # Cleaned text is single-spaced, so words are spaces plus one
+        prefix = [0, *accumulate(sentence.count(' ') + 1 for sentence in sentences)]
         
-        # If chunks are still too large, fall back to token-based splitting
-        final_chunks = []
-        for chunk in chunks:
-            if len(chunk.split()) <= self.chunk_size:
-                final_chunks.append(chunk)
+        for first, last in self._sentence_chunk_ranges(prefix):
+            word_count = prefix[last] - prefix[first]
+            if word_count <= self.chunk_size:
+                yield TextChunk(
+                    text=' '.join(sentences[first:last]),
+                    start_char=spans[first][0],
+                    end_char=spans[last - 1][1],
+                    word_count=word_count
+                )
             else:
                 # Split large chunks further
-                sub_chunks = self._token_based_split(chunk)
-                final_chunks.extend(sub_chunks)
+                yield from self._token_based_split(sentences[first:last], spans[first:last])
+    
+    def iter_token_chunks(
+        self,
+        text: str,
+        tokenizer,
+        max_tokens: int,
+        overlap_tokens: int = 0
+    ) -> Iterator[TextChunk]:
+        """Yield chunks that fill but never exceed the embedding model's input window.
+        
+        ``tokenizer`` is the model's ``tokenizers.Tokenizer`` without truncation.
+        Sentences are tokenized in one batch; each chunk carries the full model
+        input ids (special tokens included) so they can be embedded directly.
+        """
+        if not text.strip():
+            return
+        
+        text = self._clean_text(text)
+        prefix_ids, suffix_ids = self._special_token_ids(tokenizer)
+        budget = max_tokens - len(prefix_ids) - len(suffix_ids)
+        if budget <= overlap_tokens:
+            raise ValueError("max_tokens must leave room for content beyond the overlap")
+        
+        spans = []
+        position = 0
+        for sentence in SENTENCE_END.split(text):
+            spans.append((position, position + len(sentence)))
+            position += len(sentence) + 1
+        
+        encodings = tokenizer.encode_batch(
+            [text[start:end] for start, end in spans], add_special_tokens=False
+        )
+        
+        def make_chunk(start: int, end: int, content_ids: List[int]) -> TextChunk:
+            chunk_text = text[start:end]
+            return TextChunk(
+                text=chunk_text,
+                start_char=start,
+                end_char=end,
+                word_count=chunk_text.count(' ') + 1,
+                token_ids=prefix_ids + content_ids + suffix_ids
+            )
+        
+        current: List[int] = []  # Sentence indexes in the pending chunk
+        current_tokens = 0
+        for index, encoding in enumerate(encodings):
+            length = len(encoding.ids)
+            if length == 0:
+                continue
+            
+            if current and current_tokens + length > budget:
+                yield make_chunk(
+                    spans[current[0]][0], spans[current[-1]][1],
+                    [token for i in current for token in encodings[i].ids]
+                )
+                
+                # Carry trailing sentences that fit into the overlap
+                overlap: List[int] = []
+                overlap_count = 0
+                for i in reversed(current):
+                    if overlap_count + len(encodings[i].ids) > overlap_tokens:
+                        break
+                    overlap.append(i)
+                    overlap_count += len(encodings[i].ids)
+                current = overlap[::-1]
+                current_tokens = overlap_count
+                
+                # Overlap must still leave room for the incoming sentence
+                while current and current_tokens + length > budget:
+                    current_tokens -= len(encodings[current.pop(0)].ids)
+            
+            if length > budget:
+                # A single sentence longer than the window is split between words
+                yield from self._split_long_sentence(
+                    encoding, spans[index][0], budget, overlap_tokens, make_chunk
+                )
+                current = []
+                current_tokens = 0
+                continue
+            
+            current.append(index)
+            current_tokens += length
+        
+        if current:
+            yield make_chunk(
+                spans[current[0]][0], spans[current[-1]][1],
+                [token for i in current for token in encodings[i].ids]
+            )
+    
+    @staticmethod
+    def _split_long_sentence(encoding, offset: int, budget: int, overlap_tokens: int, make_chunk):
+        """Token windows over one sentence, moved to word boundaries where possible"""
+        word_ids = encoding.word_ids
+        length = len(encoding.ids)
+        
+        def starts_word(i: int) -> bool:
+            return i == 0 or i == length or word_ids[i] != word_ids[i - 1]
+        
+        i = 0
+        while i < length:
+            end = min(i + budget, length)
+            boundary = end
+            while boundary > i and not starts_word(boundary):
+                boundary -= 1
+            if boundary > i:
+                end = boundary
+            
+            yield make_chunk(
+                offset + encoding.offsets[i][0],
+                offset + encoding.offsets[end - 1][1],
+                encoding.ids[i:end]
+            )
+            if end == length:
+                break
+            
+            i = max(end - overlap_tokens, i + 1)
+            while i < end and not starts_word(i):
+                i += 1
+    
+    @staticmethod
+    def _special_token_ids(tokenizer) -> Tuple[List[int], List[int]]:
+        """Special token ids the tokenizer adds before and after a single sequence"""
+        encoding = tokenizer.encode("a", add_special_tokens=True)
+        mask = encoding.special_tokens_mask
+        content = [i for i, special in enumerate(mask) if not special]
+        return encoding.ids[:content[0]], encoding.ids[content[-1] + 1:]
+    
+    def iter_document_chunks(
+        self,
+        document,
+        split: Optional[Callable[[str], Iterator[TextChunk]]] = None,
+        split_table: Optional[Callable[[str], Iterator[TextChunk]]] = None
+    ) -> Iterator[TextChunk]:
+        """Chunk a Docling document along its structure.
+        
+        Text is grouped by section and split with ``split`` (``iter_chunks`` by
+        default); tables are exported as markdown and split with ``split_table``
+        (``iter_table_chunks`` by default), which keeps them whole unless they
+        are larger than a chunk. Every chunk carries its page range and heading
+        path.
+        """
+        from docling_core.types.doc import SectionHeaderItem, TableItem, TextItem, TitleItem, ListItem
+        
+        split = split or self.iter_chunks
+        split_table = split_table or self.iter_table_chunks
+        headings: List[Tuple[int, str]] = []
+        paragraphs: List[Tuple[str, int]] = []  # (cleaned text, page)
+        
+        def flush() -> Iterator[TextChunk]:
+            if not paragraphs:
+                return
+            # Cleaned paragraphs joined by single spaces stay unchanged by cleaning,
+            # so chunk offsets map straight back to paragraphs and their pages
+            starts = [0, *accumulate(len(text) + 1 for text, _ in paragraphs)]
+            pages = [page for _, page in paragraphs]
+            path = [heading for _, heading in headings]
+            for chunk in split(' '.join(text for text, _ in paragraphs)):
+                chunk.page = pages[bisect_right(starts, chunk.start_char) - 1]
+                chunk.page_end = pages[bisect_right(starts, max(chunk.end_char - 1, 0)) - 1]
+                chunk.headings = path
+                yield chunk
+            paragraphs.clear()
+        
+        for item, _ in document.iterate_items():
+            page = item.prov[0].page_no if getattr(item, "prov", None) else 0
+            
+            if isinstance(item, (TitleItem, SectionHeaderItem)):
+                yield from flush()
+                level = 0 if isinstance(item, TitleItem) else item.level
+                while headings and headings[-1][0] >= level:
+                    headings.pop()
+                headings.append((level, self._clean_text(item.text)))
+            
+            elif isinstance(item, TableItem):
+                yield from flush()
+                last_page = item.prov[-1].page_no if item.prov else page
+                for chunk in split_table(item.export_to_markdown(document)):
+                    chunk.page = page
+                    chunk.page_end = last_page
+                    chunk.headings = [heading for _, heading in headings]
+                    yield chunk
+            
+            elif isinstance(item, TextItem):
+                text = self._clean_text(item.text)
+                if isinstance(item, ListItem):
+                    text = f"{item.marker} {text}"
+                if text:
+                    paragraphs.append((text, page))
+        
+        yield from flush()
+    
+    def iter_table_chunks(
+        self,
+        markdown: str,
+        tokenizer=None,
+        max_tokens: Optional[int] = None
+    ) -> Iterator[TextChunk]:
+        """Keep a markdown table whole, or split it by rows repeating the header.
+        
+        Rows are sized in words against ``chunk_size``, or with ``tokenizer``
+        in tokens against ``max_tokens``; token-sized chunks carry their model
+        input ids like ``iter_token_chunks``.
+        """
+        if not markdown.strip():
+            return
+        
+        lines = markdown.splitlines()
+        if tokenizer is None:
+            encodings = None
+            lengths = [len(line.split()) for line in lines]
+            budget = self.chunk_size
+        else:
+            prefix_ids, suffix_ids = self._special_token_ids(tokenizer)
+            encodings = tokenizer.encode_batch(lines, add_special_tokens=False)
+            lengths = [len(encoding.ids) for encoding in encodings]
+            budget = max_tokens - len(prefix_ids) - len(suffix_ids)
         
-        return final_chunks
+        def make_chunk(indexes: List[int]) -> TextChunk:
+            chunk_text = '\n'.join(lines[i] for i in indexes)
+            token_ids = None
+            if encodings is not None:
+                # A single row longer than the window is cut off as the model would
+                content_ids = [token for i in indexes for token in encodings[i].ids][:budget]
+                token_ids = prefix_ids + content_ids + suffix_ids
+            return TextChunk(
+                text=chunk_text,
+                start_char=0,
+                end_char=len(chunk_text),
+                word_count=len(chunk_text.split()),
+                token_ids=token_ids
+            )
+        
+        if sum(lengths) <= budget:
+            yield make_chunk(list(range(len(lines))))
+            return
+        
+        header = [0, 1][:len(lines)]
+        header_length = sum(lengths[i] for i in header)
+        current: List[int] = []
+        current_length = header_length
+        for row in range(len(header), len(lines)):
+            if current and current_length + lengths[row] > budget:
+                yield make_chunk(header + current)
+                current = []
+                current_length = header_length
+            current.append(row)
+            current_length += lengths[row]
+        
+        if current:
+            yield make_chunk(header + current)
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove excessive newlines but keep paragraph breaks
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        return text.strip()
+        # Collapse all whitespace runs (including newlines) to single spaces
+        return ' '.join(text.split())
     
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """Split text into sentences"""
+    def _sentence_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) offsets of non-empty sentences in cleaned text"""
         # Simple sentence splitting (could be enhanced with nlp libraries)
-        sentences = re.split(r'[.!?]+\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        start = 0
+        for boundary in SENTENCE_BOUNDARY.finditer(text):
+            span = self._strip_span(text, start, boundary.start())
+            if span:
+                yield span
+            start = boundary.end()
+        
+        span = self._strip_span(text, start, len(text))
+        if span:
+            yield span
     
-    def _create_sentence_chunks(self, sentences: List[str]) -> List[str]:
-        """Create chunks from sentences with overlap"""
-        chunks = []
-        current_chunk = []
-        current_word_count = 0
-        
-        for sentence in sentences:
-            sentence_words = len(sentence.split())
+    @staticmethod
+    def _strip_span(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Trim surrounding whitespace from a span, None if nothing is left"""
+        piece = text[start:end]
+        stripped = piece.strip()
+        if not stripped:
+            return None
+        start += len(piece) - len(piece.lstrip())
+        return start, start + len(stripped)
+    
+    def _sentence_chunk_ranges(self, prefix: List[int]) -> Iterator[tuple]:
+        """Yield [first, last) sentence ranges for chunks with sentence overlap"""
+        sentence_total = len(prefix) - 1
+        first = 0
+        
+        for current in range(sentence_total):
+            chunk_words = prefix[current] - prefix[first]
+            sentence_words = prefix[current + 1] - prefix[current]
             
             # If adding this sentence would exceed chunk size, finalize current chunk
-            if current_word_count + sentence_words > self.chunk_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                
-                # Start new chunk with overlap
-                overlap_words = 0
-                overlap_sentences = []
+            if chunk_words + sentence_words > self.chunk_size and current > first:
+                yield first, current
                 
-                # Add sentences from the end for overlap
-                for prev_sentence in reversed(current_chunk):
-                    sentence_word_count = len(prev_sentence.split())
-                    if overlap_words + sentence_word_count <= self.overlap:
-                        overlap_sentences.insert(0, prev_sentence)
-                        overlap_words += sentence_word_count
-                    else:
-                        break
-                
-                current_chunk = overlap_sentences
-                current_word_count = overlap_words
-            
-            current_chunk.append(sentence)
-            current_word_count += sentence_words
+                # Start new chunk with overlap: walk back from the end while sentences fit
+                new_first = current
+                while new_first > first and prefix[current] - prefix[new_first - 1] <= self.overlap:
+                    new_first -= 1
+                first = new_first
         
         # Add final chunk if there's content
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-        
-        return chunks
+        if sentence_total > first:
+            yield first, sentence_total
     
-    def _token_based_split(self, text: str) -> List[str]:
+    def _token_based_split(self, sentences: List[str],
+                           spans: List[Tuple[int, int]]) -> Iterator[TextChunk]:
         """Fall back to simple token-based splitting for large chunks"""
-        words = text.split()
-        chunks = []
+        joined = ' '.join(sentences)
+        words = joined.split(' ')
+        # Word i starts at word_lengths[i] + i in the joined string (one space per word)
+        word_lengths = [0, *accumulate(map(len, words))]
+        sentence_offsets = [0, *accumulate(len(sentence) + 1 for sentence in sentences)]
         
-        for i in range(0, len(words), self.chunk_size - self.overlap):
-            chunk_words = words[i:i + self.chunk_size]
-            chunks.append(' '.join(chunk_words))
+        def text_offset(joined_offset: int) -> int:
+            index = bisect_right(sentence_offsets, joined_offset) - 1
+            return spans[index][0] + joined_offset - sentence_offsets[index]
         
-        return chunks
+        for i in range(0, len(words), self.chunk_size - self.overlap):
+            end = min(i + self.chunk_size, len(words))
+            yield TextChunk(
+                text=' '.join(words[i:end]),
+                start_char=text_offset(word_lengths[i] + i),
+                end_char=text_offset(word_lengths[end] + end - 2) + 1,
+                word_count=end - i
+            )
 
 
 # Global chunker instance
-text_chunker = TextChunker()
\ No newline at end of file
+text_chunker = TextChunker()
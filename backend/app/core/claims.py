@@ -0,0 +1,78 @@
+from typing import List, Tuple
+from app.utils.text import clean_text, is_valid_claim
+import re
+
+# Sentence ends, keeping the punctuation so questions can be told apart
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+# Signals that a sentence states something checkable
+NUMBER_PATTERN = re.compile(r"\d")
+PROPER_NOUN_PATTERN = re.compile(r"(?<!^)(?<![.!?] )\b[A-Z][a-z]+")
+FACTUAL_TERMS = {
+    'percent', 'million', 'billion', 'thousand', 'increase', 'increased', 'decrease',
+    'decreased', 'rose', 'fell', 'according', 'study', 'report', 'reported', 'data',
+    'found', 'shows', 'showed', 'caused', 'causes', 'killed', 'died', 'deaths', 'cases',
+    'announced', 'approved', 'banned', 'law', 'record', 'highest', 'lowest', 'more', 'less',
+    'first', 'largest', 'never', 'always', 'every', 'most'
+}
+
+# Opinion, hedging and page furniture that is not worth checking
+OPINION_PATTERN = re.compile(
+    r"\b(i|we|you)\s+(think|believe|feel|hope|guess)\b|\bin my opinion\b|"
+    r"\b(click|subscribe|sign up|log in|cookies?|newsletter|share this|read more|advertisement)\b",
+    re.IGNORECASE
+)
+
+
+class ClaimExtractor:
+    """Cheap heuristic prefilter for check-worthy sentences in page text"""
+    
+    def __init__(self, min_words: int = 6, max_words: int = 60):
+        self.min_words = min_words
+        self.max_words = max_words
+    
+    def extract_candidates(self, text: str, limit: int = 15) -> List[str]:
+        """Return up to ``limit`` check-worthy sentences, in page order"""
+        scored: List[Tuple[float, int, str]] = []
+        seen = set()
+        
+        sentences = (sentence.strip() for sentence in SENTENCE_BOUNDARY.split(clean_text(text)))
+        for position, sentence in enumerate(sentence for sentence in sentences if sentence):
+            # The last fragment of a page may lack closing punctuation
+            if not re.search(r'[.!?]$', sentence):
+                sentence += "."
+            
+            key = sentence.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            score = self.score_sentence(sentence)
+            if score > 0:
+                scored.append((score, position, sentence))
+        
+        best = sorted(scored, key=lambda item: (-item[0], item[1]))[:limit]
+        return [sentence for _, _, sentence in sorted(best, key=lambda item: item[1])]
+    
+    def score_sentence(self, sentence: str) -> float:
+        """Check-worthiness score, 0 for sentences that should be skipped"""
+        if not is_valid_claim(sentence) or sentence.endswith("?"):
+            return 0.0
+        
+        words = sentence.split()
+        if not self.min_words <= len(words) <= self.max_words:
+            return 0.0
+        if OPINION_PATTERN.search(sentence):
+            return 0.0
+        
+        terms = {word.strip('.,;:!?"\'()').lower() for word in words}
+        score = 1.0
+        if NUMBER_PATTERN.search(sentence):
+            score += 2.0
+        score += min(len(PROPER_NOUN_PATTERN.findall(sentence)), 3) * 0.5
+        score += min(len(terms & FACTUAL_TERMS), 3) * 0.5
+        return score
+
+
+# Global claim extractor instance
+claim_extractor = ClaimExtractor()
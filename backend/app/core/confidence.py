@@ -1,9 +1,19 @@
-from typing import List, Dict, Any
-from app.core.sources import source_manager
+from typing import List, Dict, Any, Optional
+from app.core.sources import SourceManager, source_manager
+import numpy as np
+
+# Quality bonus per source type
+TYPE_BONUSES = {
+    "paper": 0.3,     # Academic papers get highest bonus
+    "webpage": 0.1,   # Regular webpages get small bonus
+    "news": 0.2,      # News sources get medium bonus
+    "user_upload": 0.0  # User uploads are neutral
+}
 
 
 class ConfidenceScorer:
-    def __init__(self):
+    def __init__(self, sources: Optional[SourceManager] = None):
+        self.source_manager = sources or source_manager
         self.base_confidence = 0.5
         self.source_weight = 0.3
         self.consensus_weight = 0.2
@@ -39,32 +49,23 @@ class ConfidenceScorer:
         if not sources:
             return 0.0
         
-        total_quality = 0.0
-        for source in sources:
-            url = source.get("url", "")
-            
-            # Base quality for any source
-            quality = 0.3
-            
-            # Trusted source bonus
-            if source_manager.is_trusted_source(url):
-                priority = source_manager.get_source_priority(url)
-                # Higher priority (lower number) gets higher quality score
-                quality += 0.4 * (5 - min(priority, 4)) / 4
-            
-            # Source type bonuses
-            source_type = source.get("type", "webpage")
-            type_bonuses = {
-                "paper": 0.3,     # Academic papers get highest bonus
-                "webpage": 0.1,   # Regular webpages get small bonus
-                "news": 0.2,      # News sources get medium bonus
-                "user_upload": 0.0  # User uploads are neutral
-            }
-            quality += type_bonuses.get(source_type, 0.0)
-            
-            total_quality += quality
+        return min(float(self.source_quality_scores(sources).mean()), 1.0)
+    
+    def source_quality_scores(self, sources: List[Dict[str, Any]]) -> np.ndarray:
+        """Quality of each source, computed over the whole list at once"""
+        trusted, priority = self.source_manager.lookup_many(source.get("url", "") for source in sources)
+        
+        # Base quality for any source, plus a trusted source bonus where higher
+        # priority (lower number) gets a higher score
+        quality = 0.3 + trusted * (0.4 * (5 - np.minimum(priority, 4)) / 4)
         
-        return min(total_quality / len(sources), 1.0)
+        # Source type bonuses
+        quality += np.fromiter(
+            (TYPE_BONUSES.get(source.get("type", "webpage"), 0.0) for source in sources),
+            dtype=float,
+            count=len(sources)
+        )
+        return quality
     
     def calculate_verdict_consensus(self, verdicts: List[str]) -> float:
         """Calculate how much the sources agree on a verdict"""
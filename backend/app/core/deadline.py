@@ -0,0 +1,48 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+import asyncio
+import time
+
+# time.monotonic() by which the current job must finish, None when unbounded
+current_deadline: ContextVar[Optional[float]] = ContextVar("job_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """A job ran past its deadline and was abandoned"""
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current job's deadline, None without one"""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def bounded_by_deadline(deadline: float) -> float:
+    """The earlier of a stage's own deadline and the job's"""
+    job_deadline = current_deadline.get()
+    return deadline if job_deadline is None else min(deadline, job_deadline)
+
+
+@asynccontextmanager
+async def job_deadline(seconds: Optional[float]):
+    """Cancel whatever the enclosed block is awaiting once the deadline passes.
+
+    Cancellation reaches every await in the job: LLM slot waits leave the
+    queue, in-flight Ollama requests are closed, and tasks gathered by the
+    pipeline are cancelled with it. Raises DeadlineExceeded.
+    """
+    if not seconds:
+        yield
+        return
+
+    token = current_deadline.set(time.monotonic() + seconds)
+    try:
+        async with asyncio.timeout(seconds):
+            yield
+    except TimeoutError:
+        raise DeadlineExceeded(f"Fact-check exceeded its {seconds:g}s deadline")
+    finally:
+        current_deadline.reset(token)
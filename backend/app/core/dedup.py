@@ -0,0 +1,122 @@
+from typing import Hashable, List, Dict, Optional, Tuple
+from app.config import settings
+import numpy as np
+import threading
+import zlib
+
+# Prime just above 2**32 so a * h + b stays inside uint64 for 32-bit hashes
+_PRIME = np.uint64(4294967311)
+
+
+class NearDuplicateIndex:
+    """MinHash signatures with a banded LSH index for near-duplicate chunks.
+
+    Each chunk is indexed under a group and only matches chunks of the same
+    group, so chunks that must stay apart (e.g. trusted and untrusted
+    sources) are never merged.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 8,
+        shingle_size: int = 5,
+        threshold: float = 0.85,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._groups: Dict[str, Hashable] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature over word shingles"""
+        words = text.lower().split()
+        size = min(self.shingle_size, len(words)) or 1
+        shingles = {
+            " ".join(words[i:i + size])
+            for i in range(max(len(words) - size + 1, 1))
+        }
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1)
+
+    def find_duplicate(self, signature: np.ndarray, group: Hashable = None) -> Optional[str]:
+        """Return the ID of an indexed chunk of the same group estimated to be a near-duplicate"""
+        with self._lock:
+            best_id, best_similarity = None, self.threshold
+            seen = set()
+            for key in self._band_keys(signature):
+                for doc_id in self._buckets.get(key, ()):
+                    if doc_id in seen:
+                        continue
+                    seen.add(doc_id)
+                    if self._groups.get(doc_id) != group:
+                        continue
+
+                    similarity = float(np.mean(self._signatures[doc_id] == signature))
+                    if similarity >= best_similarity:
+                        best_id, best_similarity = doc_id, similarity
+
+            return best_id
+
+    def add(self, doc_id: str, signature: np.ndarray, group: Hashable = None):
+        with self._lock:
+            self._signatures[doc_id] = signature
+            self._groups[doc_id] = group
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, []).append(doc_id)
+
+    def remove(self, doc_ids: List[str]):
+        with self._lock:
+            for doc_id in doc_ids:
+                signature = self._signatures.pop(doc_id, None)
+                self._groups.pop(doc_id, None)
+                if signature is None:
+                    continue
+
+                for key in self._band_keys(signature):
+                    bucket = self._buckets.get(key)
+                    if bucket and doc_id in bucket:
+                        bucket.remove(doc_id)
+                        if not bucket:
+                            del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self._signatures.clear()
+            self._groups.clear()
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+
+# Global near-duplicate index instance
+near_duplicate_index = NearDuplicateIndex(
+    num_perm=settings.dedup_num_perm,
+    bands=settings.dedup_bands,
+    shingle_size=settings.dedup_shingle_size,
+    threshold=settings.dedup_threshold
+)
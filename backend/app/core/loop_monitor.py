@@ -0,0 +1,178 @@
+from collections import deque
+from app.config import settings
+from app.core.metrics import LOOP_BLOCKED_SECONDS, LOOP_BLOCKS, LOOP_LAG_SECONDS
+from app.core.profiling import frame_label
+from typing import Any, Deque, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+import logging
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def call_site(frame) -> str:
+    """Innermost frame inside the app package, where the blocking call was made"""
+    innermost = frame
+    while frame is not None:
+        path = os.path.abspath(frame.f_code.co_filename)
+        if path.startswith(APP_DIR):
+            relative = os.path.relpath(path, os.path.dirname(APP_DIR))
+            return f"{relative}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return frame_label(innermost) if innermost is not None else "unknown"
+
+
+class LoopBlockingDetector:
+    """Measures event-loop lag and attributes long stalls to the code that caused them.
+
+    A heartbeat task on the loop records when it last ran; a watchdog thread
+    notices when the heartbeat is overdue by more than the threshold and
+    captures the loop thread's stack and current task while it is still
+    blocked. Each stall is counted against the app call site it was stuck in.
+    """
+
+    def __init__(self):
+        self.mode = settings.loop_monitor_mode
+        self.interval = settings.loop_monitor_interval_ms / 1000
+        self.threshold = settings.loop_block_threshold_ms / 1000
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_beat = 0.0
+        self._last_lag = 0.0
+
+        self._lock = threading.Lock()
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=settings.loop_monitor_recent_blocks)
+        self._by_call_site: Dict[str, Dict[str, float]] = {}
+        self._blocks = 0
+        self._blocked_seconds = 0.0
+        self._max_lag = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        if self.mode == "off" or self.running:
+            return
+
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        if self.mode == "debug":
+            # asyncio's own slow callback warnings name the handle as well
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+
+        self._heartbeat = loop.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Event-loop blocking detector started in {self.mode} mode, "
+            f"threshold {settings.loop_block_threshold_ms:g}ms"
+        )
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._heartbeat.cancel()
+        self._heartbeat = None
+        self._watchdog.join()
+
+    async def _beat(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            LOOP_LAG_SECONDS.observe(lag)
+            # Lag first: the watchdog reads it once it sees the new beat
+            self._last_lag = lag
+            self._last_beat = now
+            if lag > self._max_lag:
+                self._max_lag = lag
+
+    def _watch(self):
+        block: Optional[Dict[str, Any]] = None
+        while not self._stop.wait(self.interval / 2):
+            last_beat = self._last_beat
+            overdue = time.perf_counter() - last_beat - self.interval
+            if overdue > self.threshold:
+                if block is None:
+                    block = self._capture()
+            elif block is not None:
+                self._finish(block, self._last_lag)
+                block = None
+
+    def _capture(self) -> Dict[str, Any]:
+        """Snapshot the loop thread while it is still stuck"""
+        frame = sys._current_frames().get(self._loop_thread)
+        task = asyncio.current_task(self._loop)
+        coro = task.get_coro() if task is not None else None
+        return {
+            "call_site": call_site(frame),
+            "blocking_frame": frame_label(frame) if frame is not None else "unknown",
+            "task": task.get_name() if task is not None else None,
+            "coro": getattr(coro, "__qualname__", None),
+            "stack": traceback.format_stack(frame) if frame is not None else []
+        }
+
+    def _finish(self, block: Dict[str, Any], lag: float):
+        # The heartbeat that ran after the stall measured how late it was
+        duration = max(lag, self.threshold)
+        site = block["call_site"]
+        LOOP_BLOCKS.labels(call_site=site).inc()
+        LOOP_BLOCKED_SECONDS.labels(call_site=site).inc(duration)
+
+        block["duration_ms"] = 1000 * duration
+        block["detected_at"] = datetime.utcnow().isoformat()
+        with self._lock:
+            self._blocks += 1
+            self._blocked_seconds += duration
+            counts = self._by_call_site.setdefault(site, {"blocks": 0, "blocked_ms": 0.0, "max_ms": 0.0})
+            counts["blocks"] += 1
+            counts["blocked_ms"] += 1000 * duration
+            counts["max_ms"] = max(counts["max_ms"], 1000 * duration)
+            self._recent.append(block)
+
+        if self.mode == "debug":
+            logger.warning(
+                f"Event loop blocked for {1000 * duration:.0f}ms at {site} "
+                f"(task {block['task']}, {block['coro']}):\n{''.join(block['stack'])}"
+            )
+        else:
+            logger.warning(f"Event loop blocked for {1000 * duration:.0f}ms at {site} ({block['blocking_frame']})")
+
+    def get_stats(self, recent: int = 10) -> Dict[str, Any]:
+        """Blocking totals, the worst call sites and the most recent stalls"""
+        with self._lock:
+            call_sites = sorted(
+                ({"call_site": site, **counts} for site, counts in self._by_call_site.items()),
+                key=lambda entry: entry["blocked_ms"],
+                reverse=True
+            )
+            recent_blocks: List[Dict[str, Any]] = list(self._recent)[-recent:]
+            return {
+                "mode": self.mode,
+                "threshold_ms": 1000 * self.threshold,
+                "blocks": self._blocks,
+                "blocked_ms_total": 1000 * self._blocked_seconds,
+                "max_lag_ms": 1000 * self._max_lag,
+                "call_sites": call_sites,
+                "recent": recent_blocks[::-1]
+            }
+
+
+# Global detector instance
+loop_monitor = LoopBlockingDetector()
@@ -0,0 +1,79 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class SubstringMatcher:
+    """Aho–Corasick automaton answering "which patterns occur in this text".
+
+    Equivalent to ``[i for i, p in enumerate(patterns) if p in text]`` but
+    runs in O(len(text) + matches) however many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.patterns: List[str] = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        # The empty string occurs in every text
+        self._always = [i for i, pattern in enumerate(self.patterns) if not pattern]
+
+        for index, pattern in enumerate(self.patterns):
+            if pattern:
+                self._insert(pattern, index)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _insert(self, pattern: str, index: int):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(index)
+
+    def _link(self):
+        """Breadth-first pass setting failure links and merging outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _step(self, node: int, char: str) -> int:
+        while node and char not in self._goto[node]:
+            node = self._fail[node]
+        return self._goto[node].get(char, 0)
+
+    def matches(self, text: str) -> Set[int]:
+        """Indexes of every pattern occurring in text"""
+        found = set(self._always)
+        node = 0
+        for char in text:
+            node = self._step(node, char)
+            if self._output[node]:
+                found.update(self._output[node])
+        return found
+
+    def any_match(self, text: str) -> bool:
+        """Whether any pattern occurs in text, stopping at the first hit"""
+        if self._always:
+            return True
+        node = 0
+        for char in text:
+            node = self._step(node, char)
+            if self._output[node]:
+                return True
+        return False
@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram
+import time
+
+# Pipeline stages run from milliseconds (context build) to tens of seconds (LLM)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "factguard_stage_seconds",
+    "Latency of fact-check pipeline stages",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+
+CHECK_SECONDS = Histogram(
+    "factguard_check_seconds",
+    "End-to-end fact-check job latency",
+    ["input_type", "status", "lane"],
+    buckets=STAGE_BUCKETS
+)
+
+LLM_TOKENS = Counter(
+    "factguard_llm_tokens_total",
+    "Tokens processed by Ollama",
+    ["phase"]
+)
+
+LLM_WAITING = Gauge(
+    "factguard_llm_waiting",
+    "LLM calls waiting for a concurrency slot"
+)
+
+LLM_IN_FLIGHT = Gauge(
+    "factguard_llm_in_flight",
+    "LLM calls currently running"
+)
+
+LLM_QUEUE_DEPTH = Gauge(
+    "factguard_llm_queue_depth",
+    "LLM calls waiting for a concurrency slot by scheduling lane",
+    ["lane"]
+)
+
+LLM_WAIT_SECONDS = Histogram(
+    "factguard_llm_wait_seconds",
+    "Time LLM calls waited for a concurrency slot by scheduling lane",
+    ["lane"],
+    buckets=STAGE_BUCKETS
+)
+
+LLM_JOBS_DEMOTED = Counter(
+    "factguard_llm_jobs_demoted_total",
+    "Interactive jobs run in the batch lane because their client already had llm_interactive_client_limit interactive jobs running"
+)
+
+INGEST_CHUNKS = Counter(
+    "factguard_ingest_chunks_total",
+    "Chunks ingested into the library",
+    ["outcome"]
+)
+
+INGEST_SECONDS = Histogram(
+    "factguard_ingest_seconds",
+    "Time to embed and store one batch of chunks",
+    buckets=STAGE_BUCKETS
+)
+
+INGEST_THROUGHPUT = Gauge(
+    "factguard_ingest_chunks_per_second",
+    "Chunks per second of the most recent ingest batch"
+)
+
+LOOP_LAG_SECONDS = Histogram(
+    "factguard_event_loop_lag_seconds",
+    "How late the event loop ran a timer it was asked to run",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+LOOP_BLOCKS = Counter(
+    "factguard_event_loop_blocks_total",
+    "Stretches of the event loop being blocked past the threshold, by call site",
+    ["call_site"]
+)
+
+LOOP_BLOCKED_SECONDS = Counter(
+    "factguard_event_loop_blocked_seconds_total",
+    "Time the event loop spent blocked, by call site",
+    ["call_site"]
+)
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.labels(stage=stage).observe(seconds)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time a block of work as one pipeline stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
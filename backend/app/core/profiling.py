@@ -0,0 +1,216 @@
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from app.config import settings
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import math
+import os
+import sys
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_STACK_DEPTH = 64
+TOP_STACKS = 50
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+
+
+def folded_stack(frame, root: str) -> str:
+    """Collapsed "root;outer;...;inner" stack, the input format of flame graph tools"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join([root] + labels[::-1])
+
+
+def dump_tasks(loop: asyncio.AbstractEventLoop) -> List[Dict[str, Any]]:
+    """Name, coroutine and suspended stack of every pending task; call on the loop"""
+    dump = []
+    for task in asyncio.all_tasks(loop):
+        coro = task.get_coro()
+        dump.append({
+            "name": task.get_name(),
+            "coro": getattr(coro, "__qualname__", repr(coro)),
+            "stack": [frame_label(frame) for frame in task.get_stack(limit=MAX_STACK_DEPTH)]
+        })
+    return dump
+
+
+class JobProfiler:
+    """Samples every thread's stack once a job has run longer than a threshold.
+
+    A background thread waits out the threshold so the profile still starts
+    when the event loop itself is blocked; a pending task dump is requested
+    from the loop at the same moment and the delay until it runs is recorded.
+    A probe task measures event-loop lag for the whole job.
+    """
+
+    def __init__(self, job_id: str, kind: str, loop: asyncio.AbstractEventLoop):
+        self.job_id = job_id
+        self.kind = kind
+        self.loop = loop
+        self.threshold = settings.profiling_threshold_seconds
+        self.interval = settings.profiling_interval_ms / 1000
+        self.lag_interval = settings.profiling_lag_interval_ms / 1000
+
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._lag_probe: Optional[asyncio.Task] = None
+        self._started = 0.0
+        self._triggered_at: Optional[float] = None
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._tasks: Optional[List[Dict[str, Any]]] = None
+        self._task_dump_delay: Optional[float] = None
+        self._lags: List[float] = []
+        self._probe_scheduled: Optional[float] = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run_sampler, name=f"profiler-{self.job_id[:8]}", daemon=True)
+        self._sampler.start()
+        self._lag_probe = self.loop.create_task(self._probe_lag())
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """Stop sampling and return the profile if the job crossed the threshold"""
+        duration = time.perf_counter() - self._started
+        self._stop.set()
+        self._lag_probe.cancel()
+        # A probe still sleeping when the job ends may be sitting behind a block
+        if self._probe_scheduled is not None:
+            overdue = time.perf_counter() - self._probe_scheduled - self.lag_interval
+            if overdue > 0:
+                self._lags.append(overdue)
+        # The sampler wakes within one interval once stopped
+        self._sampler.join()
+
+        if self._triggered_at is None:
+            return None
+        return self._build_profile(duration)
+
+    def _run_sampler(self):
+        if self._stop.wait(self.threshold):
+            return
+
+        self._triggered_at = time.perf_counter()
+        self.loop.call_soon_threadsafe(self._capture_tasks, self._triggered_at)
+        logger.warning(f"{self.kind} job {self.job_id} exceeded {self.threshold:g}s, profiling")
+
+        own = threading.get_ident()
+        while not self._stop.is_set() and self._samples < settings.profiling_max_samples:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self._stacks[folded_stack(frame, names.get(ident, str(ident)))] += 1
+            self._samples += 1
+            self._stop.wait(self.interval)
+
+    def _capture_tasks(self, requested_at: float):
+        # How long the loop took to get to this callback is itself a lag reading
+        self._task_dump_delay = time.perf_counter() - requested_at
+        self._tasks = dump_tasks(self.loop)
+
+    async def _probe_lag(self):
+        while True:
+            self._probe_scheduled = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self._lags.append(max(0.0, time.perf_counter() - self._probe_scheduled - self.lag_interval))
+
+    def _build_profile(self, duration: float) -> Dict[str, Any]:
+        lags = sorted(self._lags)
+        lag_threshold = settings.profiling_lag_threshold_ms / 1000
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "captured_at": datetime.utcnow().isoformat(),
+            "duration_seconds": duration,
+            "threshold_seconds": self.threshold,
+            "sampled_seconds": time.perf_counter() - self._triggered_at,
+            "interval_ms": self.interval * 1000,
+            "samples": self._samples,
+            "stacks": [
+                {"stack": stack, "samples": count}
+                for stack, count in self._stacks.most_common(TOP_STACKS)
+            ],
+            "tasks": self._tasks or [],
+            "task_dump_delay_ms": 1000 * self._task_dump_delay if self._task_dump_delay is not None else None,
+            "loop_lag": {
+                "samples": len(lags),
+                "max_ms": 1000 * lags[-1] if lags else 0.0,
+                "mean_ms": 1000 * sum(lags) / len(lags) if lags else 0.0,
+                "p99_ms": 1000 * lags[math.ceil(0.99 * len(lags)) - 1] if lags else 0.0,
+                "over_threshold": sum(1 for lag in lags if lag > lag_threshold),
+                "blocked_ms_total": 1000 * sum(lag for lag in lags if lag > lag_threshold)
+            }
+        }
+
+
+class ProfileStore:
+    """The most recent slow-job profiles, keyed by job ID"""
+
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Dict[str, Any]):
+        with self._lock:
+            self._profiles[profile["job_id"]] = profile
+            self._profiles.move_to_end(profile["job_id"])
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._profiles.get(job_id)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Newest first, without the stacks and task dumps"""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [
+            {
+                key: profile[key]
+                for key in ("job_id", "kind", "captured_at", "duration_seconds", "samples", "loop_lag")
+            }
+            for profile in reversed(profiles)
+        ]
+
+
+@asynccontextmanager
+async def profile_job(
+    job_id: str,
+    kind: str,
+    on_profile: Optional[Callable[[Dict[str, Any]], Any]] = None
+):
+    """Profile the enclosed job if profiling is on and it runs past the threshold"""
+    if not settings.profiling_enabled:
+        yield
+        return
+
+    profiler = JobProfiler(job_id, kind, asyncio.get_running_loop())
+    profiler.start()
+    try:
+        yield
+    finally:
+        profile = profiler.stop()
+        if profile is not None:
+            profile_store.add(profile)
+            if on_profile is not None:
+                on_profile(profile)
+            logger.warning(
+                f"Stored profile for {kind} job {job_id}: {profile['duration_seconds']:.1f}s, "
+                f"{profile['samples']} samples, max loop lag {profile['loop_lag']['max_ms']:.0f}ms"
+            )
+
+
+# Global profile store instance
+profile_store = ProfileStore(max_profiles=settings.profiling_max_profiles)
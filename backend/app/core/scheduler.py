@@ -0,0 +1,221 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from app.config import settings
+from app.core.metrics import LLM_JOBS_DEMOTED, LLM_QUEUE_DEPTH, LLM_WAIT_SECONDS
+from typing import Any, Deque, Dict, Optional, Tuple
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)  # Ties go to the earlier lane
+
+# Set per job, read wherever the job asks for an LLM slot
+current_lane: ContextVar[str] = ContextVar("llm_lane", default=INTERACTIVE)
+current_client: ContextVar[str] = ContextVar("llm_client", default="anonymous")
+
+
+@contextmanager
+def scheduling_context(lane: str, client: str):
+    """Queue the LLM calls made inside this block under the given lane and client"""
+    lane_token = current_lane.set(lane)
+    client_token = current_client.set(client)
+    try:
+        yield
+    finally:
+        current_lane.reset(lane_token)
+        current_client.reset(client_token)
+
+
+class _Queue:
+    """One client's waiting calls within a lane"""
+    __slots__ = ("weight", "pass_value", "waiters")
+
+    def __init__(self, weight: float, pass_value: float):
+        self.weight = weight
+        self.pass_value = pass_value
+        self.waiters: Deque[Tuple[asyncio.Future, float]] = deque()
+
+
+class _Lane:
+    """A lane's pass value and the client queues waiting in it"""
+    __slots__ = ("weight", "pass_value", "clients", "virtual_time", "waiting")
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.pass_value = 0.0
+        self.clients: Dict[str, _Queue] = {}
+        self.virtual_time = 0.0
+        self.waiting = 0
+
+
+class LLMScheduler:
+    """Hands out the LLM concurrency slots by weighted fair queuing.
+
+    Waiting calls are grouped into lanes (interactive, batch) and, within a
+    lane, by client. A free slot goes to the lane with the lowest pass value,
+    which grows by 1/weight per grant, then to that lane's client with the
+    lowest pass value. A lane or client that was idle starts from the current
+    pass value instead of banking credit, so a newly submitted interactive
+    check goes ahead of all queued batch work while a busy interactive lane
+    still leaves batch its weighted share. Jobs enter through ``job_context``;
+    a client's interactive jobs beyond the per-client limit run as batch.
+
+    Used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        lane_weights: Dict[str, float],
+        interactive_client_limit: int,
+        client_weights: Optional[Dict[str, float]] = None
+    ):
+        self.slots = slots
+        self.interactive_client_limit = interactive_client_limit
+        self.client_weights = client_weights or {}
+        self._lanes = {lane: _Lane(lane_weights[lane]) for lane in LANES}
+        self._virtual_time = 0.0
+        self._in_use = 0
+        self._waiting = 0
+        self._granted = {lane: 0 for lane in LANES}
+        self._interactive_jobs: Dict[str, int] = {}
+        self._demoted = 0
+
+    @contextmanager
+    def job_context(self, lane: str, client: str):
+        """Run a job's LLM calls in its lane, or in batch once the client has enough interactive jobs running; yields the lane"""
+        if lane == INTERACTIVE and self._interactive_jobs.get(client, 0) >= self.interactive_client_limit:
+            lane = BATCH
+            self._demoted += 1
+            LLM_JOBS_DEMOTED.inc()
+        if lane == INTERACTIVE:
+            self._interactive_jobs[client] = self._interactive_jobs.get(client, 0) + 1
+        try:
+            with scheduling_context(lane, client):
+                yield lane
+        finally:
+            if lane == INTERACTIVE:
+                self._interactive_jobs[client] -= 1
+                if not self._interactive_jobs[client]:
+                    del self._interactive_jobs[client]
+
+    async def acquire(self, lane: Optional[str] = None, client: Optional[str] = None) -> str:
+        """Wait for a slot, by default as the current job's lane and client; returns the lane queued in"""
+        lane = lane or current_lane.get()
+        client = client or current_client.get()
+        if lane not in self._lanes:
+            lane = INTERACTIVE
+        if self._in_use < self.slots and not self._waiting:
+            self._in_use += 1
+            self._granted[lane] += 1
+            LLM_WAIT_SECONDS.labels(lane=lane).observe(0.0)
+            return lane
+
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(lane, client, future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the call was cancelled
+                self.release()
+            else:
+                self._dequeue(lane, client, future)
+            raise
+        return lane
+
+    def release(self):
+        """Pass the slot straight to the next waiter, or free it"""
+        while self._waiting:
+            future = self._next_waiter()
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_use -= 1
+
+    def _enqueue(self, lane_name: str, client: str, future: asyncio.Future):
+        lane = self._lanes[lane_name]
+        if not lane.waiting:
+            lane.pass_value = max(lane.pass_value, self._virtual_time)
+        queue = lane.clients.get(client)
+        if queue is None:
+            queue = lane.clients[client] = _Queue(self.client_weights.get(client, 1.0), lane.virtual_time)
+        queue.waiters.append((future, time.perf_counter()))
+        lane.waiting += 1
+        self._waiting += 1
+        LLM_QUEUE_DEPTH.labels(lane=lane_name).inc()
+
+    def _dequeue(self, lane_name: str, client: str, future: asyncio.Future):
+        lane = self._lanes[lane_name]
+        queue = lane.clients.get(client)
+        if queue is None:
+            return
+        for entry in queue.waiters:
+            if entry[0] is future:
+                queue.waiters.remove(entry)
+                break
+        else:
+            return
+        if not queue.waiters:
+            del lane.clients[client]
+        lane.waiting -= 1
+        self._waiting -= 1
+        LLM_QUEUE_DEPTH.labels(lane=lane_name).dec()
+
+    def _next_waiter(self) -> asyncio.Future:
+        lane_name = min(
+            (name for name in LANES if self._lanes[name].waiting),
+            key=lambda name: self._lanes[name].pass_value
+        )
+        lane = self._lanes[lane_name]
+        self._virtual_time = lane.pass_value
+        lane.pass_value += 1 / lane.weight
+
+        client = min(lane.clients, key=lambda name: lane.clients[name].pass_value)
+        queue = lane.clients[client]
+        lane.virtual_time = queue.pass_value
+        queue.pass_value += 1 / queue.weight
+
+        future, enqueued_at = queue.waiters.popleft()
+        if not queue.waiters:
+            # Dropped while idle; on return it restarts from the lane's virtual time
+            del lane.clients[client]
+        lane.waiting -= 1
+        self._waiting -= 1
+        self._granted[lane_name] += 1
+        LLM_QUEUE_DEPTH.labels(lane=lane_name).dec()
+        LLM_WAIT_SECONDS.labels(lane=lane_name).observe(time.perf_counter() - enqueued_at)
+        return future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Slot usage and per-lane queue state"""
+        return {
+            "slots": self.slots,
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "interactive_jobs": sum(self._interactive_jobs.values()),
+            "demoted": self._demoted,
+            "lanes": {
+                name: {
+                    "weight": lane.weight,
+                    "waiting": lane.waiting,
+                    "clients_waiting": len(lane.clients),
+                    "granted": self._granted[name]
+                }
+                for name, lane in self._lanes.items()
+            }
+        }
+
+
+# Global scheduler for the Ollama concurrency slots
+llm_scheduler = LLMScheduler(
+    slots=settings.llm_max_concurrency,
+    lane_weights={INTERACTIVE: settings.llm_interactive_weight, BATCH: settings.llm_batch_weight},
+    interactive_client_limit=settings.llm_interactive_client_limit,
+    client_weights=settings.llm_client_weights
+)
@@ -1,5 +1,8 @@
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional, Tuple
 from dataclasses import dataclass
+from app.core.matching import SubstringMatcher
+import threading
+import numpy as np
 
 
 @dataclass
@@ -11,10 +14,24 @@ class TrustedSource:
 
 
 class SourceManager:
+    """Trusted and blocked source lists with compiled URL matching.
+
+    Lookups go through Aho–Corasick automata built from the lists, so their
+    cost depends on the URL length rather than the number of sources. The
+    automata are rebuilt lazily after the lists change; change them through
+    the methods below so the rebuild is noticed.
+    """
+    
     def __init__(self):
         self.trusted_sources = self._initialize_default_sources()
         self.user_blocked_sources = set()
         self.user_trusted_sources = set()
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._blocked_matcher: Optional[SubstringMatcher] = None
+        self._user_trusted_matcher: Optional[SubstringMatcher] = None
+        self._default_matcher: Optional[SubstringMatcher] = None
+        self._lookup_cache: Dict[str, Tuple[bool, int]] = {}
     
     def _initialize_default_sources(self) -> List[TrustedSource]:
         """Initialize default trusted sources by category"""
@@ -45,31 +62,69 @@ class SourceManager:
     
     def is_trusted_source(self, url: str) -> bool:
         """Check if a URL is from a trusted source"""
-        # Check user-blocked sources first
-        if any(blocked in url for blocked in self.user_blocked_sources):
-            return False
-        
-        # Check user-trusted sources
-        if any(trusted in url for trusted in self.user_trusted_sources):
-            return True
-        
-        # Check default trusted sources
-        return any(source.base_url in url for source in self.trusted_sources)
+        return self.lookup(url)[0]
     
     def get_source_priority(self, url: str) -> int:
         """Get priority of a source (lower = higher priority)"""
-        for source in self.trusted_sources:
-            if source.base_url in url:
-                return source.priority
-        return 999  # Unknown sources get lowest priority
+        return self.lookup(url)[1]
+    
+    def lookup(self, url: str) -> Tuple[bool, int]:
+        """Trust flag and priority of a URL in one pass"""
+        cache = self._compiled_cache()
+        result = cache.get(url)
+        if result is None:
+            result = self._match(url)
+            if len(cache) < 100000:
+                cache[url] = result
+        return result
+    
+    def lookup_many(self, urls: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Trust flags and priorities for many URLs as arrays"""
+        results = [self.lookup(url) for url in urls]
+        trusted = np.fromiter((flag for flag, _ in results), dtype=bool, count=len(results))
+        priority = np.fromiter((rank for _, rank in results), dtype=np.int64, count=len(results))
+        return trusted, priority
+    
+    def _match(self, url: str) -> Tuple[bool, int]:
+        # Default list order decides priority, as the first listed match wins
+        default_hits = self._default_matcher.matches(url)
+        priority = self.trusted_sources[min(default_hits)].priority if default_hits else 999
+        
+        # User-blocked sources first, then user-trusted, then the defaults
+        if self._blocked_matcher.any_match(url):
+            return False, priority
+        if self._user_trusted_matcher.any_match(url):
+            return True, priority
+        return bool(default_hits), priority
+    
+    def _compiled_cache(self) -> Dict[str, Tuple[bool, int]]:
+        """Rebuild the matchers if the lists changed and return the lookup cache"""
+        if self._dirty:
+            with self._lock:
+                if self._dirty:
+                    self._blocked_matcher = SubstringMatcher(self.user_blocked_sources)
+                    self._user_trusted_matcher = SubstringMatcher(self.user_trusted_sources)
+                    self._default_matcher = SubstringMatcher(
+                        source.base_url for source in self.trusted_sources
+                    )
+                    self._lookup_cache = {}
+                    self._dirty = False
+        return self._lookup_cache
     
     def add_user_trusted_source(self, url: str):
         """Add a user-defined trusted source"""
         self.user_trusted_sources.add(url)
+        self._dirty = True
     
     def add_user_blocked_source(self, url: str):
         """Add a user-defined blocked source"""
         self.user_blocked_sources.add(url)
+        self._dirty = True
+    
+    def set_user_trusted_sources(self, urls: Iterable[str]):
+        """Replace the user-defined trusted sources"""
+        self.user_trusted_sources = set(urls)
+        self._dirty = True
     
     def get_trusted_sources_by_category(self) -> Dict[str, List[TrustedSource]]:
         """Get trusted sources grouped by type"""
@@ -90,10 +145,9 @@ class SourceManager:
             library_sources = await vector_store_service.get_all_sources()
             
             # Update user_trusted_sources with library sources
-            self.user_trusted_sources.clear()
-            for source in library_sources:
-                if source.get("source_url"):
-                    self.user_trusted_sources.add(source["source_url"])
+            self.set_user_trusted_sources(
+                source["source_url"] for source in library_sources if source.get("source_url")
+            )
                     
         except Exception as e:
             # Handle gracefully if vector store is not available
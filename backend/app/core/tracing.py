@@ -0,0 +1,162 @@
+from contextvars import ContextVar
+from functools import wraps
+from opentelemetry import context as otel_context, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+)
+from opentelemetry.sdk.trace.id_generator import RandomIdGenerator
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from app.config import settings
+from typing import Any, Dict, Optional, Sequence
+import asyncio
+import threading
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("factguard")
+
+# Trace ID to use for the next root span, so a job's trace can be found by its job ID
+_root_trace_id: ContextVar[Optional[int]] = ContextVar("root_trace_id", default=None)
+
+# Ollama reports these phases, in order, in nanoseconds
+OLLAMA_PHASES = (
+    ("load_duration", "ollama.load"),
+    ("prompt_eval_duration", "ollama.prompt_eval"),
+    ("eval_duration", "ollama.generation")
+)
+
+
+class JobIdGenerator(RandomIdGenerator):
+    """Random span IDs, but root spans of a job take the job UUID as trace ID"""
+
+    def generate_trace_id(self) -> int:
+        trace_id = _root_trace_id.get()
+        return trace_id if trace_id else super().generate_trace_id()
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans to a file as JSON lines for offline inspection"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence) -> SpanExportResult:
+        try:
+            lines = [span.to_json(indent=None) + "\n" for span in spans]
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+            return SpanExportResult.SUCCESS
+        except OSError as e:
+            logger.error(f"Failed to write spans to {self.path}: {str(e)}")
+            return SpanExportResult.FAILURE
+
+
+def _build_exporter(kind: str) -> Optional[SpanExporter]:
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "file":
+        return FileSpanExporter(settings.tracing_file_path)
+    return None
+
+
+def setup_tracing() -> Optional[TracerProvider]:
+    """Install the tracer provider; with no exporter spans stay no-ops"""
+    exporter = _build_exporter(settings.tracing_exporter)
+    if exporter is None:
+        return None
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": "fact-guard-api"}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+        id_generator=JobIdGenerator()
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    logger.info(
+        f"Tracing enabled: {settings.tracing_exporter} exporter, sample ratio {settings.tracing_sample_ratio}"
+    )
+    return provider
+
+
+def shutdown_tracing():
+    """Flush pending spans"""
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.shutdown()
+
+
+def start_job_span(job_id: str, name: str, queued_at: Optional[float] = None, **attributes: Any):
+    """Start the root span of a job, detached from any request context.
+
+    The trace ID is the job UUID. When the job's creation time (Unix time) is
+    known the time it spent queued is recorded as a child span.
+    """
+    token = _root_trace_id.set(uuid.UUID(job_id).int)
+    try:
+        span = tracer.start_span(
+            name,
+            context=otel_context.Context(),
+            attributes={"job.id": job_id, **attributes}
+        )
+    finally:
+        _root_trace_id.reset(token)
+
+    if queued_at is not None and span.is_recording():
+        queued_ns = int(queued_at * 1e9)
+        queue_span = tracer.start_span(
+            "job.queued", context=trace.set_span_in_context(span), start_time=queued_ns
+        )
+        queue_span.end()
+    return span
+
+
+def traced(name: str):
+    """Run a function, sync or async, inside a span"""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_ollama_timings(response: Dict[str, Any], finished_ns: Optional[int] = None):
+    """Attach Ollama's reported durations to the current span.
+
+    Ollama only reports durations, so the load, prompt eval and generation
+    phases are laid out back to back ending when the response arrived.
+    """
+    span = trace.get_current_span()
+    if not span.is_recording():
+        return
+
+    for field in ("prompt_eval_count", "eval_count"):
+        if response.get(field) is not None:
+            span.set_attribute(f"ollama.{field}", response[field])
+
+    end = finished_ns or time.time_ns()
+    phases = [(name, response.get(field) or 0) for field, name in OLLAMA_PHASES]
+    start = end - sum(duration for _, duration in phases)
+    parent = trace.set_span_in_context(span)
+    for name, duration in phases:
+        span.set_attribute(f"{name}_ms", duration / 1e6)
+        if duration:
+            tracer.start_span(name, context=parent, start_time=start).end(end_time=start + duration)
+        start += duration
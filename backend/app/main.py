@@ -1,18 +1,44 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.config import settings
-from app.api import check, upload, jobs, library
+from app.api import check, upload, jobs, library, stats, metrics, admin
+from app.services.vector_store import vector_store_service
+from app.services.jobs import job_manager
+from app.core.tracing import setup_tracing, shutdown_tracing
+from app.core.loop_monitor import loop_monitor
+import asyncio
 import logging
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.log_level))
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run startup work that needs the event loop"""
+    setup_tracing()
+    loop_monitor.start(asyncio.get_running_loop())
+    await vector_store_service.seed_pending_sources()
+    if settings.hybrid_search_enabled or settings.dedup_enabled:
+        asyncio.create_task(vector_store_service.rebuild_local_indexes())
+    job_expiry = asyncio.create_task(job_manager.run_expiry(settings.job_expiry_interval_seconds))
+    yield
+    job_expiry.cancel()
+    job_manager.close()
+    loop_monitor.stop()
+    shutdown_tracing()
+
+
 app = FastAPI(
     title="Fact Guard API",
     description="Local-first fact-checking assistant API",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS configuration for local development
@@ -22,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Include routers
@@ -29,6 +56,9 @@ app.include_router(check.router, prefix="/api", tags=["fact-check"])
 app.include_router(upload.router, prefix="/api", tags=["upload"])
 app.include_router(jobs.router, prefix="/api", tags=["jobs"])
 app.include_router(library.router, prefix="/api", tags=["library"])
+app.include_router(stats.router, prefix="/api", tags=["stats"])
+app.include_router(admin.router, prefix="/api", tags=["admin"])
+app.include_router(metrics.router, tags=["monitoring"])
 
 
 @app.get("/health")
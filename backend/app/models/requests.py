@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal
+from typing import Optional, Literal, List
 from enum import Enum
 
 
@@ -9,10 +9,26 @@ class InputType(str, Enum):
     UPLOAD = "upload"
 
 
+class RetrievalFilters(BaseModel):
+    source_types: Optional[List[Literal["paper", "webpage", "news", "user_upload"]]] = Field(
+        None, description="Only search sources of these types"
+    )
+    source_names: Optional[List[str]] = Field(None, description="Only search these sources")
+    exclude_sources: List[str] = Field(default_factory=list, description="Source names to exclude")
+    trusted_only: bool = Field(False, description="Only search sources marked as trusted")
+
+
 class FactCheckRequest(BaseModel):
     claim: Optional[str] = Field(None, description="Text claim to fact-check")
     url: Optional[str] = Field(None, description="URL to fact-check")
     type: InputType = Field(..., description="Type of input")
+    filters: Optional[RetrievalFilters] = Field(None, description="Restrict which library sources are searched")
+    priority: Literal["interactive", "batch"] = Field(
+        "batch", description="Scheduling lane; the web UI submits its checks as interactive"
+    )
+    deadline_seconds: Optional[float] = Field(
+        None, gt=0, description="Abandon the check after this long (capped by the server's job deadline)"
+    )
     
     @validator('type', pre=True, always=True)
     def validate_input_type(cls, v, values):
@@ -28,6 +44,9 @@ class UploadMetadata(BaseModel):
     source_type: Literal["pdf", "csv", "text"] = Field(..., description="Type of uploaded file")
     description: Optional[str] = Field(None, description="Optional description")
     is_trusted: bool = Field(True, description="Whether this is a trusted source")
+    index_numeric_columns: Optional[bool] = Field(
+        None, description="Index numeric CSV columns for exact-match lookup (defaults to server setting)"
+    )
 
 
 class ConfidenceThreshold(BaseModel):
@@ -15,6 +15,7 @@ class JobStatus(str, Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class Source(BaseModel):
@@ -41,6 +42,7 @@ class DetailedResult(BaseModel):
     all_sources: List[Source] = Field(..., description="All relevant sources found")
     contradictory_info: Optional[str] = Field(None, description="Contradictory information found")
     limitations: Optional[str] = Field(None, description="Limitations of the fact-check")
+    sub_claims: List[CompactResult] = Field(default_factory=list, description="Per-claim results for URL checks")
 
 
 class FactCheckResult(BaseModel):
@@ -69,4 +71,6 @@ class UploadResponse(BaseModel):
     filename: str = Field(..., description="Original filename")
     size: int = Field(..., description="File size in bytes")
     chunks_processed: int = Field(..., description="Number of text chunks processed")
+    duplicates_merged: int = Field(0, description="Chunks merged into near-duplicates already in the library")
+    dedup_ratio: float = Field(0.0, description="Share of chunks that were near-duplicates")
     status: str = Field("completed", description="Upload processing status")
\ No newline at end of file
@@ -1,10 +1,15 @@
 from fastapi import UploadFile
 import io
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.models.requests import UploadMetadata
+from app.services.embeddings import embedding_service
 from app.services.vector_store import vector_store_service
-from app.core.chunking import text_chunker
+from app.config import settings
+from app.core.profiling import profile_job
+import asyncio
 import logging
+import numpy as np
+import pandas as pd
 from docling.document_converter import DocumentConverter
 import tempfile
 import os
@@ -13,7 +18,7 @@ logger = logging.getLogger(__name__)
 
 
 class DocumentService:
-    """Service for processing documents (PDF, TXT)."""
+    """Service for processing documents (PDF, TXT, CSV)."""
     def __init__(self):
         self.converter = DocumentConverter()
 
@@ -24,57 +29,226 @@ class DocumentService:
         metadata: UploadMetadata
     ) -> Dict[str, Any]:
         """Process an uploaded file and store it in the vector database"""
+        async with profile_job(upload_id, "upload"):
+            return await self._process_uploaded_file(upload_id, file, metadata)
+    
+    async def _process_uploaded_file(
+        self,
+        upload_id: str,
+        file: UploadFile,
+        metadata: UploadMetadata
+    ) -> Dict[str, Any]:
         try:
+            if metadata.source_type == "csv":
+                # CSV files are streamed in row batches rather than read whole
+                return await self._process_csv_file(upload_id, file, metadata)
+            
             # Read file content
             file_content = await file.read()
-            # Extract text based on file type
+            # Chunk based on file type
             if metadata.source_type == "pdf":
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
                     tmp_file.write(file_content)
                     tmp_file_path = tmp_file.name
+                try:
                     doc = self.converter.convert(source=tmp_file_path)
-                    text = doc.document.export_to_markdown()
+                finally:
+                    os.unlink(tmp_file_path)
+
+                # Walk the document structure so chunks follow sections, tables
+                # stay whole and every chunk knows its page
+                chunks = vector_store_service.split_document(doc.document)
+                text_length = sum(len(chunk.text) for chunk in chunks)
             elif metadata.source_type == "text":
                 text = file_content.decode("utf-8")
+                chunks = vector_store_service.split_text(text)
+                text_length = len(text)
             else:
                 raise ValueError(
                     f"Unsupported file type: {metadata.source_type}")
 
-            # Chunk the text
-            chunks = text_chunker.chunk_text(text)
-
             # Prepare chunks for storage
             document_chunks = []
             for i, chunk in enumerate(chunks):
                 document_chunks.append({
-                    "text": chunk,
+                    "text": chunk.text,
                     "source_name": metadata.source_name,
                     "source_url": f"upload://{upload_id}",
                     "source_type": "user_upload",
-                    "page": 0,  # Could be enhanced to track actual pages
-                    "chunk_index": i
+                    "page": chunk.page,
+                    "page_end": chunk.page_end,
+                    "headings": chunk.headings,
+                    "chunk_index": i,
+                    "is_trusted": metadata.is_trusted,
+                    "token_ids": chunk.token_ids
                 })
 
             # Store in vector database
-            point_ids = await vector_store_service.store_document_chunks(document_chunks)
+            stored = await vector_store_service.store_document_chunks(document_chunks)
 
             logger.info(
-                f"Processed upload {upload_id}: {len(chunks)} chunks created")
+                f"Processed upload {upload_id}: {len(chunks)} chunks created, "
+                f"{stored['duplicates_merged']} near-duplicates merged "
+                f"({stored['dedup_ratio']:.1%})")
 
             return {
                 "chunks_processed": len(chunks),
-                "point_ids": point_ids,
-                "text_length": len(text)
+                "point_ids": stored["point_ids"],
+                "duplicates_merged": stored["duplicates_merged"],
+                "dedup_ratio": stored["dedup_ratio"],
+                "text_length": text_length
             }
 
         except Exception as e:
             logger.error(f"Error processing upload {upload_id}: {str(e)}")
             raise
 
-    async def _extract_csv_text(self, csv_content: bytes) -> str:
-        """Extract and format text from CSV content (future implementation)"""
-        # This would be implemented for CSV processing
-        return csv_content.decode("utf-8")
+    async def _process_csv_file(
+        self,
+        upload_id: str,
+        file: UploadFile,
+        metadata: UploadMetadata
+    ) -> Dict[str, Any]:
+        """Embed and store a CSV file one row batch at a time"""
+        index_numeric = metadata.index_numeric_columns
+        if index_numeric is None:
+            index_numeric = settings.csv_index_numeric
+        
+        await file.seek(0)
+        reader = pd.read_csv(
+            file.file,
+            chunksize=settings.csv_batch_rows,
+            encoding_errors="replace",
+            on_bad_lines="warn"
+        )
+        
+        tokenizer = max_tokens = None
+        if settings.chunking_mode == "tokens":
+            tokenizer = embedding_service.get_chunking_tokenizer()
+            max_tokens = settings.chunk_max_tokens or embedding_service.get_max_tokens()
+        
+        result = {
+            "chunks_processed": 0,
+            "point_ids": [],
+            "duplicates_merged": 0,
+            "dedup_ratio": 0.0,
+            "text_length": 0
+        }
+        rows_processed = 0
+        
+        try:
+            while True:
+                # Parsing is CPU-bound, keep it off the event loop
+                frame = await asyncio.to_thread(next, reader, None)
+                if frame is None:
+                    break
+                
+                chunks = await asyncio.to_thread(
+                    self._csv_batch_chunks,
+                    frame, rows_processed, result["chunks_processed"],
+                    upload_id, metadata, index_numeric, tokenizer, max_tokens
+                )
+                stored = await vector_store_service.store_document_chunks(chunks)
+                
+                rows_processed += len(frame)
+                result["chunks_processed"] += len(chunks)
+                result["point_ids"].extend(stored["point_ids"])
+                result["duplicates_merged"] += stored["duplicates_merged"]
+                result["text_length"] += sum(len(chunk["text"]) for chunk in chunks)
+        finally:
+            reader.close()
+        
+        if result["chunks_processed"]:
+            result["dedup_ratio"] = result["duplicates_merged"] / result["chunks_processed"]
+        
+        logger.info(
+            f"Processed CSV upload {upload_id}: {rows_processed} rows in "
+            f"{result['chunks_processed']} chunks, {result['duplicates_merged']} near-duplicates merged")
+        return result
+    
+    def _csv_batch_chunks(
+        self,
+        frame: pd.DataFrame,
+        row_offset: int,
+        chunk_offset: int,
+        upload_id: str,
+        metadata: UploadMetadata,
+        index_numeric: bool,
+        tokenizer=None,
+        max_tokens: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Group a batch of CSV rows into chunks of "column: value" lines.
+        
+        Rows are sized in words against ``chunk_size``, or with ``tokenizer``
+        in tokens against ``max_tokens``; token-sized chunks carry their model
+        input ids unless a single row overflows the window.
+        """
+        columns = [str(column).strip() for column in frame.columns]
+        
+        # Work column by column; missing cells are left out of the row text
+        values = frame.astype(object).where(frame.notna(), None)
+        column_values = [values[column].tolist() for column in frame.columns]
+        rows = [
+            " | ".join(
+                f"{column}: {value}"
+                for column, value in zip(columns, row) if value is not None
+            )
+            for row in zip(*column_values)
+        ]
+        
+        numeric = None
+        if index_numeric:
+            numeric = frame.select_dtypes(include="number").to_numpy(dtype=float)
+        
+        if tokenizer is None:
+            lengths = [len(row.split()) for row in rows]
+            budget = settings.chunk_size
+        else:
+            lengths = [len(encoding.ids) for encoding in tokenizer.encode_batch(rows, add_special_tokens=False)]
+            # Leave room for the special tokens and the longest title line of this batch
+            last = row_offset + len(rows)
+            title = f"{metadata.source_name}, rows {last}-{last}:"
+            budget = max_tokens - len(tokenizer.encode(title, add_special_tokens=True).ids)
+        
+        chunks = []
+        start = 0
+        while start < len(rows):
+            # Fill a chunk up to the row limit without passing the budget
+            end = start + 1
+            length = lengths[start]
+            while end < len(rows) and end - start < settings.csv_rows_per_chunk:
+                if length + lengths[end] > budget:
+                    break
+                length += lengths[end]
+                end += 1
+            
+            first_row, last_row = row_offset + start + 1, row_offset + end
+            chunk = {
+                "text": f"{metadata.source_name}, rows {first_row}-{last_row}:\n" + "\n".join(rows[start:end]),
+                "source_name": metadata.source_name,
+                "source_url": f"upload://{upload_id}",
+                "source_type": "user_upload",
+                "page": 0,
+                "chunk_index": chunk_offset + len(chunks),
+                "is_trusted": metadata.is_trusted,
+                "row_start": first_row,
+                "row_end": last_row
+            }
+            if numeric is not None and numeric.size:
+                block = numeric[start:end].ravel()
+                chunk["numeric_values"] = sorted(set(block[np.isfinite(block)].tolist()))
+            
+            chunks.append(chunk)
+            start = end
+        
+        if tokenizer is not None:
+            encodings = tokenizer.encode_batch([chunk["text"] for chunk in chunks], add_special_tokens=True)
+            for chunk, encoding in zip(chunks, encodings):
+                # A chunk holding an overlong row is left to the model's own truncation
+                if len(encoding.ids) <= max_tokens:
+                    chunk["token_ids"] = encoding.ids
+        
+        return chunks
 
 
 # Global service instance
@@ -1,6 +1,9 @@
 from fastembed import TextEmbedding
-from typing import List
+from app.core.metrics import observe_stage, stage_timer
+from app.core.tracing import traced
+from typing import List, Optional
 import numpy as np
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,6 +13,7 @@ class EmbeddingService:
     def __init__(self, model_name: str = "BAAI/bge-small-en-v1.5"):
         self.model_name = model_name
         self.model = None
+        self._chunking_tokenizer = None
         self._initialize_model()
     
     def _initialize_model(self):
@@ -21,6 +25,7 @@ class EmbeddingService:
             logger.error(f"Failed to initialize embedding model: {str(e)}")
             raise
     
+    @traced("embed_texts")
     async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a list of texts"""
         try:
@@ -28,7 +33,8 @@ class EmbeddingService:
                 self._initialize_model()
             
             # Generate embeddings
-            embeddings = list(self.model.embed(texts))
+            with stage_timer("embedding"):
+                embeddings = list(self.model.embed(texts))
             
             # Convert to list of lists
             return [embedding.tolist() for embedding in embeddings]
@@ -37,6 +43,85 @@ class EmbeddingService:
             logger.error(f"Error generating embeddings: {str(e)}")
             raise
     
+    @traced("embed_token_ids")
+    async def embed_token_ids(self, token_ids: List[List[int]], batch_size: int = 32) -> List[List[float]]:
+        """Generate embeddings from already tokenized inputs (including special tokens).
+        
+        Runs the model's ONNX session directly so chunks sized with the model
+        tokenizer are not tokenized a second time.
+        """
+        try:
+            from fastembed.common.onnx_model import OnnxOutputContext
+            
+            if not self.model:
+                self._initialize_model()
+            onnx_model = self.model.model
+            if onnx_model.model is None:
+                onnx_model.load_onnx_model()
+            
+            started = time.perf_counter()
+            input_names = {node.name for node in onnx_model.model.get_inputs()}
+            pad_id = (onnx_model.tokenizer.padding or {}).get("pad_id", 0)
+            
+            # Batch similar lengths together to keep padding small
+            order = sorted(range(len(token_ids)), key=lambda i: len(token_ids[i]))
+            embeddings: List[Optional[List[float]]] = [None] * len(token_ids)
+            
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                width = max(len(token_ids[i]) for i in batch)
+                
+                input_ids = np.full((len(batch), width), pad_id, dtype=np.int64)
+                attention_mask = np.zeros((len(batch), width), dtype=np.int64)
+                for row, i in enumerate(batch):
+                    input_ids[row, :len(token_ids[i])] = token_ids[i]
+                    attention_mask[row, :len(token_ids[i])] = 1
+                
+                onnx_input = {"input_ids": input_ids}
+                if "attention_mask" in input_names:
+                    onnx_input["attention_mask"] = attention_mask
+                if "token_type_ids" in input_names:
+                    onnx_input["token_type_ids"] = np.zeros_like(input_ids)
+                
+                output = onnx_model.model.run(onnx_model.ONNX_OUTPUT_NAMES, onnx_input)
+                vectors = onnx_model._post_process_onnx_output(
+                    OnnxOutputContext(
+                        model_output=output[0],
+                        attention_mask=attention_mask,
+                        input_ids=input_ids
+                    )
+                )
+                for i, vector in zip(batch, vectors):
+                    embeddings[i] = vector.tolist()
+            
+            observe_stage("embedding", time.perf_counter() - started)
+            return embeddings
+            
+        except Exception as e:
+            logger.error(f"Error generating embeddings from token ids: {str(e)}")
+            raise
+    
+    def get_chunking_tokenizer(self):
+        """Copy of the model tokenizer with truncation and padding disabled, for sizing chunks"""
+        if self._chunking_tokenizer is None:
+            from tokenizers import Tokenizer
+            
+            if not self.model:
+                self._initialize_model()
+            tokenizer = Tokenizer.from_str(self.model.model.tokenizer.to_str())
+            tokenizer.no_truncation()
+            tokenizer.no_padding()
+            self._chunking_tokenizer = tokenizer
+        
+        return self._chunking_tokenizer
+    
+    def get_max_tokens(self) -> int:
+        """Maximum input length (including special tokens) the model embeds without truncation"""
+        if not self.model:
+            self._initialize_model()
+        truncation = self.model.model.tokenizer.truncation or {}
+        return truncation.get("max_length", 512)
+    
     async def embed_single_text(self, text: str) -> List[float]:
         """Generate embedding for a single text"""
         embeddings = await self.embed_texts([text])
@@ -1,100 +1,335 @@
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from app.config import settings
 from app.models.responses import JobStatus, FactCheckResult
+import asyncio
+import heapq
+import os
+import shutil
+import tempfile
 import threading
+import time
+import logging
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+@dataclass(slots=True)
 class Job:
     job_id: str
     status: JobStatus
-    created_at: datetime
-    estimated_completion: Optional[datetime] = None
+    created_at: float  # Unix time
+    expires_at: float
+    estimated_completion: Optional[float] = None
     progress: Optional[int] = None
-    result: Optional[FactCheckResult] = None
+    result_json: Optional[bytes] = None  # Serialized once at completion, results never change
+    result_spilled: bool = False  # result_json was moved to the spill directory
     error: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
+    version: int = 0  # Bumped on every visible change, backs the job's ETag
 
 
 class JobManager:
-    def __init__(self):
+    """Compact in-memory job table.
+
+    Results are kept only as the JSON bytes served to clients. Once the
+    results held in memory pass the memory limit the oldest are spilled to
+    files and read back on demand. Every job expires a fixed TTL after it was
+    created; a heap ordered by expiry time lets the background sweep remove
+    them without scanning the table.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        memory_limit_bytes: int = 64 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.memory_limit_bytes = memory_limit_bytes
+        self.spill_root = spill_dir or os.path.join(tempfile.gettempdir(), "factguard-jobs")
+        self._clock = clock
         self._jobs: Dict[str, Job] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._in_memory: "OrderedDict[str, int]" = OrderedDict()  # Job ID -> result size, oldest first
+        self._memory_bytes = 0
+        self._spill_path: Optional[str] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._status_counts = {status: 0 for status in JobStatus}
+        self._expired = 0
+        self._spilled = 0
         self._lock = threading.Lock()
-    
+
     def create_job(self, job_id: str, estimated_seconds: Optional[int] = None) -> Job:
         """Create a new job entry"""
         with self._lock:
-            estimated_completion = None
-            if estimated_seconds:
-                estimated_completion = datetime.utcnow() + timedelta(seconds=estimated_seconds)
-            
+            now = self._clock()
             job = Job(
                 job_id=job_id,
                 status=JobStatus.QUEUED,
-                created_at=datetime.utcnow(),
-                estimated_completion=estimated_completion,
+                created_at=now,
+                expires_at=now + self.ttl_seconds,
+                estimated_completion=now + estimated_seconds if estimated_seconds else None,
                 progress=0
             )
             self._jobs[job_id] = job
+            self._status_counts[JobStatus.QUEUED] += 1
+            heapq.heappush(self._expiry, (job.expires_at, job_id))
             return job
-    
+
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID"""
         with self._lock:
             return self._jobs.get(job_id)
-    
-    def update_job(self, job_id: str, status: Optional[JobStatus] = None, 
+
+    def update_job(self, job_id: str, status: Optional[JobStatus] = None,
                    progress: Optional[int] = None) -> bool:
         """Update job status and/or progress"""
         with self._lock:
             if job_id not in self._jobs:
                 return False
-            
+
             job = self._jobs[job_id]
-            if status:
-                job.status = status
-            if progress is not None:
+            if job.status == JobStatus.CANCELLED:
+                return False
+            if status and status != job.status:
+                self._set_status(job, status)
+            if progress is not None and progress != job.progress:
                 job.progress = progress
-            
+                job.version += 1
+
             return True
-    
-    def complete_job(self, job_id: str, result: FactCheckResult) -> bool:
-        """Mark job as completed with result"""
+
+    async def complete_job(self, job_id: str, result: FactCheckResult) -> bool:
+        """Mark job as completed with result; results pushed past the memory limit are written out off the event loop"""
+        result_json = result.model_dump_json().encode()
         with self._lock:
             if job_id not in self._jobs:
                 return False
-            
+
             job = self._jobs[job_id]
-            job.status = JobStatus.COMPLETED
+            if job.status == JobStatus.CANCELLED:
+                return False
+            self._set_status(job, JobStatus.COMPLETED)
             job.progress = 100
-            job.result = result
-            
-            return True
-    
+            job.result_json = result_json
+            self._in_memory[job_id] = len(result_json)
+            self._memory_bytes += len(result_json)
+            to_spill = self._over_limit()
+
+        if to_spill:
+            await asyncio.to_thread(self._spill, to_spill)
+        return True
+
     def fail_job(self, job_id: str, error: str) -> bool:
         """Mark job as failed with error message"""
         with self._lock:
             if job_id not in self._jobs:
                 return False
-            
+
             job = self._jobs[job_id]
-            job.status = JobStatus.FAILED
+            if job.status == JobStatus.CANCELLED:
+                return False
+            self._set_status(job, JobStatus.FAILED)
             job.error = error
-            
+
             return True
-    
+
+    def cancel_job(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job and the task processing it; finished jobs are left as they are"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return job
+
+            self._set_status(job, JobStatus.CANCELLED)
+            task = self._tasks.pop(job_id, None)
+
+        if task is not None:
+            task.cancel()
+        return job
+
+    def track_task(self, job_id: str, task: asyncio.Task):
+        """Remember the task processing a job so cancel_job can stop it"""
+        with self._lock:
+            self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._untrack_task(job_id, task))
+
+    def attach_profile(self, job_id: str, profile: Dict[str, Any]) -> bool:
+        """Keep a slow-job profile with the job"""
+        with self._lock:
+            if job_id not in self._jobs:
+                return False
+
+            self._jobs[job_id].profile = profile
+            return True
+
+    async def load_result(self, job: Job) -> Optional[bytes]:
+        """Serialized result of a completed job, read back from disk off the event loop if it was spilled"""
+        result_json = job.result_json
+        if result_json is not None or not job.result_spilled:
+            return result_json
+        return await asyncio.to_thread(self._read_spilled, job)
+
+    def _read_spilled(self, job: Job) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self._spill_path, f"{job.job_id}.json"), "rb") as f:
+                return f.read()
+        except OSError as e:
+            logger.error(f"Error reading spilled result of job {job.job_id}: {str(e)}")
+            return None
+
+    def count_by_status(self) -> Dict[JobStatus, int]:
+        """Number of tracked jobs in each status"""
+        with self._lock:
+            return dict(self._status_counts)
+
+    def expire_jobs(self, now: Optional[float] = None) -> int:
+        """Remove every job past its expiry time, returns how many were removed"""
+        now = self._clock() if now is None else now
+        expired = []
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                _, job_id = heapq.heappop(self._expiry)
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    expired.append(self._remove(job))
+            self._expired += len(expired)
+
+        self._delete_spilled(expired)
+        return len(expired)
+
     def cleanup_old_jobs(self, max_age_hours: int = 24):
         """Clean up jobs older than max_age_hours"""
+        cutoff = self._clock() - max_age_hours * 3600
+        with self._lock:
+            removed = [self._remove(job) for job in list(self._jobs.values()) if job.created_at < cutoff]
+
+        # Their expiry heap entries are skipped once they come due
+        self._delete_spilled(removed)
+
+    async def run_expiry(self, interval_seconds: float):
+        """Expire jobs every interval until cancelled; file deletes run off the event loop"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                expired = await asyncio.to_thread(self.expire_jobs)
+                if expired:
+                    logger.debug(f"Expired {expired} jobs")
+            except Exception as e:
+                logger.error(f"Error expiring jobs: {str(e)}")
+
+    def close(self):
+        """Delete this process's spill directory"""
+        if self._spill_path is not None:
+            shutil.rmtree(self._spill_path, ignore_errors=True)
+            self._spill_path = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job table size, result memory and spill/expiry counters"""
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "by_status": {status.value: count for status, count in self._status_counts.items()},
+                "results_in_memory": len(self._in_memory),
+                "result_memory_bytes": self._memory_bytes,
+                "memory_limit_bytes": self.memory_limit_bytes,
+                "results_spilled": self._spilled,
+                "expired": self._expired,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+    def _untrack_task(self, job_id: str, task: asyncio.Task):
+        with self._lock:
+            if self._tasks.get(job_id) is task:
+                del self._tasks[job_id]
+
+    def _set_status(self, job: Job, status: JobStatus):
+        # Called with the lock held
+        self._status_counts[job.status] -= 1
+        self._status_counts[status] += 1
+        job.status = status
+        job.version += 1
+
+    def _remove(self, job: Job) -> Job:
+        # Called with the lock held
+        del self._jobs[job.job_id]
+        task = self._tasks.pop(job.job_id, None)
+        if task is not None:
+            # Expiry runs in a worker thread, so the cancel is handed to the task's loop
+            task.get_loop().call_soon_threadsafe(task.cancel)
+        self._status_counts[job.status] -= 1
+        size = self._in_memory.pop(job.job_id, None)
+        if size is not None:
+            self._memory_bytes -= size
+        return job
+
+    def _over_limit(self) -> List[Tuple[str, bytes]]:
+        """Take the oldest in-memory results until the rest fit the limit; called with the lock held"""
+        to_spill = []
+        while self._memory_bytes > self.memory_limit_bytes and self._in_memory:
+            job_id, size = self._in_memory.popitem(last=False)
+            self._memory_bytes -= size
+            to_spill.append((job_id, self._jobs[job_id].result_json))
+        return to_spill
+
+    def _spill(self, to_spill: List[Tuple[str, bytes]]):
+        """Write results out, then drop the in-memory copies of those still tracked"""
+        if not to_spill:
+            return
+
+        try:
+            if self._spill_path is None:
+                os.makedirs(self.spill_root, exist_ok=True)
+                self._spill_path = tempfile.mkdtemp(prefix=f"{os.getpid()}-", dir=self.spill_root)
+            for job_id, result_json in to_spill:
+                with open(os.path.join(self._spill_path, f"{job_id}.json"), "wb") as f:
+                    f.write(result_json)
+        except OSError as e:
+            # Keep serving from memory rather than losing results; they are retried on the next spill
+            logger.error(f"Error spilling job results to {self.spill_root}: {str(e)}")
+            self._restore(to_spill)
+            return
+
+        expired = []
         with self._lock:
-            cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
-            jobs_to_remove = [
-                job_id for job_id, job in self._jobs.items()
-                if job.created_at < cutoff
-            ]
-            
-            for job_id in jobs_to_remove:
-                del self._jobs[job_id]
+            for job_id, result_json in to_spill:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job.result_spilled = True
+                    job.result_json = None
+                else:
+                    expired.append(Job(job_id, JobStatus.COMPLETED, 0.0, 0.0, result_spilled=True))
+            self._spilled += len(to_spill)
+
+        # Expired while being written
+        self._delete_spilled(expired)
+
+    def _restore(self, to_spill: List[Tuple[str, bytes]]):
+        """Put results that could not be spilled back in the in-memory accounting, oldest first"""
+        with self._lock:
+            for job_id, result_json in reversed(to_spill):
+                if job_id in self._jobs and job_id not in self._in_memory:
+                    self._in_memory[job_id] = len(result_json)
+                    self._in_memory.move_to_end(job_id, last=False)
+                    self._memory_bytes += len(result_json)
+
+    def _delete_spilled(self, jobs: List[Job]):
+        for job in jobs:
+            if job.result_spilled:
+                try:
+                    os.remove(os.path.join(self._spill_path, f"{job.job_id}.json"))
+                except OSError:
+                    pass
 
 
 # Global job manager instance
-job_manager = JobManager()
\ No newline at end of file
+job_manager = JobManager(
+    ttl_seconds=settings.job_ttl_seconds,
+    memory_limit_bytes=settings.job_result_memory_mb * 1024 * 1024,
+    spill_dir=settings.job_spill_dir
+)
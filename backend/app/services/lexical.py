@@ -0,0 +1,240 @@
+from typing import List, Dict, Any, Optional, Tuple, Set
+from collections import Counter
+from app.models.requests import RetrievalFilters
+import math
+import re
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Keeps numbers like 12.5 or 1,000 and hyphenated names together
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.,'-][a-z0-9]+)*")
+
+# Numbers as written in claims: 1,000 or -12.5 or 3%
+NUMBER_PATTERN = re.compile(r"(?<![\w.])-?\d{1,3}(?:,\d{3})+(?:\.\d+)?|(?<![\w.])-?\d+(?:\.\d+)?")
+
+# Fields that say which source a chunk came from, copied into ``also_in_sources`` when a
+# near-duplicate is merged; optional ones only when set
+PROVENANCE_FIELDS = (
+    "source_name", "source_url", "source_type", "page", "chunk_index", "is_trusted",
+    "page_end", "headings", "is_web_source", "row_start", "row_end", "numeric_values"
+)
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'it',
+    'its', 'as', 'from', 'not', 'no'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into index terms"""
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def extract_numbers(text: str) -> List[float]:
+    """Distinct numeric values mentioned in text"""
+    values = []
+    for match in NUMBER_PATTERN.findall(text):
+        value = float(match.replace(",", ""))
+        if value not in values:
+            values.append(value)
+    return values
+
+
+def lookup_numbers(text: str, min_value: float) -> List[float]:
+    """Numbers in text distinctive enough for exact lookup: no small integers or years"""
+    return [
+        value for value in extract_numbers(text)
+        if not (value.is_integer() and (abs(value) < min_value or 1900 <= value <= 2100))
+    ]
+
+
+def source_matches(source: Dict[str, Any], filters: RetrievalFilters) -> bool:
+    """Whether one providing source (a payload or an ``also_in_sources`` entry) passes the filters"""
+    source_name = source.get("source_name", "")
+    if filters.source_types and source.get("source_type", "") not in filters.source_types:
+        return False
+    if filters.source_names and source_name not in filters.source_names:
+        return False
+    if source_name in filters.exclude_sources:
+        return False
+    if filters.trusted_only and source.get("is_trusted", True) is False:
+        return False
+    return True
+
+
+def attribute_to_filters(payload: Dict[str, Any], filters: Optional[RetrievalFilters]) -> Optional[Dict[str, Any]]:
+    """The payload as it should be cited under the filters.
+    
+    A chunk passes a filter when any of its providers does. It is attributed
+    to the first provider that passes, and only passing providers are kept
+    in ``also_in_sources``; None when no provider passes.
+    """
+    if filters is None:
+        return payload
+
+    passing = [source for source in [payload, *payload.get("also_in_sources", [])] if source_matches(source, filters)]
+    if not passing:
+        return None
+
+    attributed = {key: value for key, value in payload.items() if key not in PROVENANCE_FIELDS}
+    attributed.update((key, passing[0][key]) for key in PROVENANCE_FIELDS if key in passing[0])
+    attributed["also_in_sources"] = passing[1:]
+    return attributed
+
+
+class LexicalIndex:
+    """In-memory BM25 inverted index kept alongside the vector store"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._doc_meta: Dict[str, Dict[str, Any]] = {}
+        self._source_docs: Dict[str, Set[str]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add_documents(self, documents: List[Tuple[str, str, Dict[str, Any]]]):
+        """Index (point_id, text, payload) tuples, replacing existing entries"""
+        with self._lock:
+            for doc_id, text, payload in documents:
+                self._remove_document(doc_id)
+
+                term_counts = Counter(tokenize(text))
+                for term, count in term_counts.items():
+                    self._postings.setdefault(term, {})[doc_id] = count
+
+                length = sum(term_counts.values())
+                self._doc_lengths[doc_id] = length
+                self._total_length += length
+
+                source_name = payload.get("source_name", "")
+                self._doc_meta[doc_id] = {
+                    "source_name": source_name,
+                    "providers": self._providers(payload),
+                    "terms": list(term_counts)
+                }
+                self._source_docs.setdefault(source_name, set()).add(doc_id)
+
+    def update_provenance(self, doc_id: str, payload: Dict[str, Any]):
+        """Refresh the sources a document is filtered by after its ``also_in_sources`` changed"""
+        with self._lock:
+            meta = self._doc_meta.get(doc_id)
+            if meta is not None:
+                meta["providers"] = self._providers(payload)
+
+    def remove_source(self, source_name: str):
+        """Drop every document belonging to a source"""
+        with self._lock:
+            for doc_id in list(self._source_docs.get(source_name, ())):
+                self._remove_document(doc_id)
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_lengths.clear()
+            self._doc_meta.clear()
+            self._source_docs.clear()
+            self._total_length = 0
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        filters: Optional[RetrievalFilters] = None
+    ) -> List[Tuple[str, float]]:
+        """Return (point_id, bm25_score) pairs, best first"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            doc_count = len(self._doc_lengths)
+            if doc_count == 0:
+                return []
+            avg_length = self._total_length / doc_count
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            if filters is not None:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if self._matches(self._doc_meta[doc_id], filters)
+                }
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def _remove_document(self, doc_id: str):
+        """Remove a document; caller must hold the lock"""
+        meta = self._doc_meta.pop(doc_id, None)
+        if meta is None:
+            return
+
+        for term in meta["terms"]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+        self._total_length -= self._doc_lengths.pop(doc_id, 0)
+
+        source_docs = self._source_docs.get(meta["source_name"])
+        if source_docs is not None:
+            source_docs.discard(doc_id)
+            if not source_docs:
+                del self._source_docs[meta["source_name"]]
+
+    @staticmethod
+    def _providers(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Filterable fields of the chunk's own source and those merged into it"""
+        return [
+            {key: provider[key] for key in ("source_name", "source_type", "is_trusted") if key in provider}
+            for provider in [payload, *payload.get("also_in_sources", [])]
+        ]
+
+    @staticmethod
+    def _matches(meta: Dict[str, Any], filters: RetrievalFilters) -> bool:
+        """Apply the same filter semantics as the Qdrant payload filter: any providing source may match"""
+        return any(source_matches(provider, filters) for provider in meta["providers"])
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[str]],
+    k: int = 60,
+    weights: Optional[List[float]] = None
+) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists with (optionally weighted) reciprocal-rank fusion"""
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+# Global lexical index instance
+lexical_index = LexicalIndex()
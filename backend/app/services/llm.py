@@ -2,24 +2,51 @@ from math import log
 import re
 import ollama
 from app.config import settings
-from app.models.requests import FactCheckRequest
+from app.models.requests import FactCheckRequest, RetrievalFilters
 from app.models.responses import (
     FactCheckResult, CompactResult, DetailedResult, 
     Verdict, Source
 )
 from app.services.retrieval import retrieval_service
+from app.services.embeddings import embedding_service
+from app.services.vector_store import vector_store_service
+from app.services.triage import DECISION_REASONING, triage_service
+from app.services.verdict_cache import verdict_cache
+from app.core.confidence import confidence_scorer
+from app.core.claims import claim_extractor
+from app.core.scheduler import llm_scheduler
+from app.core.deadline import bounded_by_deadline
+from app.core.metrics import observe_stage, stage_timer, LLM_IN_FLIGHT, LLM_TOKENS, LLM_WAITING
+from app.core.tracing import record_ollama_timings, traced, tracer
+from app.utils.web import web_scraper
 from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter
+import asyncio
 import logging
+import threading
+import time
 import uuid
 import json
 
 logger = logging.getLogger(__name__)
 
+PROCESSING_ERROR_EXPLANATION = "Unable to complete fact-check due to processing error"
+SAMPLES_DISAGREED_EXPLANATION = "Verdict samples disagreed, so the claim could not be settled"
+
 
 class FactCheckService:
     def __init__(self):
-        self.client = ollama.AsyncClient(host=settings.ollama_base_url)
+        self.client = ollama.AsyncClient(host=settings.ollama_base_url, timeout=settings.ollama_timeout_seconds)
         self.model = settings.ollama_model
+        self._stats_lock = threading.Lock()
+        self._consistency_stats = {
+            "claims": 0,
+            "samples": 0,
+            "early_stops": 0,
+            "budget_exhausted": 0,
+            "consensus_total": 0.0
+        }
     
     async def check_claim(self, request: FactCheckRequest) -> FactCheckResult:
         """Main fact-checking pipeline"""
@@ -28,17 +55,20 @@ class FactCheckService:
             if request.type.value == "claim":
                 claim_text = request.claim
             elif request.type.value == "url":
-                claim_text = await self._extract_claim_from_url(request.url)
+                return await self._check_url(request)
             else:
                 raise ValueError("Upload type not supported in this method")
             
-            # Retrieve relevant sources
-            relevant_sources = await retrieval_service.find_relevant_sources(claim_text)
+            # Triage, retrieve relevant sources and verify
+            compact_result, relevant_sources, decision = (
+                await self._verify_claims([claim_text], request.filters)
+            )[0]
             logger.info(f"Found {len(relevant_sources)} relevant sources")
 
-            # Generate fact-check using LLM
-            compact_result = await self._generate_compact_fact_check(claim_text, relevant_sources)
-            detailed_result = await self._generate_detailed_fact_check(claim_text, relevant_sources)
+            if decision:
+                detailed_result = self._triaged_detailed_result(compact_result, relevant_sources, decision)
+            else:
+                detailed_result = await self._generate_detailed_fact_check(claim_text, relevant_sources)
             
             # Create complete result
             result = FactCheckResult(
@@ -54,17 +84,264 @@ class FactCheckService:
             logger.error(f"Error in fact-check pipeline: {str(e)}")
             raise
     
-    async def _extract_claim_from_url(self, url: str) -> str:
-        """Extract main claim from a URL (simplified implementation)"""
-        # This would use web scraping in a full implementation
-        # For now, return placeholder
-        return f"Claims extracted from {url}"
+    async def _chat(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Send a single-turn prompt to Ollama once the scheduler grants the job an LLM slot"""
+        with tracer.start_as_current_span("ollama.chat", attributes={"ollama.model": self.model}) as span:
+            waiting_since = time.perf_counter()
+            LLM_WAITING.inc()
+            try:
+                lane = await llm_scheduler.acquire()
+            finally:
+                LLM_WAITING.dec()
+            span.set_attribute("llm.slot_wait_ms", 1000 * (time.perf_counter() - waiting_since))
+            span.set_attribute("llm.lane", lane)
+            
+            LLM_IN_FLIGHT.inc()
+            try:
+                response = await self.client.chat(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    options=options
+                )
+            finally:
+                LLM_IN_FLIGHT.dec()
+                llm_scheduler.release()
+            
+            record_ollama_timings(response)
+        
+        self._record_llm_timings(response)
+        return response['message']['content'].replace('```json', '').replace('```', '').strip()
+    
+    @staticmethod
+    def _record_llm_timings(response: Dict[str, Any]):
+        """Export Ollama's own timing breakdown (reported in nanoseconds)"""
+        for field, stage in (
+            ("load_duration", "llm_load"),
+            ("prompt_eval_duration", "llm_prompt_eval"),
+            ("eval_duration", "llm_generation")
+        ):
+            if response.get(field):
+                observe_stage(stage, response[field] / 1e9)
+        
+        LLM_TOKENS.labels(phase="prompt").inc(response.get("prompt_eval_count") or 0)
+        LLM_TOKENS.labels(phase="generation").inc(response.get("eval_count") or 0)
     
-    async def _generate_compact_fact_check(self, claim: str, sources: list) -> CompactResult:
+    async def _check_url(self, request: FactCheckRequest) -> FactCheckResult:
+        """Fact-check a web page by verifying its main claims concurrently"""
+        claims, title = await self._extract_claims_from_url(request.url)
+        
+        verified = await self._verify_claims(claims, request.filters)
+        sub_claims = [compact for compact, _, _ in verified]
+        claim_sources = [sources for _, sources, _ in verified]
+        logger.info(f"Verified {len(sub_claims)} claims from {request.url}")
+        
+        compact_result, detailed_result = self._aggregate_sub_claims(
+            title or request.url, sub_claims, claim_sources
+        )
+        return FactCheckResult(
+            id=str(uuid.uuid4()),
+            timestamp=datetime.utcnow(),
+            compact=compact_result,
+            full=detailed_result
+        )
+    
+    async def _verify_claims(
+        self,
+        claims: List[str],
+        filters: Optional[RetrievalFilters] = None
+    ) -> List[Tuple[CompactResult, List[Source], Optional[str]]]:
+        """Verify claims concurrently, returning (result, sources, triage decision) per claim.
+        
+        Triage answers cached claims, paraphrases of cached claims and non-claims
+        before retrieval and claims without usable evidence after it, so only
+        the rest reach the LLM; their decision is None.
+        """
+        library_version = vector_store_service.library_version
+        deadline = bounded_by_deadline(time.monotonic() + settings.self_consistency_budget_ms / 1000)
+        
+        verified: List[Optional[Tuple[CompactResult, List[Source], Optional[str]]]] = []
+        for claim in claims:
+            triaged = triage_service.before_retrieval(claim, filters, library_version)
+            verified.append(self._triaged(triaged) if triaged else None)
+        
+        # Claim embeddings serve both the paraphrase lookup and the vector search
+        pending = [i for i, result in enumerate(verified) if result is None]
+        embeddings = {}
+        if pending:
+            vectors = await embedding_service.embed_texts([claims[i] for i in pending])
+            embeddings = dict(zip(pending, vectors))
+            for i in pending:
+                triaged = triage_service.match_paraphrase(claims[i], embeddings[i], filters, library_version)
+                if triaged is not None:
+                    verified[i] = self._triaged(triaged)
+        
+        # One vector search for every remaining claim
+        pending = [i for i in pending if verified[i] is None]
+        with stage_timer("retrieval"):
+            retrieved = await retrieval_service.retrieve_batch(
+                [claims[i] for i in pending],
+                filters=filters,
+                query_embeddings=[embeddings[i] for i in pending]
+            )
+        
+        async def verify(i: int, results: List[Dict[str, Any]]):
+            claim = claims[i]
+            sources = retrieval_service.to_sources(results)
+            triaged = triage_service.after_retrieval(claim, results, sources)
+            if triaged is not None:
+                decision, compact = triaged
+                return compact, sources, decision
+            
+            started = time.perf_counter()
+            compact = await self._generate_compact_fact_check(claim, sources, deadline)
+            triage_service.record_llm(claim, time.perf_counter() - started)
+            
+            if settings.verdict_cache_enabled and compact.explanation != PROCESSING_ERROR_EXPLANATION:
+                verdict_cache.put(claim, filters, compact, embeddings[i], library_version)
+            return compact, sources, None
+        
+        results = await asyncio.gather(*(
+            verify(i, chunks) for i, chunks in zip(pending, retrieved)
+        ))
+        for i, result in zip(pending, results):
+            verified[i] = result
+        
+        return verified
+    
+    @staticmethod
+    def _triaged(triaged: Tuple[str, CompactResult]) -> Tuple[CompactResult, List[Source], str]:
+        decision, compact = triaged
+        return compact, compact.top_sources, decision
+    
+    def _triaged_detailed_result(self, compact: CompactResult, sources: List[Source], decision: str) -> DetailedResult:
+        """Detailed result for a claim answered without the LLM, explained by the triage decision"""
+        reasoning_steps, limitations = DECISION_REASONING[decision]
+        return DetailedResult(
+            claim=compact.claim,
+            verdict=compact.verdict,
+            confidence=compact.confidence,
+            detailed_explanation=compact.explanation,
+            reasoning_steps=list(reasoning_steps),
+            all_sources=sources,
+            limitations=limitations
+        )
+    
+    @traced("extract_claims_from_url")
+    async def _extract_claims_from_url(self, url: str) -> Tuple[List[str], str]:
+        """Fetch a page and return its check-worthy claims and title"""
+        with stage_timer("url_extraction"):
+            page = await web_scraper.extract_text_from_url(url)
+        if not page or not page.get("content"):
+            raise ValueError(f"Could not extract content from {url}")
+        
+        # Heuristics prefilter cheaply so the LLM only sees a short candidate list
+        candidates = claim_extractor.extract_candidates(
+            page["content"], limit=settings.url_claim_candidates
+        )
+        if not candidates:
+            raise ValueError(f"No check-worthy claims found at {url}")
+        
+        claims = candidates[:settings.url_max_claims]
+        if settings.url_claim_llm_selection and len(candidates) > settings.url_max_claims:
+            claims = await self._select_claims(candidates, page.get("title", "")) or claims
+        
+        logger.info(f"Extracted {len(claims)} claims from {url} ({len(candidates)} candidates)")
+        return claims, page.get("title", "")
+    
+    async def _select_claims(self, candidates: List[str], title: str) -> List[str]:
+        """Ask the LLM for the most check-worthy candidates, empty on failure"""
+        numbered = "\n".join(f"{i}. {candidate}" for i, candidate in enumerate(candidates, 1))
+        prompt = f"""
+        The following sentences come from a web page titled "{title}".
+        Pick the {settings.url_max_claims} most important factual claims worth fact-checking.
+        
+        {numbered}
+        
+        Respond with only a JSON list of sentence numbers, for example [1, 4, 7].
+        """
+        try:
+            selected = json.loads(await self._chat(prompt))
+            claims = [
+                candidates[i - 1] for i in dict.fromkeys(selected)
+                if isinstance(i, int) and 1 <= i <= len(candidates)
+            ]
+            return claims[:settings.url_max_claims]
+        except Exception as e:
+            logger.error(f"Error selecting claims: {str(e)}")
+            return []
+    
+    def _aggregate_sub_claims(
+        self,
+        subject: str,
+        sub_claims: List[CompactResult],
+        claim_sources: List[List[Source]]
+    ) -> Tuple[CompactResult, DetailedResult]:
+        """Combine per-claim results into one page-level report"""
+        verdicts = [result.verdict for result in sub_claims]
+        if Verdict.FALSE in verdicts:
+            verdict = Verdict.FALSE
+        elif verdicts and all(v == Verdict.TRUE for v in verdicts):
+            verdict = Verdict.TRUE
+        else:
+            verdict = Verdict.UNCLEAR
+        
+        confidence = sum(result.confidence for result in sub_claims) / len(sub_claims)
+        counts = {v: verdicts.count(v) for v in Verdict}
+        explanation = (
+            f"{counts[Verdict.TRUE]} of {len(sub_claims)} claims supported, "
+            f"{counts[Verdict.FALSE]} contradicted, {counts[Verdict.UNCLEAR]} unclear"
+        )
+        
+        # Interleave so every claim contributes its best sources first
+        all_sources: List[Source] = []
+        seen = set()
+        for rank in range(max(len(sources) for sources in claim_sources)):
+            for sources in claim_sources:
+                if rank < len(sources):
+                    key = (sources[rank].name, sources[rank].url, sources[rank].excerpt)
+                    if key not in seen:
+                        seen.add(key)
+                        all_sources.append(sources[rank])
+        
+        compact = CompactResult(
+            claim=subject,
+            verdict=verdict,
+            confidence=confidence,
+            explanation=explanation,
+            top_sources=all_sources[:3]
+        )
+        detailed = DetailedResult(
+            claim=subject,
+            verdict=verdict,
+            confidence=confidence,
+            detailed_explanation="\n".join(
+                f"{result.verdict.value} ({result.confidence:.0f}%): {result.claim} - {result.explanation}"
+                for result in sub_claims
+            ),
+            reasoning_steps=[
+                "Extracted the page text",
+                f"Selected {len(sub_claims)} check-worthy claims",
+                "Retrieved sources for all claims in one batched search",
+                "Verified each claim independently",
+                "Aggregated claim verdicts into a page verdict"
+            ],
+            all_sources=all_sources,
+            limitations="Only the main claims on the page were checked",
+            sub_claims=sub_claims
+        )
+        return compact, detailed
+    
+    async def _generate_compact_fact_check(
+        self,
+        claim: str,
+        sources: list,
+        deadline: Optional[float] = None
+    ) -> CompactResult:
         """Generate compact fact-check result"""
         
         # Create context from sources
-        context = self._build_context_from_sources(sources)
+        with stage_timer("context_build"):
+            context = self._build_context_from_sources(sources)
         
         prompt = f"""
         Fact-check the following claim using the provided sources:
@@ -84,23 +361,19 @@ class FactCheckService:
             "explanation": "<brief explanation>"
         }}
         """
-        logger.info(f"Generated prompt for compact fact-check: {prompt}")
+        logger.debug(f"Generated prompt for compact fact-check ({len(prompt)} chars)")
         try:
-            response = await self.client.chat(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            if settings.self_consistency_enabled and settings.self_consistency_samples > 1:
+                return await self._self_consistent_fact_check(claim, sources, prompt, deadline)
             
-            # Parse LLM response (simplified - would need robust JSON parsing)
-            result_text = response['message']['content'].replace('```json', '').replace('```', '').strip()
-            logger.info(f"LLM response for compact fact-check: {result_text}")
-            json_result = json.loads(result_text)
-            # For demo purposes, return mock result
+            result_text = await self._chat(prompt)
+            logger.debug(f"LLM response for compact fact-check ({len(result_text)} chars)")
+            sample = self._parse_verdict(result_text)
             return CompactResult(
                 claim=claim,
-                verdict=json_result["verdict"] if "verdict" in json_result else Verdict.UNCLEAR,
-                confidence=json_result["confidence"] if "confidence" in json_result else 50.0,
-                explanation=json_result["explanation"] if "explanation" in json_result else "No explanation provided",
+                verdict=sample["verdict"],
+                confidence=sample["confidence"],
+                explanation=sample["explanation"],
                 top_sources=sources[:3] if sources else []
             )
             
@@ -111,10 +384,132 @@ class FactCheckService:
                 claim=claim,
                 verdict=Verdict.UNCLEAR,
                 confidence=50.0,
-                explanation="Unable to complete fact-check due to processing error",
+                explanation=PROCESSING_ERROR_EXPLANATION,
                 top_sources=[]
             )
     
+    async def _self_consistent_fact_check(
+        self,
+        claim: str,
+        sources: List[Source],
+        prompt: str,
+        deadline: Optional[float] = None
+    ) -> CompactResult:
+        """Sample the verdict concurrently and derive confidence from the samples' agreement.
+        
+        Sampling stops as soon as enough verdicts agree, so easy claims cost about
+        one call's latency; once the deadline passes, whatever finished is used.
+        """
+        if deadline is None:
+            deadline = bounded_by_deadline(time.monotonic() + settings.self_consistency_budget_ms / 1000)
+        
+        options = {"temperature": settings.self_consistency_temperature}
+        pending = {
+            asyncio.create_task(self._chat(prompt, options={**options, "seed": seed}))
+            for seed in range(settings.self_consistency_samples)
+        }
+        samples: List[Dict[str, Any]] = []
+        early_stop = budget_exhausted = False
+        
+        try:
+            while pending:
+                # Always wait for at least one sample, the budget only bounds the rest
+                timeout = max(deadline - time.monotonic(), 0) if samples else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    budget_exhausted = True
+                    break
+                
+                for task in done:
+                    try:
+                        samples.append(self._parse_verdict(task.result()))
+                    except Exception as e:
+                        logger.error(f"Discarding failed verdict sample: {str(e)}")
+                
+                counts = Counter(sample["verdict"] for sample in samples)
+                if counts and counts.most_common(1)[0][1] >= settings.self_consistency_min_agreement:
+                    early_stop = bool(pending)
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        if not samples:
+            raise ValueError("No verdict samples completed")
+        
+        counts = Counter(sample["verdict"] for sample in samples).most_common()
+        tied = len(counts) > 1 and counts[0][1] == counts[1][1]
+        verdict = Verdict.UNCLEAR if tied else counts[0][0]
+        agreeing = samples if tied else [sample for sample in samples if sample["verdict"] == verdict]
+        
+        # The LLM's own confidence is one input next to source quality and agreement,
+        # weighted by the scorer's base share so the factors don't saturate
+        llm_confidence = sum(sample["confidence"] for sample in agreeing) / len(agreeing) / 100
+        # Agreement only counts once enough samples share the verdict; a lone sample
+        # that beat the budget is not unanimous
+        consensus = confidence_scorer.calculate_verdict_consensus(
+            [sample["verdict"].value for sample in samples]
+        ) if counts[0][1] >= settings.self_consistency_min_agreement else 0.0
+        confidence = confidence_scorer.calculate_confidence(
+            [{"url": source.url, "type": source.type} for source in sources],
+            verdict_consensus=consensus,
+            llm_confidence=llm_confidence * confidence_scorer.base_confidence
+        )
+        confidence = confidence_scorer.adjust_confidence_for_contradictions(
+            confidence,
+            has_contradictions=Verdict.TRUE in dict(counts) and Verdict.FALSE in dict(counts)
+        )
+        
+        self._record_consistency(len(samples), early_stop, budget_exhausted, consensus)
+        return CompactResult(
+            claim=claim,
+            verdict=verdict,
+            confidence=round(confidence * 100, 1),
+            explanation=SAMPLES_DISAGREED_EXPLANATION if tied else agreeing[0]["explanation"],
+            top_sources=sources[:3] if sources else []
+        )
+    
+    def _parse_verdict(self, result_text: str) -> Dict[str, Any]:
+        """Parse the JSON verdict the LLM was asked for, filling in missing fields"""
+        json_result = json.loads(result_text)
+        
+        verdict = Verdict.UNCLEAR
+        for candidate in Verdict:
+            if str(json_result.get("verdict", "")).strip().lower() == candidate.value.lower():
+                verdict = candidate
+        
+        try:
+            confidence = min(max(float(json_result.get("confidence", 50.0)), 0.0), 100.0)
+        except (TypeError, ValueError):
+            confidence = 50.0
+        
+        return {
+            "verdict": verdict,
+            "confidence": confidence,
+            "explanation": json_result.get("explanation") or "No explanation provided"
+        }
+    
+    def _record_consistency(self, samples: int, early_stop: bool, budget_exhausted: bool, consensus: float):
+        with self._stats_lock:
+            self._consistency_stats["claims"] += 1
+            self._consistency_stats["samples"] += samples
+            self._consistency_stats["early_stops"] += int(early_stop)
+            self._consistency_stats["budget_exhausted"] += int(budget_exhausted)
+            self._consistency_stats["consensus_total"] += consensus
+    
+    def get_consistency_stats(self) -> Dict[str, Any]:
+        """Snapshot of self-consistency sampling counters"""
+        with self._stats_lock:
+            stats = dict(self._consistency_stats)
+        
+        claims = stats["claims"] or 1
+        stats["avg_samples"] = stats["samples"] / claims
+        stats["avg_consensus"] = stats.pop("consensus_total") / claims
+        stats["enabled"] = settings.self_consistency_enabled
+        return stats
+    
     async def _generate_detailed_fact_check(self, claim: str, sources: list) -> DetailedResult:
         """Generate detailed fact-check result"""
         
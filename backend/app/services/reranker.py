@@ -0,0 +1,180 @@
+from app.config import settings
+from app.services.embeddings import embedding_service, EmbeddingService
+from app.services.lexical import tokenize
+from typing import List, Dict, Any, Optional
+import asyncio
+import math
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RerankerService:
+    """Narrows a ranked candidate list to the few passages that matter.
+
+    Uses a FastEmbed cross-encoder when ``rerank_model`` is set, otherwise a
+    cheap score from our own embeddings plus query-term coverage.
+    """
+
+    def __init__(self):
+        self.model_name = settings.rerank_model
+        self.model = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "candidates_in": 0,
+            "candidates_scored": 0,
+            "results_out": 0,
+            "early_stops": 0,  # Scoring stopped before the end of the candidate list
+            "gap_cuts": 0,  # Results trimmed at a score gap
+            "budget_exhausted": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0
+        }
+
+    def _initialize_model(self):
+        """Load the cross-encoder on first use"""
+        try:
+            from fastembed.rerank.cross_encoder import TextCrossEncoder
+            self.model = TextCrossEncoder(model_name=self.model_name)
+            logger.info(f"Initialized reranker model: {self.model_name}")
+        except Exception as e:
+            logger.error(f"Failed to initialize reranker model: {str(e)}")
+            raise
+
+    async def rerank(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Rescore candidates and return at most ``limit``, cut at the first clear score gap.
+
+        Candidates are scored in batches in retrieval order. Scoring stops early
+        once ``limit`` candidates are scored and a whole batch scores more than
+        ``rerank_score_gap`` below the weakest of them. At that point the
+        retrieval tail has stopped producing competitive passages, so the
+        cross-encoder never sees the rest.
+        """
+        if not candidates:
+            return []
+
+        started = time.perf_counter()
+        budget = settings.rerank_budget_ms / 1000
+        scored = 0
+        budget_exhausted = False
+        early_stop = False
+        gap_cut = False
+
+        try:
+            scores: List[Optional[float]] = [None] * len(candidates)
+            batch_size = settings.rerank_batch_size
+            for start in range(0, len(candidates), batch_size):
+                if time.perf_counter() - started > budget:
+                    budget_exhausted = True
+                    break
+
+                batch = candidates[start:start + batch_size]
+                batch_scores = await self._score_batch(query, batch)
+                scores[start:start + len(batch)] = batch_scores
+                scored += len(batch)
+
+                if scored >= limit and start + len(batch) < len(candidates):
+                    weakest_kept = sorted(scores[:scored], reverse=True)[limit - 1]
+                    if max(batch_scores) < weakest_kept - settings.rerank_score_gap:
+                        early_stop = True
+                        break
+
+            # Candidates left unscored keep their retrieval order after scored ones
+            ranked = sorted(
+                range(len(candidates)),
+                key=lambda i: (scores[i] is None, -(scores[i] or 0.0), i)
+            )
+
+            results = []
+            for position, index in enumerate(ranked[:limit]):
+                if position >= settings.rerank_min_results:
+                    previous = scores[ranked[position - 1]]
+                    current = scores[index]
+                    if previous is not None and (current is None or previous - current > settings.rerank_score_gap):
+                        gap_cut = True
+                        break
+
+                result = dict(candidates[index])
+                result["rerank_score"] = scores[index]
+                results.append(result)
+
+        except Exception as e:
+            # Reranking is an optimisation, never fail retrieval because of it
+            logger.error(f"Error reranking candidates: {str(e)}")
+            results = candidates[:limit]
+            early_stop = gap_cut = False
+
+        self._record(len(candidates), scored, len(results), early_stop, gap_cut, budget_exhausted, started)
+        return results
+
+    async def _score_batch(self, query: str, batch: List[Dict[str, Any]]) -> List[float]:
+        """Relevance scores in [0, 1] for one batch of candidates"""
+        texts = [candidate["text"] for candidate in batch]
+
+        if self.model_name:
+            if self.model is None:
+                await asyncio.to_thread(self._initialize_model)
+            logits = await asyncio.to_thread(lambda: list(self.model.rerank(query, texts)))
+            return [1 / (1 + math.exp(-logit)) for logit in logits]
+
+        return await self._embedding_scores(query, batch)
+
+    async def _embedding_scores(self, query: str, batch: List[Dict[str, Any]]) -> List[float]:
+        """Dense similarity blended with the share of query terms each passage contains"""
+        missing = [i for i, candidate in enumerate(batch) if candidate.get("score") is None]
+        dense = [candidate.get("score") for candidate in batch]
+
+        if missing:
+            # Lexical-only hits have no similarity yet
+            embeddings = await embedding_service.embed_texts(
+                [query] + [batch[i]["text"] for i in missing]
+            )
+            for i, embedding in zip(missing, embeddings[1:]):
+                dense[i] = float(EmbeddingService.cosine_similarity(embeddings[0], embedding))
+
+        query_terms = set(tokenize(query))
+        scores = []
+        for candidate, similarity in zip(batch, dense):
+            coverage = 0.0
+            if query_terms:
+                coverage = len(query_terms & set(tokenize(candidate["text"]))) / len(query_terms)
+            scores.append(0.8 * similarity + 0.2 * coverage)
+
+        return scores
+
+    def _record(self, candidates: int, scored: int, returned: int,
+                early_stop: bool, gap_cut: bool, budget_exhausted: bool, started: float):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._stats["calls"] += 1
+            self._stats["candidates_in"] += candidates
+            self._stats["candidates_scored"] += scored
+            self._stats["results_out"] += returned
+            self._stats["early_stops"] += int(early_stop)
+            self._stats["gap_cuts"] += int(gap_cut)
+            self._stats["budget_exhausted"] += int(budget_exhausted)
+            self._stats["total_ms"] += elapsed_ms
+            self._stats["max_ms"] = max(self._stats["max_ms"], elapsed_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of reranking counters and latency"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        calls = stats["calls"] or 1
+        stats["avg_ms"] = stats["total_ms"] / calls
+        stats["avg_candidates_in"] = stats["candidates_in"] / calls
+        stats["avg_results_out"] = stats["results_out"] / calls
+        return stats
+
+
+# Global service instance
+reranker_service = RerankerService()
@@ -1,33 +1,29 @@
+from app.config import settings
 from app.services.vector_store import vector_store_service
+from app.services.lexical import lexical_index, reciprocal_rank_fusion, lookup_numbers
+from app.services.reranker import reranker_service
+from app.models.requests import RetrievalFilters
 from app.models.responses import Source
-from typing import List
+from app.core.tracing import traced
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class RetrievalService:
-    async def find_relevant_sources(self, query: str, limit: int = 10) -> List[Source]:
-        """Find relevant sources for a given query"""
+    @traced("find_relevant_sources")
+    async def find_relevant_sources(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[RetrievalFilters] = None
+    ) -> List[Source]:
+        """Find relevant sources for a given query, optionally restricted by filters"""
         try:
-            # Search in vector store
-            search_results = await vector_store_service.similarity_search(
-                query=query,
-                limit=limit
-            )
-            
-            # Convert to Source objects
-            sources = []
-            for result in search_results:
-                # Only include results with reasonable similarity
-                if result["score"] > 0.5:  # Threshold for relevance
-                    source = Source(
-                        name=result["source_name"],
-                        url=result["source_url"] or "#",
-                        excerpt=self._create_excerpt(result["text"]),
-                        type=self._map_source_type(result["source_type"])
-                    )
-                    sources.append(source)
+            results = await self.retrieve(query, limit=limit, filters=filters)
+            sources = self.to_sources(results)
             
             logger.info(f"Found {len(sources)} relevant sources for query")
             return sources
@@ -36,6 +32,148 @@ class RetrievalService:
             logger.error(f"Error finding relevant sources: {str(e)}")
             return []
     
+    async def retrieve(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[RetrievalFilters] = None
+    ) -> List[Dict[str, Any]]:
+        """Return ranked chunk dicts from dense and (optionally) lexical search"""
+        return (await self.retrieve_batch([query], limit=limit, filters=filters))[0]
+    
+    @traced("retrieve_batch")
+    async def retrieve_batch(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        filters: Optional[RetrievalFilters] = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Retrieve for several queries, sharing one embedding call and one vector search"""
+        if not queries:
+            return []
+        
+        # Reranking narrows a deeper candidate set down to the final limit
+        candidate_limit = limit
+        if settings.rerank_enabled:
+            candidate_limit = max(limit, settings.rerank_candidates)
+        
+        # The lexical tasks are scheduled first so their worker threads are already
+        # running while the dense search embeds the queries and calls Qdrant
+        lexical_tasks = []
+        if settings.hybrid_search_enabled:
+            lexical_tasks = [
+                asyncio.to_thread(lexical_index.search, query, settings.lexical_candidates, filters)
+                for query in queries
+            ]
+        # Exact numeric lookup runs with or without hybrid search
+        numeric_tasks = [
+            vector_store_service.numeric_search(
+                lookup_numbers(query, settings.numeric_lookup_min_value) if settings.numeric_lookup_enabled else [],
+                limit=settings.numeric_lookup_candidates,
+                filters=filters
+            )
+            for query in queries
+        ]
+        gathered = await asyncio.gather(
+            *lexical_tasks,
+            vector_store_service.similarity_search_batch(
+                queries, limit=candidate_limit, filters=filters, query_embeddings=query_embeddings
+            ),
+            *numeric_tasks
+        )
+        lexical_batches = gathered[:len(lexical_tasks)] or [[] for _ in queries]
+        dense_batches = gathered[len(lexical_tasks)]
+        numeric_batches = gathered[len(lexical_tasks) + 1:]
+        
+        candidate_lists = await asyncio.gather(*(
+            self._fuse(self._apply_threshold(dense), lexical, candidate_limit, numeric, filters)
+            if settings.hybrid_search_enabled or numeric else self._thresholded(dense, candidate_limit)
+            for dense, lexical, numeric in zip(dense_batches, lexical_batches, numeric_batches)
+        ))
+        
+        if settings.rerank_enabled:
+            return list(await asyncio.gather(*(
+                reranker_service.rerank(query, candidates, limit)
+                for query, candidates in zip(queries, candidate_lists)
+            )))
+        return [candidates[:limit] for candidates in candidate_lists]
+    
+    def to_sources(self, results: List[Dict[str, Any]]) -> List[Source]:
+        """Convert ranked chunk dicts into API Source objects"""
+        return [
+            Source(
+                name=result["source_name"],
+                url=self._source_url(result),
+                excerpt=self._create_excerpt(result["text"]),
+                type=self._map_source_type(result["source_type"])
+            )
+            for result in results
+        ]
+    
+    def _source_url(self, result: Dict[str, Any]) -> str:
+        """Source URL, pointing at the page for paginated documents"""
+        url = result["source_url"] or "#"
+        if result.get("page") and url != "#" and "#" not in url:
+            url = f"{url}#page={result['page']}"
+        return url
+    
+    async def _thresholded(self, dense_results: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """Dense-only candidates when there is nothing to fuse them with"""
+        return self._apply_threshold(dense_results)[:limit]
+    
+    def _apply_threshold(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Only keep dense results with reasonable similarity"""
+        return [
+            result for result in results
+            if result["score"] > settings.retrieval_score_threshold
+        ]
+    
+    async def _fuse(
+        self,
+        dense_results: List[Dict[str, Any]],
+        lexical_hits: List[Tuple[str, float]],
+        limit: int,
+        numeric_results: Optional[List[Dict[str, Any]]] = None,
+        filters: Optional[RetrievalFilters] = None
+    ) -> List[Dict[str, Any]]:
+        """Merge dense, lexical and exact numeric rankings with reciprocal-rank fusion.
+        
+        Numeric hits skip the dense threshold, so their ranking is weighted
+        down: a chunk that only shares a number with the query ranks below
+        chunks that dense or lexical search agree on.
+        """
+        numeric_results = numeric_results or []
+        by_id = {result["id"]: result for result in numeric_results}
+        by_id.update((result["id"], result) for result in dense_results)
+        lexical_scores = dict(lexical_hits)
+        
+        # Lexical-only hits need their payload fetched from the vector store
+        missing = [doc_id for doc_id, _ in lexical_hits if doc_id not in by_id]
+        for result in await vector_store_service.get_points(missing, filters):
+            by_id[result["id"]] = result
+        
+        fused = reciprocal_rank_fusion(
+            [
+                [result["id"] for result in dense_results],
+                [doc_id for doc_id, _ in lexical_hits if doc_id in by_id],
+                [result["id"] for result in numeric_results]
+            ],
+            k=settings.rrf_k,
+            weights=[1.0, 1.0, settings.numeric_lookup_weight]
+        )
+        
+        numeric_ids = {result["id"] for result in numeric_results}
+        results = []
+        for doc_id, fused_score in fused[:limit]:
+            result = dict(by_id[doc_id])
+            result["lexical_score"] = lexical_scores.get(doc_id)
+            result["numeric_match"] = doc_id in numeric_ids
+            result["fused_score"] = fused_score
+            results.append(result)
+        
+        return results
+    
     def _create_excerpt(self, text: str, max_length: int = 500) -> str:
         """Create a brief excerpt from text"""
         if len(text) <= max_length:
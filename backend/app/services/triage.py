@@ -0,0 +1,207 @@
+from app.config import settings
+from app.core.confidence import confidence_scorer
+from app.models.requests import RetrievalFilters
+from app.models.responses import CompactResult, Verdict, Source
+from app.services.lexical import tokenize
+from app.services.reranker import reranker_service
+from app.services.verdict_cache import verdict_cache
+from app.utils.text import detect_claim_type, is_valid_claim
+from typing import List, Dict, Any, Optional, Tuple
+import re
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Reasoning steps and limitations reported for a claim each triage decision answered
+DECISION_REASONING: Dict[str, Tuple[List[str], str]] = {
+    "cache_hit": (
+        [
+            "Matched the claim to a previously verified claim",
+            "Reused its verdict, checked against the same sources and library contents"
+        ],
+        "Verdict reused from an earlier check of the same claim rather than reviewed again"
+    ),
+    "semantic_hit": (
+        [
+            "Matched the claim to a previously verified claim with the same meaning",
+            "Reused that claim's verdict, checked against the same sources and library contents"
+        ],
+        "Verdict reused from a similarly worded claim; differences in wording were not reviewed"
+    ),
+    "non_claim": (
+        [
+            "Checked that the input is a factual claim",
+            "The input is not a checkable claim, so no sources were searched"
+        ],
+        "No fact-check was performed"
+    ),
+    "no_evidence": (
+        [
+            "Checked the claim against previously verified claims",
+            "Searched relevant sources in knowledge base",
+            "No source was relevant enough to verify the claim, so no LLM review was run"
+        ],
+        "The verdict reflects missing evidence in the library, not evidence against the claim"
+    ),
+}
+
+
+class TriageService:
+    """Answers obvious cases before they reach the LLM.
+
+    Claims that were already verified (or paraphrase one that was), inputs
+    that are not claims and claims with no usable evidence in the library are
+    resolved here. Every decision is counted together with an estimate of the
+    LLM time it saved.
+    """
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self._decisions: Dict[str, int] = {
+            "cache_hit": 0, "semantic_hit": 0, "non_claim": 0, "no_evidence": 0, "llm": 0
+        }
+        self._by_claim_type: Dict[str, Dict[str, int]] = {}
+        self._llm_seconds_total = 0.0
+        self._llm_seconds_saved = 0.0
+
+    def before_retrieval(
+        self,
+        claim: str,
+        filters: Optional[RetrievalFilters] = None,
+        library_version: int = 0
+    ) -> Optional[Tuple[str, CompactResult]]:
+        """Resolve a claim from the verdict cache or reject a non-claim, returning the decision and result"""
+        if settings.verdict_cache_enabled:
+            cached = verdict_cache.get(claim, filters, library_version)
+            if cached is not None:
+                self._record(claim, "cache_hit")
+                return "cache_hit", cached.model_copy(update={"claim": claim})
+
+        if not settings.triage_enabled:
+            return None
+
+        # Typed claims often lack the closing punctuation is_valid_claim looks for
+        text = claim.strip()
+        if text and not re.search(r'[.!?]$', text):
+            text += "."
+        if not is_valid_claim(text):
+            self._record(claim, "non_claim")
+            return "non_claim", CompactResult(
+                claim=claim,
+                verdict=Verdict.UNCLEAR,
+                confidence=0.0,
+                explanation="Input does not look like a factual claim that can be checked",
+                top_sources=[]
+            )
+
+        return None
+
+    def match_paraphrase(
+        self,
+        claim: str,
+        embedding: List[float],
+        filters: Optional[RetrievalFilters] = None,
+        library_version: int = 0
+    ) -> Optional[Tuple[str, CompactResult]]:
+        """Reuse the verdict of a previously checked claim that says the same thing"""
+        if not (settings.verdict_cache_enabled and settings.semantic_cache_enabled):
+            return None
+
+        match = verdict_cache.get_similar(claim, embedding, filters, library_version)
+        if match is None:
+            return None
+
+        cached, similarity = match
+        self._record(claim, "semantic_hit")
+        return "semantic_hit", cached.model_copy(update={
+            "claim": claim,
+            "explanation": f"{cached.explanation} (reused from a similar checked claim, similarity {similarity:.2f})"
+        })
+
+    def after_retrieval(
+        self,
+        claim: str,
+        results: List[Dict[str, Any]],
+        sources: List[Source]
+    ) -> Optional[Tuple[str, CompactResult]]:
+        """Resolve a claim whose retrieval evidence is too weak to reason over"""
+        if not settings.triage_enabled:
+            return None
+
+        if self._has_evidence(claim, results):
+            return None
+
+        self._record(claim, "no_evidence")
+        confidence = confidence_scorer.calculate_confidence(
+            [{"url": source.url, "type": source.type} for source in sources],
+            verdict_consensus=0.0,
+            llm_confidence=0.0
+        )
+        return "no_evidence", CompactResult(
+            claim=claim,
+            verdict=Verdict.UNCLEAR,
+            confidence=round(confidence * 100, 1),
+            explanation="No sufficiently relevant sources found in the library",
+            top_sources=sources[:3]
+        )
+
+    def _has_evidence(self, claim: str, results: List[Dict[str, Any]]) -> bool:
+        """Whether any result is relevant by a score whose scale its threshold was set for"""
+        claim_terms = set(tokenize(claim))
+        for result in results:
+            # Exact numeric matches and lexical hits have no dense score
+            if result.get("numeric_match"):
+                return True
+            score = result.get("score")
+            if score is not None and score >= settings.triage_min_evidence_score:
+                return True
+            rerank_score = result.get("rerank_score")
+            if (reranker_service.model_name and rerank_score is not None
+                    and rerank_score >= settings.triage_min_rerank_score):
+                return True
+            if result.get("lexical_score") is not None and claim_terms:
+                coverage = len(claim_terms & set(tokenize(result["text"]))) / len(claim_terms)
+                if coverage >= settings.triage_min_term_coverage:
+                    return True
+        return False
+
+    def record_llm(self, claim: str, seconds: float):
+        """Count a claim that needed the LLM and how long it took"""
+        with self._stats_lock:
+            self._llm_seconds_total += seconds
+        self._record(claim, "llm")
+
+    def _record(self, claim: str, decision: str):
+        claim_type = detect_claim_type(claim)
+        with self._stats_lock:
+            self._decisions[decision] += 1
+            by_type = self._by_claim_type.setdefault(claim_type, {})
+            by_type[decision] = by_type.get(decision, 0) + 1
+
+            # Short-circuits save roughly one average LLM verification each
+            if decision != "llm" and self._decisions["llm"]:
+                self._llm_seconds_saved += self._llm_seconds_total / self._decisions["llm"]
+
+        logger.info(f"Triage decision for {claim_type} claim: {decision}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of triage decisions and LLM time saved"""
+        with self._stats_lock:
+            decisions = dict(self._decisions)
+            stats = {
+                "decisions": decisions,
+                "by_claim_type": {key: dict(value) for key, value in self._by_claim_type.items()},
+                "llm_seconds_total": self._llm_seconds_total,
+                "llm_seconds_saved": self._llm_seconds_saved
+            }
+
+        total = sum(decisions.values())
+        stats["avg_llm_seconds"] = stats["llm_seconds_total"] / (decisions["llm"] or 1)
+        stats["short_circuit_rate"] = (total - decisions["llm"]) / (total or 1)
+        stats["verdict_cache"] = verdict_cache.get_stats()
+        return stats
+
+
+# Global service instance
+triage_service = TriageService()
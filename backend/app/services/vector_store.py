@@ -1,34 +1,83 @@
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition
+from qdrant_client.models import (
+    Distance, VectorParams, VectorParamsDiff, PointStruct, Filter, FieldCondition,
+    MatchValue, MatchAny, PayloadSchemaType, HnswConfigDiff, SearchParams,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig, QuantizationSearchParams,
+    Disabled, Range, SearchRequest, NestedCondition, Nested
+)
 from app.config import settings
+from app.models.requests import RetrievalFilters
 from app.services.embeddings import embedding_service
+from app.services.lexical import PROVENANCE_FIELDS, attribute_to_filters, lexical_index
+from app.core.dedup import near_duplicate_index
 from app.core.sources import source_manager
+from app.core.metrics import stage_timer, INGEST_CHUNKS, INGEST_SECONDS, INGEST_THROUGHPUT
+from app.core.tracing import traced
 from typing import List, Dict, Any, Optional
+import asyncio
+import time
 import uuid
 import logging
 
-from app.core.chunking import text_chunker
+from app.core.chunking import text_chunker, TextChunk
 
 logger = logging.getLogger(__name__)
 
+# Payload fields that filtered searches and deletes match on
+PAYLOAD_INDEXES = {
+    "source_name": PayloadSchemaType.KEYWORD,
+    "source_type": PayloadSchemaType.KEYWORD,
+    "source_url": PayloadSchemaType.KEYWORD,
+    "is_trusted": PayloadSchemaType.BOOL,
+    "also_in_sources[].source_name": PayloadSchemaType.KEYWORD,
+    "also_in_sources[].source_type": PayloadSchemaType.KEYWORD,
+    "also_in_sources[].is_trusted": PayloadSchemaType.BOOL,
+    "numeric_values": PayloadSchemaType.FLOAT,
+}
+
+# Payload fields the library listing reads; skips chunk text and token ids
+SOURCE_LISTING_FIELDS = ["source_name", "source_url", "source_type", "is_trusted", "also_in_sources"]
+
 
 class VectorStoreService:
     def __init__(self):
         self.client = None
         self.collection_name = settings.qdrant_collection_name
+        self._seed_pending = False
+        # Bumped on every library change so derived caches know when they are stale
+        self.library_version = 0
         self._initialize_client()
     
+    @property
+    def is_local(self) -> bool:
+        """Whether the collection lives in-process rather than on a Qdrant server"""
+        return settings.vector_store_backend == "local"
+    
+    def _create_client(self) -> QdrantClient:
+        """Create a Qdrant client for the configured backend"""
+        if self.is_local:
+            # Embedded mode: exact search in-process, persisted to qdrant_path if set
+            if settings.qdrant_path:
+                return QdrantClient(path=settings.qdrant_path)
+            return QdrantClient(location=":memory:")
+        
+        return QdrantClient(
+            host=settings.qdrant_host,
+            port=settings.qdrant_port
+        )
+    
     def _initialize_client(self):
         """Initialize Qdrant client and create collection if needed"""
         try:
-            self.client = QdrantClient(
-                host=settings.qdrant_host,
-                port=settings.qdrant_port
-            )
+            self.client = self._create_client()
             
             # Create collection if it doesn't exist
             self._ensure_collection_exists()
-            logger.info(f"Connected to Qdrant: {settings.qdrant_host}:{settings.qdrant_port}")
+            if self.is_local:
+                logger.info(f"Using local Qdrant: {settings.qdrant_path or ':memory:'}")
+            else:
+                logger.info(f"Connected to Qdrant: {settings.qdrant_host}:{settings.qdrant_port}")
             
         except Exception as e:
             logger.error(f"Failed to connect to Qdrant: {str(e)}")
@@ -47,157 +96,566 @@ class VectorStoreService:
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
                         size=embedding_service.get_embedding_dimension(),
-                        distance=Distance.COSINE
-                    )
+                        distance=Distance.COSINE,
+                        on_disk=settings.qdrant_on_disk_vectors
+                    ),
+                    hnsw_config=self._hnsw_config(),
+                    quantization_config=self._quantization_config()
                 )
                 logger.info(f"Created collection: {self.collection_name}")
                 
-                # Seed default sources for new collection
-                import asyncio
-                asyncio.create_task(self._seed_default_sources())
+                # Seed default sources for new collection, or at startup if no loop is running yet
+                self._seed_pending = True
+                try:
+                    asyncio.get_running_loop().create_task(self.seed_pending_sources())
+                except RuntimeError:
+                    pass
+            elif settings.qdrant_migrate_collection and not self.is_local:
+                self._migrate_collection_config()
+            
+            # Local mode scans payloads directly, indexes have no effect there
+            if not self.is_local:
+                self._ensure_payload_indexes()
             
         except Exception as e:
             logger.error(f"Error ensuring collection exists: {str(e)}")
             raise
     
-    async def store_document_chunks(self, chunks: List[Dict[str, Any]]) -> List[str]:
-        """Store document chunks with embeddings"""
+    def _hnsw_config(self) -> HnswConfigDiff:
+        """HNSW graph parameters from settings"""
+        return HnswConfigDiff(
+            m=settings.qdrant_hnsw_m,
+            ef_construct=settings.qdrant_hnsw_ef_construct,
+            on_disk=settings.qdrant_hnsw_on_disk
+        )
+    
+    def _quantization_config(self):
+        """Vector quantization config from settings, None when disabled"""
+        if settings.qdrant_quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=settings.qdrant_quantization_always_ram
+                )
+            )
+        if settings.qdrant_quantization == "binary":
+            return BinaryQuantization(
+                binary=BinaryQuantizationConfig(
+                    always_ram=settings.qdrant_quantization_always_ram
+                )
+            )
+        return None
+    
+    def _search_params(self) -> SearchParams:
+        """Search-time HNSW and quantization parameters from settings"""
+        quantization = None
+        if settings.qdrant_quantization != "none":
+            quantization = QuantizationSearchParams(
+                rescore=settings.qdrant_quantization_rescore,
+                oversampling=settings.qdrant_quantization_oversampling
+            )
+        return SearchParams(hnsw_ef=settings.qdrant_hnsw_ef, quantization=quantization)
+    
+    def _migrate_collection_config(self):
+        """Bring an existing collection's index configuration in line with settings"""
+        config = self.client.get_collection(self.collection_name).config
+        changes = {}
+        
+        hnsw = config.hnsw_config
+        if (hnsw.m, hnsw.ef_construct, bool(hnsw.on_disk)) != (
+            settings.qdrant_hnsw_m, settings.qdrant_hnsw_ef_construct, settings.qdrant_hnsw_on_disk
+        ):
+            changes["hnsw_config"] = self._hnsw_config()
+        
+        vectors = config.params.vectors
+        if isinstance(vectors, VectorParams) and bool(vectors.on_disk) != settings.qdrant_on_disk_vectors:
+            changes["vectors_config"] = {"": VectorParamsDiff(on_disk=settings.qdrant_on_disk_vectors)}
+        
+        current = config.quantization_config
+        desired = self._quantization_config()
+        if current != desired:
+            changes["quantization_config"] = desired or Disabled.DISABLED
+        
+        if not changes:
+            return
+        
+        # Qdrant rebuilds the affected segments in the background
+        self.client.update_collection(collection_name=self.collection_name, **changes)
+        logger.info(f"Migrated collection {self.collection_name} config: {', '.join(changes)}")
+    
+    def _ensure_payload_indexes(self):
+        """Create payload indexes used by filtered search and deletes"""
+        existing = self.client.get_collection(self.collection_name).payload_schema or {}
+        
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            if field_name in existing:
+                continue
+            
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+            logger.info(f"Created payload index on {field_name}")
+    
+    def _build_filter(self, filters: Optional[RetrievalFilters]) -> Optional[Filter]:
+        """Translate retrieval filters into a Qdrant payload filter.
+        
+        A point matches when its own source or one of the sources merged into
+        it (``also_in_sources``) passes every condition, so merged
+        near-duplicates stay visible to filters naming their source.
+        """
+        if filters is None:
+            return None
+        
+        must = []
+        must_not = []
+        
+        if filters.source_types:
+            must.append(FieldCondition(key="source_type", match=MatchAny(any=filters.source_types)))
+        if filters.source_names:
+            must.append(FieldCondition(key="source_name", match=MatchAny(any=filters.source_names)))
+        if filters.exclude_sources:
+            must_not.append(FieldCondition(key="source_name", match=MatchAny(any=filters.exclude_sources)))
+        if filters.trusted_only:
+            # Points stored before the trust flag existed count as trusted
+            must_not.append(FieldCondition(key="is_trusted", match=MatchValue(value=False)))
+        
+        if not must and not must_not:
+            return None
+        
+        provider = Filter(must=must or None, must_not=must_not or None)
+        return Filter(should=[
+            provider,
+            NestedCondition(nested=Nested(key="also_in_sources", filter=provider))
+        ])
+    
+    def split_text(self, text: str) -> List[TextChunk]:
+        """Chunk text for embedding using the configured chunking mode"""
+        if settings.chunking_mode == "tokens":
+            return list(text_chunker.iter_token_chunks(
+                text,
+                embedding_service.get_chunking_tokenizer(),
+                settings.chunk_max_tokens or embedding_service.get_max_tokens(),
+                settings.chunk_overlap_tokens
+            ))
+        return list(text_chunker.iter_chunks(text))
+    
+    def split_document(self, document) -> List[TextChunk]:
+        """Chunk a Docling document along its sections and tables"""
+        split_table = None
+        if settings.chunking_mode == "tokens":
+            tokenizer = embedding_service.get_chunking_tokenizer()
+            max_tokens = settings.chunk_max_tokens or embedding_service.get_max_tokens()
+            split_table = lambda markdown: text_chunker.iter_table_chunks(markdown, tokenizer, max_tokens)
+        return list(text_chunker.iter_document_chunks(document, split=self.split_text, split_table=split_table))
+    
+    @traced("store_document_chunks")
+    async def store_document_chunks(self, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store document chunks with embeddings, merging near-duplicates of existing chunks"""
         try:
             if not chunks:
-                return []
+                return {"point_ids": [], "chunks_stored": 0, "duplicates_merged": 0, "dedup_ratio": 0.0}
             
-            # Generate embeddings for all chunks
-            texts = [chunk["text"] for chunk in chunks]
-            embeddings = await embedding_service.embed_texts(texts)
+            self.library_version += 1
+            started = time.perf_counter()
+            payloads = [self._chunk_payload(chunk, i) for i, chunk in enumerate(chunks)]
+            unique, provenance_updates = self._merge_near_duplicates(payloads)
+            merged = len(payloads) - len(unique)
+            point_ids = [point_id for point_id, _ in unique]
             
-            # Prepare points for insertion
-            points = []
-            point_ids = []
+            try:
+                if unique:
+                    embeddings = await self._embed_chunks([chunks[i] for _, i in unique])
+                    
+                    # Prepare points for insertion
+                    points = [
+                        PointStruct(id=point_id, vector=embedding, payload=payloads[i])
+                        for (point_id, i), embedding in zip(unique, embeddings)
+                    ]
+                    
+                    # Insert points into collection
+                    self.client.upsert(
+                        collection_name=self.collection_name,
+                        points=points
+                    )
+                    self._index_lexical(points)
+                # Existing chunks only cite the duplicates once the batch carrying them is stored
+                self._apply_provenance_updates(provenance_updates)
+            except Exception:
+                near_duplicate_index.remove(point_ids)
+                raise
+            finally:
+                # Bump again once the write is visible so nothing read mid-write carries the final version
+                self.library_version += 1
             
-            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                point_id = str(uuid.uuid4())
-                point_ids.append(point_id)
-                
-                points.append(PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload={
-                        "text": chunk["text"],
-                        "source_name": chunk["source_name"],
-                        "source_url": chunk.get("source_url", ""),
-                        "source_type": chunk["source_type"],
-                        "page": chunk.get("page", 0),
-                        "chunk_index": chunk.get("chunk_index", i)
-                    }
-                ))
+            elapsed = time.perf_counter() - started
+            INGEST_SECONDS.observe(elapsed)
+            INGEST_CHUNKS.labels(outcome="stored").inc(len(unique))
+            INGEST_CHUNKS.labels(outcome="merged").inc(merged)
+            if elapsed > 0:
+                INGEST_THROUGHPUT.set(len(chunks) / elapsed)
             
-            # Insert points into collection
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=points
+            dedup_ratio = merged / len(chunks)
+            logger.info(
+                f"Stored {len(unique)} chunks in vector store, "
+                f"merged {merged} near-duplicates ({dedup_ratio:.1%})"
             )
-            
-            logger.info(f"Stored {len(points)} chunks in vector store")
-            return point_ids
+            return {
+                "point_ids": point_ids,
+                "chunks_stored": len(unique),
+                "duplicates_merged": merged,
+                "dedup_ratio": dedup_ratio
+            }
             
         except Exception as e:
             logger.error(f"Error storing document chunks: {str(e)}")
             raise
     
-    async def similarity_search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def _embed_chunks(self, chunks: List[Dict[str, Any]]) -> List[List[float]]:
+        """Embed chunks, reusing model input ids where the chunker already produced them"""
+        tokenized = [i for i, chunk in enumerate(chunks) if chunk.get("token_ids")]
+        plain = [i for i, chunk in enumerate(chunks) if not chunk.get("token_ids")]
+        
+        embeddings: List[Optional[List[float]]] = [None] * len(chunks)
+        if tokenized:
+            vectors = await embedding_service.embed_token_ids([chunks[i]["token_ids"] for i in tokenized])
+            for i, vector in zip(tokenized, vectors):
+                embeddings[i] = vector
+        if plain:
+            vectors = await embedding_service.embed_texts([chunks[i]["text"] for i in plain])
+            for i, vector in zip(plain, vectors):
+                embeddings[i] = vector
+        
+        return embeddings
+    
+    def _chunk_payload(self, chunk: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """Build the stored payload for a chunk"""
+        payload = {
+            "text": chunk["text"],
+            "source_name": chunk["source_name"],
+            "source_url": chunk.get("source_url", ""),
+            "source_type": chunk["source_type"],
+            "page": chunk.get("page", 0),
+            "chunk_index": chunk.get("chunk_index", index),
+            "is_trusted": chunk.get("is_trusted", True)
+        }
+        if chunk.get("page_end"):
+            payload["page_end"] = chunk["page_end"]
+        if chunk.get("headings"):
+            payload["headings"] = chunk["headings"]
+        if chunk.get("is_web_source"):
+            payload["is_web_source"] = True
+        if chunk.get("row_start") is not None:
+            payload["row_start"] = chunk["row_start"]
+            payload["row_end"] = chunk["row_end"]
+        if chunk.get("numeric_values"):
+            payload["numeric_values"] = chunk["numeric_values"]
+        return payload
+    
+    def _merge_near_duplicates(self, payloads: List[Dict[str, Any]]):
+        """Split payloads into new points and near-duplicates of indexed chunks.
+        
+        Returns ``(point_id, payload_index)`` pairs for the new points and the
+        provenance to append to already stored chunks, keyed by point id.
+        Duplicates are not stored again; duplicates of new points are added
+        to their ``also_in_sources`` payload here, while stored chunks are
+        only updated by ``_apply_provenance_updates`` after the upsert.
+        CSV row chunks are always stored as new points.
+        """
+        if not settings.dedup_enabled:
+            return [(str(uuid.uuid4()), i) for i in range(len(payloads))], {}
+        
+        unique = []
+        new_by_id = {}
+        provenance_updates: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for i, payload in enumerate(payloads):
+            # Row chunks are never merged: their numeric values are only searched on the point itself
+            if "row_start" in payload:
+                unique.append((str(uuid.uuid4()), i))
+                continue
+            
+            signature = near_duplicate_index.signature(payload["text"])
+            # Trusted and untrusted copies are kept apart so trust filters see both
+            duplicate_id = near_duplicate_index.find_duplicate(signature, group=payload["is_trusted"])
+            
+            if duplicate_id is None:
+                point_id = str(uuid.uuid4())
+                near_duplicate_index.add(point_id, signature, group=payload["is_trusted"])
+                unique.append((point_id, i))
+                new_by_id[point_id] = payload
+                continue
+            
+            provenance = {key: payload[key] for key in PROVENANCE_FIELDS if key in payload}
+            if duplicate_id in new_by_id:
+                new_by_id[duplicate_id].setdefault("also_in_sources", []).append(provenance)
+            else:
+                provenance_updates.setdefault(duplicate_id, []).append(provenance)
+        
+        return unique, provenance_updates
+    
+    def _apply_provenance_updates(self, provenance_updates: Dict[str, List[Dict[str, Any]]]):
+        """Append merged duplicates to the ``also_in_sources`` of stored chunks"""
+        if not provenance_updates:
+            return
+        
+        records = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(provenance_updates),
+            with_payload=True
+        )
+        for record in records:
+            also_in_sources = record.payload.get("also_in_sources", []) + provenance_updates[str(record.id)]
+            self.client.set_payload(
+                collection_name=self.collection_name,
+                payload={"also_in_sources": also_in_sources},
+                points=[record.id]
+            )
+            lexical_index.update_provenance(str(record.id), {**record.payload, "also_in_sources": also_in_sources})
+    
+    @traced("similarity_search")
+    async def similarity_search(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[RetrievalFilters] = None
+    ) -> List[Dict[str, Any]]:
         """Search for similar documents using vector similarity"""
         try:
             # Generate embedding for query
             query_embedding = await embedding_service.embed_single_text(query)
             
             # Search in Qdrant
-            search_results = self.client.search(
-                collection_name=self.collection_name,
-                query_vector=query_embedding,
-                limit=limit,
-                with_payload=True
-            )
+            with stage_timer("vector_search"):
+                search_results = self.client.search(
+                    collection_name=self.collection_name,
+                    query_vector=query_embedding,
+                    query_filter=self._build_filter(filters),
+                    search_params=self._search_params(),
+                    limit=limit,
+                    with_payload=True
+                )
             
             # Format results
-            results = []
-            for result in search_results:
-                results.append({
-                    "id": result.id,
-                    "score": result.score,
-                    "text": result.payload.get("text", ""),
-                    "source_name": result.payload.get("source_name", ""),
-                    "source_url": result.payload.get("source_url", ""),
-                    "source_type": result.payload.get("source_type", ""),
-                    "page": result.payload.get("page", 0)
-                })
-            
-            return results
+            return self._format_points(search_results, filters)
             
         except Exception as e:
             logger.error(f"Error in similarity search: {str(e)}")
             raise
     
+    @traced("similarity_search_batch")
+    async def similarity_search_batch(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        filters: Optional[RetrievalFilters] = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Vector search for several queries with one embedding call and one Qdrant request"""
+        if not queries:
+            return []
+        
+        try:
+            if query_embeddings is None:
+                query_embeddings = await embedding_service.embed_texts(queries)
+            query_filter = self._build_filter(filters)
+            search_params = self._search_params()
+            
+            with stage_timer("vector_search"):
+                batch_results = self.client.search_batch(
+                    collection_name=self.collection_name,
+                    requests=[
+                        SearchRequest(
+                            vector=embedding,
+                            filter=query_filter,
+                            params=search_params,
+                            limit=limit,
+                            with_payload=True
+                        )
+                        for embedding in query_embeddings
+                    ]
+                )
+            
+            return [self._format_points(results, filters) for results in batch_results]
+            
+        except Exception as e:
+            logger.error(f"Error in batch similarity search: {str(e)}")
+            raise
+    
+    @traced("numeric_search")
+    async def numeric_search(
+        self,
+        values: List[float],
+        limit: int = 10,
+        filters: Optional[RetrievalFilters] = None
+    ) -> List[Dict[str, Any]]:
+        """Find chunks whose indexed numeric columns contain one of the values exactly"""
+        if not values:
+            return []
+        
+        try:
+            numeric_filter = Filter(should=[
+                FieldCondition(key="numeric_values", range=Range(gte=value, lte=value))
+                for value in values
+            ])
+            base_filter = self._build_filter(filters)
+            if base_filter is not None:
+                numeric_filter = Filter(must=[numeric_filter, base_filter])
+            
+            with stage_timer("numeric_search"):
+                points, _ = self.client.scroll(
+                    collection_name=self.collection_name,
+                    scroll_filter=numeric_filter,
+                    limit=limit,
+                    with_payload=True,
+                    with_vectors=False
+                )
+            return self._format_points(points, filters)
+            
+        except Exception as e:
+            logger.error(f"Error in numeric search: {str(e)}")
+            raise
+    
+    async def get_points(
+        self,
+        point_ids: List[str],
+        filters: Optional[RetrievalFilters] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch stored chunks by point ID, in the order requested, attributed as under the filters"""
+        if not point_ids:
+            return []
+        
+        records = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=point_ids,
+            with_payload=True
+        )
+        by_id = {result["id"]: result for result in self._format_points(records, filters)}
+        return [by_id[point_id] for point_id in point_ids if point_id in by_id]
+    
+    def _format_points(self, points, filters: Optional[RetrievalFilters]) -> List[Dict[str, Any]]:
+        """Flatten Qdrant points into result dicts, dropping those no providing source of passes the filters"""
+        results = []
+        for point in points:
+            payload = attribute_to_filters(point.payload, filters)
+            if payload is not None:
+                results.append(self._format_point(point, getattr(point, "score", None), payload))
+        return results
+    
+    def _format_point(self, point, score: Optional[float], payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Flatten a Qdrant point into the result dict used by retrieval"""
+        payload = point.payload if payload is None else payload
+        return {
+            "id": str(point.id),
+            "score": score,
+            "text": payload.get("text", ""),
+            "source_name": payload.get("source_name", ""),
+            "source_url": payload.get("source_url", ""),
+            "source_type": payload.get("source_type", ""),
+            "page": payload.get("page", 0),
+            "headings": payload.get("headings", []),
+            "is_trusted": payload.get("is_trusted", True),
+            "also_in_sources": payload.get("also_in_sources", [])
+        }
+    
+    def _index_lexical(self, points: List[PointStruct]):
+        """Add freshly upserted points to the BM25 index"""
+        lexical_index.add_documents([
+            (str(point.id), point.payload["text"], point.payload) for point in points
+        ])
+    
+    async def rebuild_local_indexes(self, batch_size: int = 1000):
+        """Rebuild the in-memory BM25 and near-duplicate indexes from the collection"""
+        try:
+            offset = None
+            while True:
+                records, offset = self.client.scroll(
+                    collection_name=self.collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True
+                )
+                if settings.hybrid_search_enabled:
+                    lexical_index.add_documents([
+                        (str(record.id), record.payload.get("text", ""), record.payload)
+                        for record in records
+                    ])
+                if settings.dedup_enabled:
+                    for record in records:
+                        if "row_start" in record.payload:
+                            continue
+                        near_duplicate_index.add(
+                            str(record.id),
+                            near_duplicate_index.signature(record.payload.get("text", "")),
+                            group=record.payload.get("is_trusted", True)
+                        )
+                if offset is None:
+                    break
+                # Let requests run between batches on large collections
+                await asyncio.sleep(0)
+            
+            logger.info(
+                f"Local indexes rebuilt: {len(lexical_index)} lexical, "
+                f"{len(near_duplicate_index)} dedup signatures"
+            )
+            
+        except Exception as e:
+            logger.error(f"Error rebuilding local indexes: {str(e)}")
+    
     async def get_all_sources(self) -> List[Dict[str, Any]]:
         """Get all unique sources in the collection"""
         try:
-            # This is a simplified implementation
-            # In a real system, you'd want to aggregate by source
-            search_results = self.client.scroll(
-                collection_name=self.collection_name,
-                limit=1000,
-                with_payload=True
-            )[0]  # Get the points, ignore next_page_offset
-            
-            # Group by source
-            sources = {}
-            for point in search_results:
-                source_name = point.payload.get("source_name", "Unknown")
+            # The scroll is blocking and touches every point, so keep it off the event loop
+            return await asyncio.to_thread(self._collect_sources)
+            
+        except Exception as e:
+            logger.error(f"Error fetching all sources: {str(e)}")
+            raise
+    
+    def _collect_sources(self) -> List[Dict[str, Any]]:
+        """Group every point by source, reading only the listing fields"""
+        # A chunk merged as a near-duplicate counts for every source providing it
+        sources = {}
+        for point in self._scroll_all(None, with_payload=SOURCE_LISTING_FIELDS):
+            for provider in [point.payload, *point.payload.get("also_in_sources", [])]:
+                source_name = provider.get("source_name", "Unknown")
                 if source_name not in sources:
                     sources[source_name] = {
                         "source_name": source_name,
-                        "source_url": point.payload.get("source_url", ""),
-                        "source_type": point.payload.get("source_type", ""),
+                        "source_url": provider.get("source_url", ""),
+                        "source_type": provider.get("source_type", ""),
+                        "is_trusted": provider.get("is_trusted", True),
                         "chunk_count": 0
                     }
                 sources[source_name]["chunk_count"] += 1
-            
-            return list(sources.values())
-            
-        except Exception as e:
-            logger.error(f"Error fetching all sources: {str(e)}")
-            return []
+        
+        return list(sources.values())
     
     async def store_web_source(self, source_id: str, web_source: Dict[str, Any]) -> str:
-        """Store a web source (metadata only, no content chunks)"""
+        """Store a web source's text as chunks"""
         try:
-            # Generate embedding for the source name/description
             text = web_source["text"]
-            chunks = text_chunker.chunk_text(text);
-            embeddings = await embedding_service.embed_texts(chunks)
-            
-            # Create point for web source
-            points = [PointStruct(
-                id=str(uuid.uuid4()),
-                vector=embedding,
-                payload={
-                    "text": chunk,
+            chunks = [
+                {
+                    "text": chunk.text,
                     "source_name": web_source["source_name"],
                     "source_url": web_source["source_url"],
                     "source_type": web_source["source_type"],
                     "page": web_source.get("page", 0),
                     "chunk_index": web_source.get("chunk_index", 0),
-                    "is_web_source": True
+                    "is_trusted": web_source.get("is_trusted", True),
+                    "is_web_source": True,
+                    "token_ids": chunk.token_ids
                 }
-            ) for (chunk, embedding) in zip(chunks, embeddings)]
+                for chunk in self.split_text(text)
+            ]
             
-            # Insert point into collection
-            result = self.client.upsert(
-                collection_name=self.collection_name,
-                points=points,
-            )
+            result = await self.store_document_chunks(chunks)
             
             logger.info(f"Stored web source: {web_source['source_name']}")
-            logger.info(f"Upsert result: {result}")
+            logger.info(f"Upsert result: {result['chunks_stored']} stored, {result['duplicates_merged']} merged")
             return source_id
             
         except Exception as e:
@@ -207,18 +665,77 @@ class VectorStoreService:
     async def delete_source(self, source_name: str) -> bool:
         """Delete all chunks from a specific source"""
         try:
+            self.library_version += 1
+            source_filter = Filter(
+                must=[
+                    FieldCondition(
+                        key="source_name",
+                        match=MatchValue(value=source_name)
+                    )
+                ]
+            )
+            
+            # Chunks that other sources also contain are handed over instead of deleted
+            deleted_ids = []
+            for record in self._scroll_all(source_filter):
+                remaining = [
+                    entry for entry in record.payload.get("also_in_sources", [])
+                    if entry["source_name"] != source_name
+                ]
+                if not remaining:
+                    deleted_ids.append(str(record.id))
+                    continue
+                
+                payload = {**remaining[0], "also_in_sources": remaining[1:]}
+                self.client.set_payload(
+                    collection_name=self.collection_name,
+                    payload=payload,
+                    points=[record.id]
+                )
+                # Optional fields of the deleted source that the new owner does not have
+                stale = [key for key in PROVENANCE_FIELDS if key in record.payload and key not in payload]
+                if stale:
+                    self.client.delete_payload(
+                        collection_name=self.collection_name,
+                        keys=stale,
+                        points=[record.id]
+                    )
+                    for key in stale:
+                        record.payload.pop(key)
+                lexical_index.add_documents([
+                    (str(record.id), record.payload.get("text", ""), {**record.payload, **payload})
+                ])
+            
             # Delete points by source filter
             self.client.delete(
                 collection_name=self.collection_name,
-                points_selector=Filter(
-                    must=[
-                        FieldCondition(
-                            key="source_name",
-                            match={"value": source_name}
-                        )
-                    ]
-                )
+                points_selector=source_filter
             )
+            
+            # Drop the source from the provenance of chunks it duplicated
+            provenance_filter = Filter(
+                must=[
+                    FieldCondition(
+                        key="also_in_sources[].source_name",
+                        match=MatchValue(value=source_name)
+                    )
+                ]
+            )
+            for record in self._scroll_all(provenance_filter):
+                also_in_sources = [
+                    entry for entry in record.payload.get("also_in_sources", [])
+                    if entry["source_name"] != source_name
+                ]
+                self.client.set_payload(
+                    collection_name=self.collection_name,
+                    payload={"also_in_sources": also_in_sources},
+                    points=[record.id]
+                )
+                lexical_index.update_provenance(str(record.id), {**record.payload, "also_in_sources": also_in_sources})
+
+            lexical_index.remove_source(source_name)
+            near_duplicate_index.remove(deleted_ids)
+            self.library_version += 1
 
             logger.info(f"Deleted source: {source_name}")
             return True
@@ -226,7 +743,29 @@ class VectorStoreService:
         except Exception as e:
             logger.error(f"Error deleting source {source_name}: {str(e)}")
             return False
+    
+    def _scroll_all(self, scroll_filter: Optional[Filter], batch_size: int = 1000, with_payload=True):
+        """Iterate every point matching a filter"""
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=batch_size,
+                offset=offset,
+                with_payload=with_payload
+            )
+            yield from records
+            if offset is None:
+                break
         
+    async def seed_pending_sources(self):
+        """Seed default sources once if the collection was just created"""
+        if not self._seed_pending:
+            return
+        self._seed_pending = False
+        await self._seed_default_sources()
+    
     async def _seed_default_sources(self):
         """Seed default trusted sources into the vector store"""
         try:
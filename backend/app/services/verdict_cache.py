@@ -0,0 +1,253 @@
+from app.config import settings
+from app.models.requests import RetrievalFilters
+from app.models.responses import CompactResult
+from app.services.lexical import extract_numbers
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import re
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Paraphrases embed close together, but so do a claim and its negation
+NEGATION_PATTERN = re.compile(r"\b(not|no|never|none|neither|nor|without)\b|n't\b", re.IGNORECASE)
+
+# Upper edges of the similarity histogram buckets
+SIMILARITY_BUCKETS = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 1.0)
+
+
+class VerdictCache:
+    """LRU memo of verified claims with an in-process embedding index.
+
+    Exact lookups match normalized claim text; semantic lookups find the
+    nearest previously checked claim so paraphrases reuse its verdict. Entries
+    are tied to the library version they were verified against and the whole
+    cache is dropped when the library changes.
+    """
+
+    def __init__(self, max_size: int = 5000, ttl_seconds: int = 86400, similarity_threshold: float = 0.92):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, Tuple[float, CompactResult]]" = OrderedDict()
+        # Per filter scope: entry keys and their normalized claim embeddings, row-aligned
+        self._index: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        self._rows: Dict[str, Tuple[str, int]] = {}  # key -> (scope, row)
+        self._library_version = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "lookups": 0,
+            "hits": 0,
+            "semantic_lookups": 0,
+            "semantic_hits": 0,
+            "semantic_rejected": 0,
+            "stores": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+        self._similarity_histogram = [0] * len(SIMILARITY_BUCKETS)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def normalize(claim: str) -> str:
+        """Case, whitespace and trailing punctuation don't change a claim"""
+        return ' '.join(claim.lower().split()).rstrip('.!? ')
+
+    @staticmethod
+    def _scope(filters: Optional[RetrievalFilters]) -> str:
+        return filters.model_dump_json() if filters is not None else ""
+
+    def _key(self, claim: str, filters: Optional[RetrievalFilters]) -> str:
+        return f"{self.normalize(claim)}|{self._scope(filters)}"
+
+    def get(
+        self,
+        claim: str,
+        filters: Optional[RetrievalFilters] = None,
+        library_version: int = 0
+    ) -> Optional[CompactResult]:
+        """Return the stored result for a previously verified claim"""
+        key = self._key(claim, filters)
+        with self._lock:
+            self._check_version(library_version)
+            self._stats["lookups"] += 1
+            result = self._lookup(key)
+            if result is not None:
+                self._stats["hits"] += 1
+            return result
+
+    def get_similar(
+        self,
+        claim: str,
+        embedding: List[float],
+        filters: Optional[RetrievalFilters] = None,
+        library_version: int = 0
+    ) -> Optional[Tuple[CompactResult, float]]:
+        """Return the result and similarity of the nearest paraphrase above the threshold"""
+        query = self._unit(embedding)
+        with self._lock:
+            self._check_version(library_version)
+            self._stats["semantic_lookups"] += 1
+
+            scope = self._index.get(self._scope(filters))
+            if scope is None or not scope[0]:
+                return None
+
+            keys, matrix = scope
+            similarities = matrix[:len(keys)] @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            self._record_similarity(similarity)
+
+            if similarity < self.similarity_threshold:
+                return None
+
+            result = self._lookup(keys[best])
+            if result is None:
+                return None
+            if not self._compatible(claim, result.claim):
+                self._stats["semantic_rejected"] += 1
+                return None
+
+            self._stats["semantic_hits"] += 1
+            return result, similarity
+
+    def put(
+        self,
+        claim: str,
+        filters: Optional[RetrievalFilters],
+        result: CompactResult,
+        embedding: Optional[List[float]] = None,
+        library_version: int = 0
+    ):
+        """Store a verified result; results verified against an older library are dropped"""
+        key = self._key(claim, filters)
+        with self._lock:
+            self._check_version(library_version)
+            if library_version != self._library_version:
+                return
+
+            if key not in self._entries and embedding is not None:
+                self._index_add(self._scope(filters), key, self._unit(embedding))
+
+            self._entries[key] = (time.time(), result)
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._index_remove(evicted)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self._rows.clear()
+
+    def _lookup(self, key: str) -> Optional[CompactResult]:
+        """Fetch a live entry and mark it recently used; caller must hold the lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, result = entry
+        if time.time() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._index_remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return result
+
+    def _check_version(self, library_version: int):
+        """Drop everything once the library has moved on; caller must hold the lock"""
+        if library_version > self._library_version:
+            if self._entries:
+                self._stats["invalidations"] += 1
+                logger.info(f"Library changed, dropping {len(self._entries)} cached verdicts")
+            self._entries.clear()
+            self._index.clear()
+            self._rows.clear()
+            self._library_version = library_version
+
+    def _index_add(self, scope: str, key: str, vector: np.ndarray):
+        keys, matrix = self._index.get(scope, ([], np.empty((0, len(vector)), dtype=np.float32)))
+        if len(keys) == len(matrix):
+            # Grow geometrically so inserts stay amortised O(1)
+            grown = np.empty((max(16, 2 * len(matrix)), len(vector)), dtype=np.float32)
+            grown[:len(keys)] = matrix[:len(keys)]
+            matrix = grown
+
+        matrix[len(keys)] = vector
+        self._rows[key] = (scope, len(keys))
+        keys.append(key)
+        self._index[scope] = (keys, matrix)
+
+    def _index_remove(self, key: str):
+        location = self._rows.pop(key, None)
+        if location is None:
+            return
+
+        scope, row = location
+        keys, matrix = self._index[scope]
+
+        # Swap the last row into the hole
+        last = len(keys) - 1
+        if row != last:
+            matrix[row] = matrix[last]
+            keys[row] = keys[last]
+            self._rows[keys[row]] = (scope, row)
+        keys.pop()
+
+    def _record_similarity(self, similarity: float):
+        for bucket, upper in enumerate(SIMILARITY_BUCKETS):
+            if similarity <= upper:
+                self._similarity_histogram[bucket] += 1
+                return
+        self._similarity_histogram[-1] += 1
+
+    @staticmethod
+    def _compatible(claim: str, cached_claim: str) -> bool:
+        """Guard against near-identical embeddings of claims that say different things"""
+        if bool(NEGATION_PATTERN.search(claim)) != bool(NEGATION_PATTERN.search(cached_claim)):
+            return False
+        return set(extract_numbers(claim)) == set(extract_numbers(cached_claim))
+
+    @staticmethod
+    def _unit(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters, hit rates and the best-match similarity histogram"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["library_version"] = self._library_version
+            histogram = list(self._similarity_histogram)
+
+        stats["hit_rate"] = stats["hits"] / (stats["lookups"] or 1)
+        stats["semantic_hit_rate"] = stats["semantic_hits"] / (stats["semantic_lookups"] or 1)
+        stats["overall_hit_rate"] = (stats["hits"] + stats["semantic_hits"]) / (stats["lookups"] or 1)
+
+        lower = 0.0
+        stats["similarity_histogram"] = {}
+        for upper, count in zip(SIMILARITY_BUCKETS, histogram):
+            label = f"<={upper}" if lower == 0.0 else f"{lower}-{upper}"
+            stats["similarity_histogram"][label] = count
+            lower = upper
+        return stats
+
+
+# Global verdict cache instance
+verdict_cache = VerdictCache(
+    max_size=settings.verdict_cache_size,
+    ttl_seconds=settings.verdict_cache_ttl_seconds,
+    similarity_threshold=settings.semantic_cache_threshold
+)
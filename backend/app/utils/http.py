@@ -0,0 +1,25 @@
+from fastapi import Response
+from typing import Optional
+import uuid
+
+# Distinguishes versions counted by this process from those of an earlier run
+BOOT_ID = uuid.uuid4().hex[:12]
+
+# Finished jobs never change; running ones must be revalidated on every poll
+FINAL_CACHE_CONTROL = "private, max-age=86400, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against a strong ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 that still carries the validators, as RFC 9110 requires"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
@@ -3,6 +3,7 @@ import requests
 from bs4 import BeautifulSoup
 from typing import Optional, Dict, Any
 from urllib.parse import urlparse
+import asyncio
 import logging
 from docling.document_converter import DocumentConverter
 
@@ -38,7 +39,11 @@ class WebScraper:
             return None
 
     async def extract_text_from_url(self, url: str) -> Optional[Dict[str, Any]]:
-        """Extract text content from a URL"""
+        """Extract text content from a URL without blocking the event loop"""
+        return await asyncio.to_thread(self._extract_text_sync, url)
+
+    def _extract_text_sync(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch and parse a page; runs in a worker thread"""
         try:
             response = requests.get(url, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
@@ -71,12 +76,13 @@ class WebScraper:
             for selector in content_selectors:
                 elements = soup.select(selector)
                 if elements:
-                    content = " ".join(el.get_text(strip=True) for el in elements)
+                    # Keep a separator between text nodes so sentences don't run together
+                    content = " ".join(el.get_text(" ", strip=True) for el in elements)
                     break
 
             # Fallback to body if no specific content area found
             if not content and soup.body:
-                content = soup.body.get_text(strip=True)
+                content = soup.body.get_text(" ", strip=True)
 
             # Clean up the content
             content = self._clean_extracted_text(content)
@@ -0,0 +1,126 @@
+"""Microbenchmark for TextChunker on large documents.
+
+Times the current single-pass chunker against the previous implementation on
+synthetic documents of 1MB and more, and checks both produce identical chunks.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.chunking --sizes-mb 1 4 --repeat 3
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from app.core.chunking import TextChunker
+
+VOCABULARY = (
+    "the study found vaccine trial patients reported significant reduction in "
+    "mortality across cohorts while researchers noted limitations including "
+    "sample size funding sources and follow-up duration officials said data"
+).split()
+
+
+class LegacyTextChunker:
+    """The previous chunker, kept here as the reference for output and timing"""
+
+    def __init__(self, chunk_size: int, overlap: int):
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    def chunk_text(self, text: str) -> List[str]:
+        if not text.strip():
+            return []
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'\n\s*\n', '\n\n', text).strip()
+        sentences = [s.strip() for s in re.split(r'[.!?]+\s+', text) if s.strip()]
+
+        chunks = []
+        current_chunk: List[str] = []
+        current_word_count = 0
+        for sentence in sentences:
+            sentence_words = len(sentence.split())
+            if current_word_count + sentence_words > self.chunk_size and current_chunk:
+                chunks.append(' '.join(current_chunk))
+                overlap_words = 0
+                overlap_sentences: List[str] = []
+                for prev_sentence in reversed(current_chunk):
+                    count = len(prev_sentence.split())
+                    if overlap_words + count <= self.overlap:
+                        overlap_sentences.insert(0, prev_sentence)
+                        overlap_words += count
+                    else:
+                        break
+                current_chunk = overlap_sentences
+                current_word_count = overlap_words
+            current_chunk.append(sentence)
+            current_word_count += sentence_words
+        if current_chunk:
+            chunks.append(' '.join(current_chunk))
+
+        final_chunks = []
+        for chunk in chunks:
+            words = chunk.split()
+            if len(words) <= self.chunk_size:
+                final_chunks.append(chunk)
+            else:
+                for i in range(0, len(words), self.chunk_size - self.overlap):
+                    final_chunks.append(' '.join(words[i:i + self.chunk_size]))
+        return final_chunks
+
+
+def make_document(size_bytes: int, seed: int) -> str:
+    """Markdown-ish text with paragraphs, varied sentence lengths and a few huge sentences"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size_bytes:
+        # Occasional run-on "sentence" (e.g. a flattened table) forces the token split path
+        words = rng.randint(600, 1500) if rng.random() < 0.01 else rng.randint(5, 40)
+        sentence = " ".join(rng.choice(VOCABULARY) for _ in range(words))
+        sentence = sentence.capitalize() + rng.choice([". ", "! ", "? ", ".\n\n"])
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)
+
+
+def best_of(func, text: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 4])
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    chunker = TextChunker()
+    chunker.chunk_size = args.chunk_size
+    chunker.overlap = args.overlap
+    legacy = LegacyTextChunker(args.chunk_size, args.overlap)
+
+    print(f"{'size MB':>8} {'chunks':>7} {'legacy s':>9} {'current s':>10} {'speedup':>8} {'identical':>10}")
+    for size_mb in args.sizes_mb:
+        text = make_document(int(size_mb * 1024 * 1024), args.seed)
+        expected = legacy.chunk_text(text)
+        actual = chunker.chunk_text(text)
+
+        legacy_seconds = best_of(legacy.chunk_text, text, args.repeat)
+        current_seconds = best_of(chunker.chunk_text, text, args.repeat)
+        print(
+            f"{size_mb:>8.1f} {len(actual):>7} {legacy_seconds:>9.3f} {current_seconds:>10.3f} "
+            f"{legacy_seconds / current_seconds:>7.1f}x {str(expected == actual):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
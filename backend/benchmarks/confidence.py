@@ -0,0 +1,134 @@
+"""Microbenchmark for source quality scoring against large source libraries.
+
+Times ConfidenceScorer source quality with the compiled SourceManager matcher
+against the previous per-source substring scans, for libraries of thousands of
+user trusted URLs, and checks both produce the same scores.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.confidence --library-sizes 100 1000 10000 --sources 20
+"""
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from app.core.confidence import ConfidenceScorer, TYPE_BONUSES
+from app.core.sources import SourceManager
+
+SOURCE_TYPES = list(TYPE_BONUSES)
+
+
+class LegacySourceQuality:
+    """The previous linear-scan lookups and scoring loop, kept as the reference"""
+
+    def __init__(self, manager: SourceManager):
+        self.manager = manager
+
+    def is_trusted_source(self, url: str) -> bool:
+        if any(blocked in url for blocked in self.manager.user_blocked_sources):
+            return False
+        if any(trusted in url for trusted in self.manager.user_trusted_sources):
+            return True
+        return any(source.base_url in url for source in self.manager.trusted_sources)
+
+    def get_source_priority(self, url: str) -> int:
+        for source in self.manager.trusted_sources:
+            if source.base_url in url:
+                return source.priority
+        return 999
+
+    def source_quality(self, sources: List[Dict[str, Any]]) -> float:
+        if not sources:
+            return 0.0
+        total_quality = 0.0
+        for source in sources:
+            url = source.get("url", "")
+            quality = 0.3
+            if self.is_trusted_source(url):
+                priority = self.get_source_priority(url)
+                quality += 0.4 * (5 - min(priority, 4)) / 4
+            quality += TYPE_BONUSES.get(source.get("type", "webpage"), 0.0)
+            total_quality += quality
+        return min(total_quality / len(sources), 1.0)
+
+
+def make_library(manager: SourceManager, size: int, rng: random.Random) -> List[str]:
+    """Fill the user trusted list the way a synced library would"""
+    urls = [f"https://site{i}.example.org/articles/{rng.randint(1, 10**6)}" for i in range(size)]
+    manager.set_user_trusted_sources(urls)
+    for i in range(0, size, 50):
+        manager.add_user_blocked_source(f"spam{i}.example.net")
+    return urls
+
+
+def make_sources(library: List[str], manager: SourceManager, count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Retrieved sources mixing library, default trusted, blocked and unknown URLs"""
+    defaults = [f"https://{source.base_url}/page" for source in manager.trusted_sources]
+    sources = []
+    for _ in range(count):
+        pick = rng.random()
+        if pick < 0.4:
+            url = rng.choice(library)
+        elif pick < 0.7:
+            url = rng.choice(defaults)
+        elif pick < 0.8:
+            url = f"https://spam{50 * rng.randint(0, len(library) // 50)}.example.net/x"
+        else:
+            url = f"https://unknown{rng.randint(0, 10**6)}.example.com/"
+        sources.append({"url": url, "type": rng.choice(SOURCE_TYPES)})
+    return sources
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--library-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--sources", type=int, default=20, help="Sources scored per claim")
+    parser.add_argument("--claims", type=int, default=200, help="Claims scored per timing run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'library':>8} {'build s':>8} {'legacy ms/claim':>16} {'current ms/claim':>17} {'speedup':>8} {'identical':>10}")
+    for size in args.library_sizes:
+        rng = random.Random(args.seed)
+        manager = SourceManager()
+        library = make_library(manager, size, rng)
+        claims = [make_sources(library, manager, args.sources, rng) for _ in range(args.claims)]
+
+        scorer = ConfidenceScorer(manager)
+        legacy = LegacySourceQuality(manager)
+
+        # First lookup compiles the matchers
+        started = time.perf_counter()
+        manager.lookup("")
+        build_seconds = time.perf_counter() - started
+
+        # Lookups are memoised per URL, so time with a cold cache every run
+        def current():
+            manager._lookup_cache.clear()
+            return [scorer._calculate_source_quality(sources) for sources in claims]
+
+        expected = [legacy.source_quality(sources) for sources in claims]
+        identical = all(abs(a - b) < 1e-9 for a, b in zip(expected, current()))
+
+        legacy_seconds = best_of(lambda: [legacy.source_quality(sources) for sources in claims], args.repeat)
+        current_seconds = best_of(current, args.repeat)
+        print(
+            f"{size:>8} {build_seconds:>8.3f} {1000 * legacy_seconds / args.claims:>16.3f} "
+            f"{1000 * current_seconds / args.claims:>17.3f} {legacy_seconds / current_seconds:>7.1f}x "
+            f"{str(identical):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
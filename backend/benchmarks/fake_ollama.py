@@ -0,0 +1,104 @@
+"""Deterministic stand-in for the Ollama chat API used by the load test.
+
+Answers ``POST /api/chat`` with a fact-check verdict derived from a hash of
+the prompt, after sleeping for a configurable per-token prompt evaluation and
+generation latency. Like a real Ollama instance it runs a limited number of
+requests at once and reports its timings in nanoseconds.
+
+Run standalone (from the backend directory) and point OLLAMA_BASE_URL at it:
+
+    python -m benchmarks.fake_ollama --port 11435 --token-latency-ms 20 --parallel 1
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, Request
+
+VERDICTS = ("True", "False", "Unclear")
+
+
+@dataclass
+class FakeOllamaConfig:
+    token_latency_ms: float = 20.0  # Per generated token
+    prompt_token_ms: float = 0.2  # Per prompt token
+    load_ms: float = 0.0  # Paid once by the first request, like a cold model
+    eval_tokens: int = 60
+    parallel: int = 1  # OLLAMA_NUM_PARALLEL
+
+
+def create_app(config: FakeOllamaConfig) -> FastAPI:
+    app = FastAPI(title="Fake Ollama")
+    slots = asyncio.Semaphore(config.parallel)
+    state = {"loaded": False}
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        prompt = " ".join(message.get("content", "") for message in body.get("messages", []))
+        digest = hashlib.sha256(prompt.encode()).digest()
+
+        prompt_tokens = int(len(prompt.split()) * 1.3)
+        load_ns = 0
+        async with slots:
+            if not state["loaded"]:
+                state["loaded"] = True
+                load_ns = int(config.load_ms * 1e6)
+            prompt_ns = int(prompt_tokens * config.prompt_token_ms * 1e6)
+            eval_ns = int(config.eval_tokens * config.token_latency_ms * 1e6)
+            await asyncio.sleep((load_ns + prompt_ns + eval_ns) / 1e9)
+
+        content = json.dumps({
+            "verdict": VERDICTS[digest[0] % len(VERDICTS)],
+            "confidence": 50 + digest[1] % 50,
+            "explanation": f"Synthetic verdict {digest[:4].hex()}"
+        })
+        return {
+            "model": body.get("model", "fake"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "total_duration": load_ns + prompt_ns + eval_ns,
+            "load_duration": load_ns,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": prompt_ns,
+            "eval_count": config.eval_tokens,
+            "eval_duration": eval_ns
+        }
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": "fake", "modified_at": datetime.now(timezone.utc).isoformat(), "size": 0}]}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-latency-ms", type=float, default=20.0)
+    parser.add_argument("--prompt-token-ms", type=float, default=0.2)
+    parser.add_argument("--load-ms", type=float, default=0.0)
+    parser.add_argument("--eval-tokens", type=int, default=60)
+    parser.add_argument("--parallel", type=int, default=1)
+    args = parser.parse_args()
+
+    config = FakeOllamaConfig(
+        token_latency_ms=args.token_latency_ms,
+        prompt_token_ms=args.prompt_token_ms,
+        load_ms=args.load_ms,
+        eval_tokens=args.eval_tokens,
+        parallel=args.parallel
+    )
+    print(f"Fake Ollama on http://{args.host}:{args.port} ({config})")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Ingest benchmark: a synthetic multi-page PDF through DocumentService.
+
+Generates a text PDF (1,000 pages by default) of headed sections, runs it
+through the same path as /api/upload (docling conversion, structure-aware
+chunking, embedding, dedup and upsert) against an in-process Qdrant, and
+reports pages/sec and chunks/sec with the time split between conversion and
+embed+store.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.ingest --pages 1000
+    python -m benchmarks.ingest --pages 200 --format text --baseline benchmarks/results/ingest-1a2b3c4d5e.json
+
+``--format text`` feeds the same content as plain text, skipping docling, to
+isolate chunking and embedding.
+"""
+import argparse
+import asyncio
+import io
+import os
+import random
+import time
+from typing import List
+
+# In-process Qdrant; must be set before the app settings are first imported
+os.environ.setdefault("VECTOR_STORE_BACKEND", "local")
+
+from benchmarks.chunking import VOCABULARY
+from benchmarks.report import print_report, write_report
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+LINE_HEIGHT = 14
+LINES_PER_PAGE = 48
+CHARS_PER_LINE = 90
+
+
+def make_pages(pages: int, seed: int) -> List[List[str]]:
+    """Lines of text per page, with a section heading every few pages"""
+    rng = random.Random(seed)
+    result = []
+    for page in range(pages):
+        lines = []
+        if page % 4 == 0:
+            lines += [f"Section {page // 4 + 1}: {rng.choice(VOCABULARY).capitalize()} findings", ""]
+
+        line = ""
+        while len(lines) < LINES_PER_PAGE:
+            sentence = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(6, 24))).capitalize() + "."
+            for word in sentence.split():
+                if len(line) + len(word) + 1 > CHARS_PER_LINE:
+                    lines.append(line)
+                    line = ""
+                line = f"{line} {word}" if line else word
+            if rng.random() < 0.15:
+                lines += [line, ""]
+                line = ""
+        result.append(lines[:LINES_PER_PAGE])
+    return result
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """Minimal PDF 1.4 writer: one Helvetica text stream per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        text = " T* ".join(f"({_escape(line)}) Tj" for line in lines)
+        stream = (
+            f"BT /F1 10 Tf {LINE_HEIGHT} TL 50 {PAGE_HEIGHT - 60} Td {text} ET"
+        ).encode("latin-1", errors="replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>".encode()
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+async def ingest(document_service, content: bytes, filename: str, source_type: str) -> dict:
+    from fastapi import UploadFile
+    from app.models.requests import UploadMetadata
+
+    upload = UploadFile(file=io.BytesIO(content), filename=filename, size=len(content))
+    metadata = UploadMetadata(source_name=filename, source_type=source_type)
+    return await document_service.process_uploaded_file("benchmark", upload, metadata)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--format", choices=["pdf", "text"], default="pdf")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save-pdf", help="Also write the generated PDF here")
+    parser.add_argument("--output", help="Report path (default benchmarks/results/ingest-<sha>.json)")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages, args.seed)
+    if args.format == "pdf":
+        content = make_pdf(pages)
+        if args.save_pdf:
+            with open(args.save_pdf, "wb") as f:
+                f.write(content)
+    else:
+        content = "\n\n".join("\n".join(lines) for lines in pages).encode()
+
+    # Load the models and connect the vector store outside the timed section
+    from prometheus_client import REGISTRY
+    from app.services.document import document_service
+
+    def store_seconds() -> float:
+        return REGISTRY.get_sample_value("factguard_ingest_seconds_sum") or 0.0
+
+    stored_before = store_seconds()
+    started = time.perf_counter()
+    result = asyncio.run(ingest(document_service, content, f"synthetic.{args.format}", args.format))
+    total = time.perf_counter() - started
+    store = store_seconds() - stored_before
+
+    results = {
+        "total_seconds": total,
+        "convert_seconds": total - store,
+        "embed_store_seconds": store,
+        "pages_per_second": args.pages / total,
+        "chunks_per_second": result["chunks_processed"] / total,
+        "chunks": result["chunks_processed"],
+        "duplicates_merged": result["duplicates_merged"],
+        "input_mb": len(content) / 1024 / 1024
+    }
+    print(
+        f"{args.pages} pages ({results['input_mb']:.1f} MB {args.format}) -> {result['chunks_processed']} chunks "
+        f"in {total:.1f}s: convert {results['convert_seconds']:.1f}s, embed+store {store:.1f}s, "
+        f"{results['pages_per_second']:.1f} pages/s, {results['chunks_per_second']:.1f} chunks/s"
+    )
+
+    config = {"pages": args.pages, "format": args.format, "seed": args.seed}
+    print_report(write_report("ingest", results, config, args.output), args.baseline)
+
+
+if __name__ == "__main__":
+    main()
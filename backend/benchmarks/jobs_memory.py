@@ -0,0 +1,213 @@
+"""Memory benchmark of the job table under a sustained stream of fact-checks.
+
+Submits, runs and completes jobs against a simulated clock (50 jobs/s by
+default, over 4 million a day) and tracks the memory held by the job table
+with tracemalloc. Compares the current JobManager (slotted jobs, results as
+bytes, spill past the memory limit, TTL expiry) with the previous layout of
+full dataclasses holding the pydantic result that were never removed.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.jobs_memory --jobs 200000
+    python -m benchmarks.jobs_memory --ttl-seconds 600 --result-memory-mb 8 --baseline benchmarks/results/jobs_memory-1a2b3c4d5e.json
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.report import print_report, write_report
+
+CHECKPOINTS = 10
+FAILURE_RATE = 0.05
+
+
+def make_results(count: int, seed: int) -> List[Any]:
+    """Realistically sized results: three sources, reasoning steps and explanations"""
+    from app.models.responses import CompactResult, DetailedResult, FactCheckResult, Source, Verdict
+
+    rng = random.Random(seed)
+    words = "the study found that report published evidence council region increase data survey".split()
+
+    def text(count: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(count)).capitalize() + "."
+
+    results = []
+    for _ in range(count):
+        sources = [
+            Source(name=text(4), url=f"https://example{rng.randint(1, 99)}.org/{uuid.uuid4().hex[:12]}",
+                   excerpt=text(30), type="webpage")
+            for _ in range(3)
+        ]
+        claim = text(15)
+        verdict = rng.choice(list(Verdict))
+        confidence = float(rng.randint(40, 99))
+        results.append(FactCheckResult(
+            id=str(uuid.uuid4()),
+            compact=CompactResult(claim=claim, verdict=verdict, confidence=confidence,
+                                  explanation=text(25), top_sources=sources),
+            full=DetailedResult(claim=claim, verdict=verdict, confidence=confidence,
+                                detailed_explanation=text(120), reasoning_steps=[text(20) for _ in range(4)],
+                                all_sources=sources, limitations=text(20))
+        ))
+    return results
+
+
+@dataclass
+class LegacyJob:
+    """The job layout before the compact table"""
+    job_id: str
+    status: Any
+    created_at: datetime
+    estimated_completion: Optional[datetime] = None
+    progress: Optional[int] = None
+    result: Optional[Any] = None
+    result_json: Optional[bytes] = None
+    error: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
+    version: int = 0
+
+
+class LegacyJobManager:
+    """Jobs kept in a dict forever with their pydantic results"""
+
+    def __init__(self):
+        self._jobs: Dict[str, LegacyJob] = {}
+
+    def create_job(self, job_id: str, estimated_seconds: Optional[int] = None):
+        from app.models.responses import JobStatus
+
+        self._jobs[job_id] = LegacyJob(
+            job_id=job_id, status=JobStatus.QUEUED, created_at=datetime.utcnow(),
+            estimated_completion=datetime.utcnow() + timedelta(seconds=estimated_seconds), progress=0
+        )
+
+    def update_job(self, job_id: str, status=None, progress: Optional[int] = None):
+        job = self._jobs[job_id]
+        job.status, job.progress = status, progress
+        job.version += 1
+
+    async def complete_job(self, job_id: str, result):
+        from app.models.responses import JobStatus
+
+        job = self._jobs[job_id]
+        job.status, job.progress = JobStatus.COMPLETED, 100
+        job.result = result
+        job.result_json = result.model_dump_json().encode()
+        job.version += 1
+
+    def fail_job(self, job_id: str, error: str):
+        from app.models.responses import JobStatus
+
+        job = self._jobs[job_id]
+        job.status, job.error = JobStatus.FAILED, error
+        job.version += 1
+
+    def live_jobs(self) -> int:
+        return len(self._jobs)
+
+
+async def simulate(manager, results: List[Any], args, expire: Callable[[float], int], clock: List[float]) -> Dict[str, float]:
+    """Run args.jobs jobs through the manager, sampling traced memory at checkpoints"""
+    from app.models.responses import JobStatus
+
+    rng = random.Random(args.seed)
+    step = 1 / args.rate
+    checkpoint_every = max(1, args.jobs // CHECKPOINTS)
+    next_sweep = clock[0] + args.sweep_seconds
+    checkpoints = []
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(args.jobs):
+        clock[0] += step
+        job_id = str(uuid.uuid4())
+        manager.create_job(job_id, estimated_seconds=30)
+        manager.update_job(job_id, status=JobStatus.RUNNING, progress=10)
+        if rng.random() < FAILURE_RATE:
+            manager.fail_job(job_id, "Ollama request timed out")
+        else:
+            # A fresh copy per job, as every real job builds its own result
+            await manager.complete_job(job_id, results[i % len(results)].model_copy(deep=True))
+
+        if clock[0] >= next_sweep:
+            expire(clock[0])
+            next_sweep += args.sweep_seconds
+        if (i + 1) % checkpoint_every == 0:
+            checkpoints.append(tracemalloc.get_traced_memory()[0])
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Growth over the second half of the run, once the TTL window has filled
+    half = checkpoints[len(checkpoints) // 2 - 1]
+    return {
+        "final_mb": current / 1024 / 1024,
+        "peak_mb": peak / 1024 / 1024,
+        "second_half_growth_mb": (checkpoints[-1] - half) / 1024 / 1024,
+        "jobs_per_second": args.jobs / elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200000)
+    parser.add_argument("--rate", type=float, default=50.0, help="Simulated jobs submitted per second")
+    parser.add_argument("--ttl-seconds", type=float, default=1800.0)
+    parser.add_argument("--sweep-seconds", type=float, default=30.0, help="Simulated expiry interval")
+    parser.add_argument("--result-memory-mb", type=int, default=16)
+    parser.add_argument("--distinct-results", type=int, default=200)
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Report path (default benchmarks/results/jobs_memory-<sha>.json)")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    from app.services.jobs import JobManager
+
+    results = make_results(args.distinct_results, args.seed)
+    report: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as spill_dir:
+        clock = [0.0]
+        manager = JobManager(
+            ttl_seconds=args.ttl_seconds,
+            memory_limit_bytes=args.result_memory_mb * 1024 * 1024,
+            spill_dir=spill_dir,
+            clock=lambda: clock[0]
+        )
+        compact = asyncio.run(simulate(manager, results, args, lambda now: manager.expire_jobs(now), clock))
+        stats = manager.get_stats()
+        manager.close()
+    report.update({f"compact_{key}": value for key, value in compact.items()})
+    report["compact_live_jobs"] = stats["jobs"]
+    report["compact_results_spilled"] = stats["results_spilled"]
+    report["compact_bytes_per_live_job"] = compact["final_mb"] * 1024 * 1024 / max(stats["jobs"], 1)
+    print(
+        f"compact: {args.jobs} jobs, {stats['jobs']} live, {stats['results_spilled']} results spilled, "
+        f"final {compact['final_mb']:.1f} MB, peak {compact['peak_mb']:.1f} MB, "
+        f"second-half growth {compact['second_half_growth_mb']:+.1f} MB, {compact['jobs_per_second']:.0f} jobs/s"
+    )
+
+    if not args.skip_legacy:
+        legacy_manager = LegacyJobManager()
+        legacy = asyncio.run(simulate(legacy_manager, results, args, lambda now: 0, [0.0]))
+        report.update({f"legacy_{key}": value for key, value in legacy.items()})
+        report["legacy_bytes_per_job"] = legacy["final_mb"] * 1024 * 1024 / legacy_manager.live_jobs()
+        print(
+            f"legacy:  {args.jobs} jobs, {legacy_manager.live_jobs()} live, "
+            f"final {legacy['final_mb']:.1f} MB, peak {legacy['peak_mb']:.1f} MB, "
+            f"second-half growth {legacy['second_half_growth_mb']:+.1f} MB, {legacy['jobs_per_second']:.0f} jobs/s"
+        )
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+    print_report(write_report("jobs_memory", report, config, args.output), args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""HTTP load test of /api/check and /api/job against a fake Ollama.
+
+Starts the deterministic fake Ollama (benchmarks.fake_ollama) and the API
+with an in-process Qdrant, uploads a synthetic corpus, then has concurrent
+clients submit claims and poll their jobs until done. Reports throughput,
+job and submit latency percentiles and the mean time per pipeline stage
+and event-loop blocking per call site (scraped from /metrics), and writes a
+JSON report for comparison across commits, so a change that reintroduces a
+blocking call shows up as new loop_block entries.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.load --requests 200 --concurrency 8 --token-latency-ms 20
+    python -m benchmarks.load --baseline benchmarks/results/load-1a2b3c4d5e.json
+    python -m benchmarks.load --batch-share 0.8 --concurrency 16
+
+With --batch-share a fraction of the checks comes from a bulk client in the
+batch lane and throughput and latency are also reported per lane.
+
+The verdict cache is disabled so every check reaches the LLM; pass --cache to
+measure with it on.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_ollama import FakeOllamaConfig, create_app as create_fake_ollama
+from benchmarks.report import percentiles, print_report, write_report
+
+SUBJECTS = ["The city council", "The national library", "The research institute", "The river authority",
+            "The central bank", "The football club", "The observatory", "The health ministry"]
+PREDICATES = ["was founded in {year}", "employed {count} people in {year}", "opened a new office in {year}",
+              "published {count} reports in {year}", "received {count} complaints in {year}"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_facts(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    facts = set()
+    while len(facts) < count:
+        predicate = rng.choice(PREDICATES).format(year=rng.randint(1850, 2024), count=rng.randint(2, 5000))
+        facts.add(f"{rng.choice(SUBJECTS)} of region {rng.randint(1, 400)} {predicate}.")
+    return sorted(facts)
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    """Run a uvicorn server on a background thread and wait until it accepts requests"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run_check(client: httpx.AsyncClient, claim: str, lane: str, poll_seconds: float) -> Dict[str, float]:
+    started = time.perf_counter()
+    # Batch work comes from one bulk API client, interactive checks from the UI
+    headers = {"X-API-Key": "bulk-client"} if lane == "batch" else {}
+    response = await client.post(
+        "/api/check", json={"type": "claim", "claim": claim, "priority": lane}, headers=headers
+    )
+    response.raise_for_status()
+    submitted = time.perf_counter()
+    job_id = response.json()["job_id"]
+
+    polls = 0
+    while True:
+        polls += 1
+        job = (await client.get(f"/api/job/{job_id}")).json()
+        if job["status"] in ("completed", "failed", "cancelled"):
+            break
+        await asyncio.sleep(poll_seconds)
+
+    return {
+        "submit": submitted - started,
+        "job": time.perf_counter() - started,
+        # Cancelled jobs produced no result, so they are not latency samples either
+        "failed": job["status"] != "completed",
+        "polls": polls,
+        "lane": lane
+    }
+
+
+async def run_load(
+    base_url: str, claims: List[Tuple[str, str]], concurrency: int, poll_seconds: float
+) -> List[Dict[str, float]]:
+    queue: asyncio.Queue = asyncio.Queue()
+    for claim in claims:
+        queue.put_nowait(claim)
+    samples: List[Dict[str, float]] = []
+
+    async def worker(client: httpx.AsyncClient):
+        while not queue.empty():
+            claim, lane = queue.get_nowait()
+            try:
+                samples.append(await run_check(client, claim, lane, poll_seconds))
+            except httpx.HTTPError:
+                samples.append({"submit": 0.0, "job": 0.0, "failed": True, "polls": 0, "lane": lane})
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=600, limits=limits) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return samples
+
+
+def scraped_results(metrics_text: str) -> Dict[str, float]:
+    """Mean milliseconds per pipeline stage and event-loop blocking from a /metrics scrape"""
+    from prometheus_client.parser import text_string_to_metric_families
+
+    sums: Dict[str, float] = {}
+    counts: Dict[str, float] = {}
+    results = {"loop_blocks": 0.0, "loop_blocked_ms": 0.0}
+    for family in text_string_to_metric_families(metrics_text):
+        for sample in family.samples:
+            if family.name == "factguard_stage_seconds":
+                stage = sample.labels.get("stage")
+                if sample.name.endswith("_sum"):
+                    sums[stage] = sample.value
+                elif sample.name.endswith("_count"):
+                    counts[stage] = sample.value
+            elif sample.name == "factguard_event_loop_blocks_total":
+                results["loop_blocks"] += sample.value
+                results[f"loop_block.{sample.labels['call_site']}.count"] = sample.value
+            elif sample.name == "factguard_event_loop_blocked_seconds_total":
+                results["loop_blocked_ms"] += 1000 * sample.value
+
+    for stage in sums:
+        if counts.get(stage):
+            results[f"stage.{stage}.mean_ms"] = 1000 * sums[stage] / counts[stage]
+    return results
+
+
+def lane_results(ok: List[Dict[str, float]], elapsed: float, batch_share: float) -> Dict[str, float]:
+    """Throughput and job latency per scheduling lane when the load mixes them"""
+    if not batch_share:
+        return {}
+    results = {}
+    for lane in ("interactive", "batch"):
+        samples = [sample for sample in ok if sample["lane"] == lane]
+        if samples:
+            latency = percentiles((1000 * sample["job"] for sample in samples), (50, 95, 99))
+            results[f"{lane}.jobs_per_second"] = len(samples) / elapsed
+            results.update({f"{lane}.job_latency_{key}_ms": value for key, value in latency.items()})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5, help="Checks run before measuring")
+    parser.add_argument("--corpus-facts", type=int, default=2000)
+    parser.add_argument("--poll-ms", type=float, default=100)
+    parser.add_argument("--token-latency-ms", type=float, default=20.0)
+    parser.add_argument("--prompt-token-ms", type=float, default=0.2)
+    parser.add_argument("--eval-tokens", type=int, default=60)
+    parser.add_argument("--ollama-parallel", type=int, default=1)
+    parser.add_argument("--batch-share", type=float, default=0.0,
+                        help="Fraction of checks submitted in the batch lane by a single bulk client")
+    parser.add_argument("--cache", action="store_true", help="Leave the verdict cache enabled")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Report path (default benchmarks/results/load-<sha>.json)")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    ollama_port = free_port()
+    api_port = free_port()
+    fake_config = FakeOllamaConfig(
+        token_latency_ms=args.token_latency_ms,
+        prompt_token_ms=args.prompt_token_ms,
+        eval_tokens=args.eval_tokens,
+        parallel=args.ollama_parallel
+    )
+    start_server(create_fake_ollama(fake_config), ollama_port)
+
+    # Settings are read when the app is first imported
+    os.environ["VECTOR_STORE_BACKEND"] = "local"
+    os.environ["OLLAMA_BASE_URL"] = f"http://127.0.0.1:{ollama_port}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("LOOP_MONITOR_MODE", "production")
+    # Interactive checks stand for many UI users behind one address; batch comes from one known key
+    os.environ.setdefault("LLM_INTERACTIVE_CLIENT_LIMIT", str(args.concurrency))
+    os.environ.setdefault("CLIENT_API_KEYS", '["bulk-client"]')
+    if not args.cache:
+        os.environ["VERDICT_CACHE_ENABLED"] = "false"
+    from app.main import app
+
+    start_server(app, api_port)
+    base_url = f"http://127.0.0.1:{api_port}"
+
+    facts = make_facts(args.corpus_facts, args.seed)
+    upload = httpx.post(
+        f"{base_url}/api/upload",
+        files={"file": ("corpus.txt", " ".join(facts).encode(), "text/plain")},
+        data={"source_name": "Synthetic corpus", "source_type": "text"},
+        timeout=600
+    )
+    upload.raise_for_status()
+    print(f"Uploaded {len(facts)} facts as {upload.json()['chunks_processed']} chunks")
+
+    rng = random.Random(args.seed)
+    claims = [
+        (rng.choice(facts), "batch" if rng.random() < args.batch_share else "interactive")
+        for _ in range(args.warmup + args.requests)
+    ]
+    poll_seconds = args.poll_ms / 1000
+    asyncio.run(run_load(base_url, claims[:args.warmup], args.concurrency, poll_seconds))
+
+    # Blocking during the corpus upload and warmup is not part of the measurement
+    before = scraped_results(httpx.get(f"{base_url}/metrics").text)
+    started = time.perf_counter()
+    samples = asyncio.run(run_load(base_url, claims[args.warmup:], args.concurrency, poll_seconds))
+    elapsed = time.perf_counter() - started
+    scraped = scraped_results(httpx.get(f"{base_url}/metrics").text)
+    for metric, value in before.items():
+        if metric.startswith("loop_"):
+            scraped[metric] -= value
+
+    ok = [sample for sample in samples if not sample["failed"]]
+    job = percentiles(1000 * sample["job"] for sample in ok)
+    submit = percentiles(1000 * sample["submit"] for sample in ok)
+    results = {
+        "throughput_jobs_per_second": len(ok) / elapsed,
+        "failed": len(samples) - len(ok),
+        **{f"job_latency_{key}_ms": value for key, value in job.items()},
+        **{f"submit_latency_{key}_ms": value for key, value in submit.items()},
+        "polls_per_job": sum(sample["polls"] for sample in ok) / (len(ok) or 1),
+        **lane_results(ok, elapsed, args.batch_share),
+        **{metric: value for metric, value in scraped.items() if not metric.startswith("loop_block.") or value}
+    }
+
+    print(
+        f"{len(ok)}/{len(samples)} checks in {elapsed:.1f}s at concurrency {args.concurrency}: "
+        f"{results['throughput_jobs_per_second']:.2f} jobs/s, "
+        f"job p50 {job['p50']:.0f}ms p90 {job['p90']:.0f}ms p99 {job['p99']:.0f}ms, "
+        f"submit p50 {submit['p50']:.1f}ms p99 {submit['p99']:.1f}ms"
+    )
+    for lane in ("interactive", "batch"):
+        if f"{lane}.jobs_per_second" in results:
+            print(
+                f"  {lane:<12} {results[f'{lane}.jobs_per_second']:.2f} jobs/s, "
+                f"p50 {results[f'{lane}.job_latency_p50_ms']:.0f}ms p95 {results[f'{lane}.job_latency_p95_ms']:.0f}ms"
+            )
+    for metric, value in results.items():
+        if metric.startswith("stage."):
+            print(f"  {metric[6:-8]:<20} {value:>9.1f} ms")
+    print(f"Event loop blocked {results['loop_blocks']:.0f} times for {results['loop_blocked_ms']:.0f}ms in total")
+    for metric, value in results.items():
+        if metric.startswith("loop_block."):
+            print(f"  {value:>5.0f}x {metric[11:-6]}")
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+    print_report(write_report("load", results, config, args.output), args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Microbenchmarks for the CPU-bound building blocks of the pipeline.
+
+Times TextChunker.chunk_text, EmbeddingService.embed_texts, ConfidenceScorer
+and the utils/text helpers on synthetic inputs, prints a table and writes a
+JSON report (see benchmarks.report) that can be compared across commits.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --only chunk_text text. --baseline benchmarks/results/micro-1a2b3c4d5e.json
+
+embed_texts loads the FastEmbed model (downloaded on first use); skip it with
+``--skip embed_texts``.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.chunking import make_document
+from benchmarks.confidence import SOURCE_TYPES
+from benchmarks.report import print_report, write_report
+
+
+def measure(func: Callable[[], object], repeat: int, min_seconds: float) -> Tuple[int, List[float]]:
+    """Seconds per call over ``repeat`` rounds, each looping for at least min_seconds"""
+    started = time.perf_counter()
+    func()
+    number = max(1, int(min_seconds / max(time.perf_counter() - started, 1e-9)))
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return number, timings
+
+
+def build_cases(args, rng: random.Random) -> Dict[str, Callable[[], object]]:
+    """Benchmark name -> zero-argument callable; imports are deferred to skip unused models"""
+    from app.core.chunking import TextChunker
+    from app.core.confidence import ConfidenceScorer
+    from app.utils import text
+
+    document = make_document(int(args.document_kb * 1024), args.seed)
+    paragraph = document[:4000]
+    chunker = TextChunker()
+
+    scorer = ConfidenceScorer()
+    default_urls = [f"https://{source.base_url}/page" for source in scorer.source_manager.trusted_sources]
+    sources = [
+        {
+            "url": rng.choice(default_urls) if rng.random() < 0.6 else f"https://unknown{i}.example.com/",
+            "type": rng.choice(SOURCE_TYPES)
+        }
+        for i in range(args.sources)
+    ]
+
+    cases = {
+        "chunk_text": lambda: chunker.chunk_text(document),
+        "confidence.calculate_confidence": lambda: (
+            scorer.source_manager._lookup_cache.clear(),
+            scorer.calculate_confidence(sources, verdict_consensus=0.5, llm_confidence=0.7)
+        ),
+        "confidence.verdict_consensus": lambda: scorer.calculate_verdict_consensus(
+            ["True", "True", "False", "Unclear", "True"]
+        ),
+        "text.clean_text": lambda: text.clean_text(paragraph),
+        "text.extract_sentences": lambda: text.extract_sentences(paragraph),
+        "text.truncate_text": lambda: text.truncate_text(paragraph, 200),
+        "text.extract_key_phrases": lambda: text.extract_key_phrases(paragraph),
+        "text.detect_claim_type": lambda: text.detect_claim_type(paragraph[:300]),
+        "text.is_valid_claim": lambda: text.is_valid_claim(paragraph[:300]),
+    }
+
+    if "embed_texts" not in args.skip:
+        from app.services.embeddings import EmbeddingService
+
+        service = EmbeddingService()
+        sentences = text.extract_sentences(document)[:args.embed_batch]
+        loop = asyncio.new_event_loop()
+        cases["embed_texts"] = lambda: loop.run_until_complete(service.embed_texts(sentences))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", default=[], help="Run benchmarks whose name starts with these")
+    parser.add_argument("--skip", nargs="+", default=[], help="Benchmarks to skip")
+    parser.add_argument("--document-kb", type=float, default=256, help="Size of the chunked document")
+    parser.add_argument("--sources", type=int, default=20, help="Sources per confidence calculation")
+    parser.add_argument("--embed-batch", type=int, default=32, help="Sentences per embed_texts call")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="Minimum duration of each round")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Report path (default benchmarks/results/micro-<sha>.json)")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    cases = build_cases(args, random.Random(args.seed))
+    if args.only:
+        cases = {name: func for name, func in cases.items() if name.startswith(tuple(args.only))}
+
+    results = {}
+    print(f"{'benchmark':<34} {'loops':>7} {'median ms':>10} {'min ms':>9} {'ops/s':>10}")
+    for name, func in cases.items():
+        number, timings = measure(func, args.repeat, args.min_seconds)
+        median = statistics.median(timings)
+        results[f"{name}.median_ms"] = 1000 * median
+        results[f"{name}.ops_per_second"] = 1 / median
+        print(f"{name:<34} {number:>7} {1000 * median:>10.3f} {1000 * min(timings):>9.3f} {1 / median:>10.1f}")
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+    print_report(write_report("micro", results, config, args.output), args.baseline)
+
+
+if __name__ == "__main__":
+    main()
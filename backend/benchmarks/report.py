@@ -0,0 +1,118 @@
+"""JSON reports shared by the benchmarks so runs can be compared across commits.
+
+Each report records the git revision it was measured on next to the run
+configuration and a flat ``results`` mapping of metric name to number.
+
+Compare two reports (from the backend directory):
+
+    python -m benchmarks.report benchmarks/results/load-1a2b3c4d5e.json benchmarks/results/load-6f7a8b9c0d.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Metrics where a larger number is the better result; everything else is a cost
+HIGHER_IS_BETTER = ("per_second", "ops", "throughput", "speedup")
+
+
+def git_revision() -> Dict[str, Any]:
+    """Current commit and whether the working tree has uncommitted changes"""
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"sha": "unknown", "dirty": False}
+    return {"sha": sha, "dirty": dirty}
+
+
+def percentiles(values: Iterable[float], points: Iterable[int] = (50, 90, 99)) -> Dict[str, float]:
+    """p50/p90/p99 style summary of a list of timings"""
+    values = list(values)
+    if not values:
+        return {f"p{point}": 0.0 for point in points}
+    return {f"p{point}": float(np.percentile(values, point)) for point in points}
+
+
+def write_report(
+    name: str,
+    results: Dict[str, float],
+    config: Dict[str, Any],
+    output: Optional[str] = None
+) -> Path:
+    """Write a report and return its path; defaults to results/<name>-<sha>.json"""
+    revision = git_revision()
+    report = {
+        "benchmark": name,
+        "git_sha": revision["sha"],
+        "git_dirty": revision["dirty"],
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results
+    }
+
+    if output:
+        path = Path(output)
+    else:
+        suffix = "-dirty" if revision["dirty"] else ""
+        path = RESULTS_DIR / f"{name}-{revision['sha'][:10]}{suffix}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Table lines of every metric present in both reports with its relative change"""
+    lines = [
+        f"{baseline['benchmark']}: {baseline['git_sha'][:10]} -> {current['git_sha'][:10]}",
+        f"{'metric':<40} {'baseline':>12} {'current':>12} {'change':>9}"
+    ]
+    for metric, value in current["results"].items():
+        previous = baseline["results"].get(metric)
+        if not isinstance(previous, (int, float)) or not isinstance(value, (int, float)):
+            continue
+
+        change = (value - previous) / previous if previous else 0.0
+        better = any(marker in metric for marker in HIGHER_IS_BETTER)
+        flag = ""
+        if abs(change) >= 0.05:
+            flag = " better" if (change > 0) == better else " worse"
+        lines.append(f"{metric:<40} {previous:>12.4g} {value:>12.4g} {change:>+8.1%}{flag}")
+    return lines
+
+
+def print_report(path: Path, baseline: Optional[str] = None):
+    """Print where a report went and, given a baseline report, how it compares"""
+    print(f"Report written to {path}")
+    if baseline:
+        print("\n".join(compare(load_report(baseline), load_report(str(path)))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    args = parser.parse_args()
+    print("\n".join(compare(load_report(args.baseline), load_report(args.current))))
+
+
+if __name__ == "__main__":
+    main()
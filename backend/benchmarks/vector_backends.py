@@ -0,0 +1,127 @@
+"""Compare the local (in-process) vector store backend with Qdrant server mode.
+
+For each corpus size it loads synthetic chunks with the same payload layout the
+app stores, then measures ingest throughput and search latency with and without
+a payload filter.
+
+Usage (from the backend directory; server mode needs a running Qdrant):
+
+    python -m benchmarks.vector_backends --sizes 10000 100000 1000000
+    python -m benchmarks.vector_backends --backends local --sizes 50000
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, List
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue,
+    PayloadSchemaType,
+)
+
+COLLECTION = "bench_backends"
+SOURCE_TYPES = ["paper", "webpage", "news", "user_upload"]
+
+
+def make_client(backend: str, args) -> QdrantClient:
+    if backend == "local":
+        return QdrantClient(location=":memory:")
+    return QdrantClient(host=args.host, port=args.port)
+
+
+def load(client: QdrantClient, backend: str, size: int, args, rng) -> float:
+    """Create the collection and upsert ``size`` points, returning chunks/sec"""
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE),
+    )
+    if backend == "server":
+        client.create_payload_index(COLLECTION, "source_type", PayloadSchemaType.KEYWORD)
+
+    started = time.perf_counter()
+    for start in range(0, size, args.batch_size):
+        count = min(args.batch_size, size - start)
+        vectors = rng.normal(size=(count, args.dim)).astype(np.float32)
+        client.upsert(
+            collection_name=COLLECTION,
+            points=[
+                PointStruct(
+                    id=start + i,
+                    vector=vector.tolist(),
+                    payload={
+                        "text": f"synthetic chunk {start + i}",
+                        "source_name": f"source-{(start + i) % 500}",
+                        "source_type": SOURCE_TYPES[(start + i) % len(SOURCE_TYPES)],
+                        "page": 0,
+                        "chunk_index": start + i,
+                        "is_trusted": True,
+                    },
+                )
+                for i, vector in enumerate(vectors)
+            ],
+            wait=True,
+        )
+    return size / (time.perf_counter() - started)
+
+
+def search_latency(client: QdrantClient, queries: np.ndarray, limit: int, query_filter=None) -> Dict[str, float]:
+    latencies: List[float] = []
+    for query in queries:
+        started = time.perf_counter()
+        client.search(
+            collection_name=COLLECTION,
+            query_vector=query.tolist(),
+            query_filter=query_filter,
+            limit=limit,
+            with_payload=True,
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["local", "server"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    paper_filter = Filter(must=[FieldCondition(key="source_type", match=MatchValue(value="paper"))])
+
+    print(
+        f"{'backend':<8} {'chunks':>9} {'ingest/s':>10} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'filt p50':>9} {'filt p99':>9}"
+    )
+    for backend in args.backends:
+        client = make_client(backend, args)
+        for size in args.sizes:
+            rng = np.random.default_rng(args.seed)
+            throughput = load(client, backend, size, args, rng)
+            queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+            plain = search_latency(client, queries, args.limit)
+            filtered = search_latency(client, queries, args.limit, paper_filter)
+            print(
+                f"{backend:<8} {size:>9} {throughput:>10.0f} "
+                f"{plain['p50_ms']:>8.2f} {plain['p99_ms']:>8.2f} "
+                f"{filtered['p50_ms']:>9.2f} {filtered['p99_ms']:>9.2f}"
+            )
+        client.delete_collection(COLLECTION)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Recall vs latency benchmark for Qdrant quantization and HNSW settings.
+
+Builds a synthetic clustered corpus, indexes it once per quantization mode and
+measures recall@k against exact (brute force) neighbours for a range of
+search-time ``hnsw_ef`` values. Queries are drawn around the corpus's own
+cluster centres so they follow the same distribution as the indexed data.
+
+Usage (from the backend directory, with a Qdrant server running):
+
+    python -m benchmarks.vector_index_tuning --points 100000 --queries 200
+"""
+import argparse
+import statistics
+import time
+from typing import List
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    Distance, VectorParams, HnswConfigDiff, PointStruct, SearchParams,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig, QuantizationSearchParams,
+)
+
+
+def make_centres(clusters: int, dim: int, seed: int) -> np.ndarray:
+    """Random cluster centres shared by the corpus and the queries"""
+    return np.random.default_rng(seed).normal(size=(clusters, dim))
+
+
+def sample_vectors(centres: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Normalized vectors scattered around randomly chosen centres"""
+    labels = rng.integers(0, len(centres), size=count)
+    vectors = centres[labels] + rng.normal(scale=0.6, size=(count, centres.shape[1]))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def make_corpus(points: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Generate normalized vectors grouped around random cluster centres"""
+    centres = make_centres(clusters, dim, seed)
+    return sample_vectors(centres, points, np.random.default_rng([seed, 1]))
+
+
+def make_queries(queries: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Queries from the corpus distribution: same centres, independent noise"""
+    centres = make_centres(clusters, dim, seed)
+    return sample_vectors(centres, queries, np.random.default_rng([seed, 2]))
+
+
+def exact_neighbours(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Ground-truth top-k ids by cosine similarity"""
+    scores = queries @ corpus.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def quantization_config(mode: str):
+    if mode == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if mode == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def build_collection(client: QdrantClient, name: str, corpus: np.ndarray, args, mode: str):
+    if client.collection_exists(name):
+        client.delete_collection(name)
+
+    client.create_collection(
+        collection_name=name,
+        vectors_config=VectorParams(
+            size=corpus.shape[1], distance=Distance.COSINE, on_disk=args.on_disk
+        ),
+        hnsw_config=HnswConfigDiff(m=args.m, ef_construct=args.ef_construct),
+        quantization_config=quantization_config(mode),
+    )
+
+    for start in range(0, len(corpus), args.batch_size):
+        batch = corpus[start:start + args.batch_size]
+        client.upsert(
+            collection_name=name,
+            points=[
+                PointStruct(id=start + i, vector=vector.tolist())
+                for i, vector in enumerate(batch)
+            ],
+            wait=True,
+        )
+
+    # Wait for the optimizer to finish building the index
+    while client.get_collection(name).status != "green":
+        time.sleep(0.5)
+
+
+def run_queries(client, name, queries, truth, k, ef, mode, rescore, oversampling):
+    quantization = None
+    if mode != "none":
+        quantization = QuantizationSearchParams(rescore=rescore, oversampling=oversampling)
+    params = SearchParams(hnsw_ef=ef, quantization=quantization)
+
+    latencies: List[float] = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        results = client.search(
+            collection_name=name,
+            query_vector=query.tolist(),
+            limit=k,
+            search_params=params,
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += len({r.id for r in results} & set(expected.tolist()))
+
+    latencies.sort()
+    return {
+        "recall": hits / (len(queries) * k),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--modes", nargs="+", default=["none", "scalar", "binary"])
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    parser.add_argument("--no-rescore", action="store_true")
+    parser.add_argument("--on-disk", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    client = QdrantClient(host=args.host, port=args.port)
+    corpus = make_corpus(args.points, args.dim, args.clusters, args.seed)
+    queries = make_queries(args.queries, args.dim, args.clusters, args.seed)
+    truth = exact_neighbours(corpus, queries, args.k)
+
+    print(f"{'mode':<8} {'ef':>5} {'recall':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in args.modes:
+        name = f"bench_tuning_{mode}"
+        build_collection(client, name, corpus, args, mode)
+        try:
+            for ef in args.ef:
+                stats = run_queries(
+                    client, name, queries, truth, args.k, ef, mode,
+                    rescore=not args.no_rescore, oversampling=args.oversampling,
+                )
+                print(
+                    f"{mode:<8} {ef:>5} {stats['recall']:>8.3f} "
+                    f"{stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+                )
+        finally:
+            client.delete_collection(name)
+
+
+if __name__ == "__main__":
+    main()
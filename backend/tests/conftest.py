@@ -0,0 +1,38 @@
+from app.models.responses import CompactResult, DetailedResult, FactCheckResult, Verdict
+import pytest
+
+
+@pytest.fixture
+def make_result():
+    """Build a small fact-check result"""
+    def make(claim: str = "Water boils at 100 degrees Celsius at sea level.") -> FactCheckResult:
+        return FactCheckResult(
+            id="result-1",
+            compact=CompactResult(
+                claim=claim, verdict=Verdict.TRUE, confidence=90.0, explanation="Well established", top_sources=[]
+            ),
+            full=DetailedResult(
+                claim=claim, verdict=Verdict.TRUE, confidence=90.0, detailed_explanation="Well established",
+                reasoning_steps=["Checked the library"], all_sources=[]
+            )
+        )
+    return make
+
+
+@pytest.fixture
+def tokenizer():
+    """A small WordPiece tokenizer with BERT-style special tokens"""
+    tokenizers = pytest.importorskip("tokenizers")
+    vocab = {"[PAD]": 0, "[UNK]": 1, "[CLS]": 2, "[SEP]": 3}
+    for word in "the study found vaccine trial patients reported mortality . ! ? , | -".split():
+        vocab[word] = len(vocab)
+    for letter in "abcdefghijklmnopqrstuvwxyz0123456789":
+        vocab[letter] = len(vocab)
+        vocab["##" + letter] = len(vocab)
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.WordPiece(vocab, unk_token="[UNK]"))
+    tokenizer.normalizer = tokenizers.normalizers.BertNormalizer()
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = tokenizers.processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)]
+    )
+    return tokenizer
@@ -0,0 +1,86 @@
+from app.core.chunking import TextChunker
+import pytest
+
+
+def make_chunker(chunk_size: int, overlap: int) -> TextChunker:
+    chunker = TextChunker()
+    chunker.chunk_size = chunk_size
+    chunker.overlap = overlap
+    return chunker
+
+
+# Output of the chunker before it became a single-pass generator
+@pytest.mark.parametrize("text, chunk_size, overlap, expected", [
+    (
+        "One two three. Four five six! Seven eight nine? Ten eleven twelve.", 6, 3,
+        ["One two three Four five six", "Four five six Seven eight nine", "Seven eight nine Ten eleven twelve."]
+    ),
+    (
+        "Alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu.", 5, 2,
+        ["Alpha beta gamma delta epsilon", "delta epsilon zeta eta theta", "eta theta iota kappa lambda",
+         "kappa lambda mu."]
+    ),
+    (
+        "  Short.\n\nLines   with\tspaces. And a final sentence without a stop", 4, 1,
+        ["Short Lines with spaces", "And a final sentence", "sentence without a stop", "stop"]
+    ),
+    ("", 10, 2, []),
+])
+def test_chunk_text_matches_previous_output(text, chunk_size, overlap, expected):
+    assert make_chunker(chunk_size, overlap).chunk_text(text) == expected
+
+
+def test_iter_chunks_offsets_point_into_cleaned_text():
+    chunker = make_chunker(8, 3)
+    text = "The study found a result. Patients reported fewer symptoms!  Mortality fell\nsharply in the trial? " * 5
+    cleaned = chunker._clean_text(text)
+
+    chunks = list(chunker.iter_chunks(text))
+    assert [chunk.text for chunk in chunks] == chunker.chunk_text(text)
+    for chunk in chunks:
+        words = chunk.text.split(" ")
+        assert chunk.word_count == len(words) <= chunker.chunk_size
+        assert cleaned[chunk.start_char:].startswith(words[0])
+        assert cleaned[:chunk.end_char].endswith(words[-1])
+
+
+def test_token_chunks_fit_the_window(tokenizer):
+    chunker = make_chunker(512, 0)
+    sentence = "the study found vaccine trial patients reported mortality"
+    text = " ".join(f"{sentence} {'abc ' * (i % 7)}." for i in range(60)) + " " + "mortality " * 300
+
+    chunks = list(chunker.iter_token_chunks(text, tokenizer, max_tokens=64, overlap_tokens=16))
+    cleaned = chunker._clean_text(text)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(chunk.token_ids) <= 64
+        assert chunk.text == cleaned[chunk.start_char:chunk.end_char]
+        assert chunk.token_ids == tokenizer.encode(chunk.text).ids
+
+
+def test_token_chunks_reject_overlap_as_large_as_the_window(tokenizer):
+    with pytest.raises(ValueError):
+        list(make_chunker(512, 0).iter_token_chunks("the study found.", tokenizer, max_tokens=10, overlap_tokens=8))
+
+
+def test_table_chunks_repeat_the_header():
+    table = "| a | b |\n|---|---|\n| 1 | 2 |\n| 3 | 4 |\n| 5 | 6 |"
+
+    chunks = list(make_chunker(8, 0).iter_table_chunks(table))
+    assert [chunk.text for chunk in chunks] == [
+        "| a | b |\n|---|---|\n| 1 | 2 |",
+        "| a | b |\n|---|---|\n| 3 | 4 |",
+        "| a | b |\n|---|---|\n| 5 | 6 |"
+    ]
+    assert all(chunk.token_ids is None for chunk in chunks)
+
+
+def test_table_chunks_sized_in_tokens(tokenizer):
+    table = "| study | trial |\n|---|---|\n" + "\n".join(f"| vaccine {i} | patients mortality |" for i in range(40))
+
+    chunks = list(make_chunker(512, 0).iter_table_chunks(table, tokenizer, max_tokens=64))
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.text.startswith("| study | trial |\n|---|---|\n")
+        assert len(chunk.token_ids) <= 64
+        assert chunk.token_ids == tokenizer.encode(chunk.text).ids
@@ -0,0 +1,74 @@
+from app.core.claims import ClaimExtractor
+from app.models.responses import CompactResult, Source, Verdict
+from app.services.llm import FactCheckService
+import pytest
+
+PAGE = (
+    "Subscribe to our newsletter for daily updates and more great stories today. "
+    "Local residents gathered in the park to enjoy the sunny afternoon together. "
+    "The World Health Organization reported 4,000 new measles cases in Europe last year. "
+    "I think the new policy will be good for everyone in the long run. "
+    "Is the vaccine really safe for children under five years old? "
+    "The weather was nice. "
+    "The World Health Organization reported 4,000 new measles cases in Europe last year. "
+    "The unemployment rate rose 3.5 percent in March according to the report"
+)
+
+
+def test_candidates_skip_furniture_opinions_questions_and_repeats():
+    assert ClaimExtractor().extract_candidates(PAGE) == [
+        "Local residents gathered in the park to enjoy the sunny afternoon together.",
+        "The World Health Organization reported 4,000 new measles cases in Europe last year.",
+        "The unemployment rate rose 3.5 percent in March according to the report.",
+    ]
+
+
+def test_limit_keeps_the_most_check_worthy_in_page_order():
+    assert ClaimExtractor().extract_candidates(PAGE, limit=2) == [
+        "The World Health Organization reported 4,000 new measles cases in Europe last year.",
+        "The unemployment rate rose 3.5 percent in March according to the report.",
+    ]
+
+
+def test_numbers_names_and_factual_terms_raise_the_score():
+    extractor = ClaimExtractor()
+    plain = extractor.score_sentence("Local residents gathered in the park to enjoy the afternoon.")
+    factual = extractor.score_sentence("The study found that deaths fell in Spain during 2020.")
+
+    assert plain == 1.0
+    assert factual > plain
+    assert extractor.score_sentence("Too short to check.") == 0.0
+
+
+def result(claim, verdict, confidence):
+    return CompactResult(claim=claim, verdict=verdict, confidence=confidence, explanation=f"{claim} checked", top_sources=[])
+
+
+def source(name):
+    return Source(name=name, url=f"https://{name}.example", excerpt=f"{name} excerpt", type="news")
+
+
+@pytest.mark.parametrize("verdicts, expected", [
+    ([Verdict.TRUE, Verdict.TRUE], Verdict.TRUE),
+    ([Verdict.TRUE, Verdict.UNCLEAR], Verdict.UNCLEAR),
+    ([Verdict.TRUE, Verdict.FALSE, Verdict.UNCLEAR], Verdict.FALSE),
+])
+def test_page_verdict_follows_its_claims(verdicts, expected):
+    sub_claims = [result(f"claim {i}", verdict, 60.0) for i, verdict in enumerate(verdicts)]
+    compact, detailed = FactCheckService()._aggregate_sub_claims("Page", sub_claims, [[] for _ in verdicts])
+
+    assert compact.verdict == detailed.verdict == expected
+    assert detailed.sub_claims == sub_claims
+
+
+def test_aggregate_counts_claims_and_interleaves_sources():
+    sub_claims = [result("a", Verdict.TRUE, 90.0), result("b", Verdict.FALSE, 60.0), result("c", Verdict.UNCLEAR, 30.0)]
+    claim_sources = [[source("x"), source("y")], [source("x"), source("z")], [source("w")]]
+
+    compact, detailed = FactCheckService()._aggregate_sub_claims("Page", sub_claims, claim_sources)
+
+    assert compact.confidence == 60.0
+    assert compact.explanation == "1 of 3 claims supported, 1 contradicted, 1 unclear"
+    assert [s.name for s in detailed.all_sources] == ["x", "w", "y", "z"]
+    assert [s.name for s in compact.top_sources] == ["x", "w", "y"]
+    assert detailed.detailed_explanation.splitlines()[1] == "False (60%): b - b checked"
@@ -0,0 +1,72 @@
+from app.config import settings
+from app.models.requests import UploadMetadata
+from app.services.document import DocumentService
+import numpy as np
+import pandas as pd
+import pytest
+
+METADATA = UploadMetadata(source_name="trial", source_type="csv")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "csv_rows_per_chunk", 3)
+    monkeypatch.setattr(settings, "chunk_size", 100)
+    return DocumentService()
+
+
+def frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "site": [f"s{i}" for i in range(rows)],
+        "patients": [100 + i for i in range(rows)],
+        "mortality": [np.nan if i == 1 else 0.5 + i for i in range(rows)],
+    })
+
+
+def test_rows_are_grouped_with_their_row_numbers(service):
+    chunks = service._csv_batch_chunks(frame(5), 10, 4, "u1", METADATA, index_numeric=True)
+
+    assert [(chunk["row_start"], chunk["row_end"]) for chunk in chunks] == [(11, 13), (14, 15)]
+    assert [chunk["chunk_index"] for chunk in chunks] == [4, 5]
+    assert chunks[0]["text"].splitlines() == [
+        "trial, rows 11-13:",
+        "site: s0 | patients: 100 | mortality: 0.5",
+        "site: s1 | patients: 101",
+        "site: s2 | patients: 102 | mortality: 2.5",
+    ]
+    assert chunks[0]["source_url"] == "upload://u1"
+    assert chunks[0]["numeric_values"] == [0.5, 2.5, 100.0, 101.0, 102.0]
+    assert "token_ids" not in chunks[0]
+
+
+def test_numeric_values_are_only_kept_when_indexed(service):
+    chunks = service._csv_batch_chunks(frame(2), 0, 0, "u1", METADATA, index_numeric=False)
+    assert "numeric_values" not in chunks[0]
+
+
+def test_word_budget_closes_a_chunk_early(service, monkeypatch):
+    # Rows are 8, 5 and 8 words long
+    monkeypatch.setattr(settings, "chunk_size", 13)
+    chunks = service._csv_batch_chunks(frame(3), 0, 0, "u1", METADATA, index_numeric=False)
+    assert [(chunk["row_start"], chunk["row_end"]) for chunk in chunks] == [(1, 2), (3, 3)]
+
+
+def test_tokens_mode_sizes_rows_in_tokens(service, tokenizer):
+    max_tokens = 40
+    chunks = service._csv_batch_chunks(frame(6), 0, 0, "u1", METADATA, False, tokenizer, max_tokens)
+
+    # By words every three rows would fit; by tokens they do not
+    assert len(chunks) > 2
+    assert [chunk["row_start"] for chunk in chunks] == sorted({chunk["row_start"] for chunk in chunks})
+    assert chunks[-1]["row_end"] == 6
+    for chunk in chunks:
+        assert chunk["token_ids"] == tokenizer.encode(chunk["text"]).ids
+        assert len(chunk["token_ids"]) <= max_tokens
+
+
+def test_overlong_row_is_left_to_model_truncation(service, tokenizer):
+    wide = pd.DataFrame({"notes": ["the study found " * 20]})
+    chunks = service._csv_batch_chunks(wide, 0, 0, "u1", METADATA, False, tokenizer, 16)
+
+    assert len(chunks) == 1
+    assert "token_ids" not in chunks[0]
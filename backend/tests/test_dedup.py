@@ -0,0 +1,123 @@
+from app.core.dedup import NearDuplicateIndex
+from app.models.requests import RetrievalFilters
+from app.services import vector_store
+from app.services.lexical import LexicalIndex, attribute_to_filters
+import pytest
+
+WIRE_STORY = (
+    "WASHINGTON (Reuters) - The health agency said on Monday that the new vaccine reduced "
+    "hospitalisations by 90 percent in a trial of 30,000 adults across twelve countries over six months"
+)
+
+
+def test_near_duplicates_are_found():
+    index = NearDuplicateIndex()
+    index.add("a", index.signature(WIRE_STORY))
+
+    assert index.find_duplicate(index.signature(WIRE_STORY + " officials said")) == "a"
+    assert index.find_duplicate(index.signature("Rainfall in Spain was below average this summer season")) is None
+
+
+def test_near_duplicates_only_match_within_their_group():
+    index = NearDuplicateIndex()
+    index.add("trusted", index.signature(WIRE_STORY), group=True)
+
+    assert index.find_duplicate(index.signature(WIRE_STORY), group=False) is None
+    assert index.find_duplicate(index.signature(WIRE_STORY), group=True) == "trusted"
+
+
+def test_removed_chunks_are_no_longer_matched():
+    index = NearDuplicateIndex()
+    index.add("a", index.signature(WIRE_STORY))
+    index.remove(["a"])
+
+    assert index.find_duplicate(index.signature(WIRE_STORY)) is None
+    assert len(index) == 0
+
+
+# One chunk owned by A with a near-duplicate from B merged into it
+MERGED_PAYLOAD = {
+    "text": WIRE_STORY, "source_name": "A", "source_url": "upload://a", "source_type": "news",
+    "page": 1, "is_trusted": True,
+    "also_in_sources": [
+        {"source_name": "B", "source_url": "upload://b", "source_type": "paper", "page": 4, "is_trusted": True}
+    ]
+}
+
+
+def merged_chunk_index() -> LexicalIndex:
+    index = LexicalIndex()
+    index.add_documents([("p1", WIRE_STORY, MERGED_PAYLOAD)])
+    return index
+
+
+def test_lexical_filters_match_merged_sources():
+    index = merged_chunk_index()
+
+    for filters in (
+        RetrievalFilters(source_names=["B"]),
+        RetrievalFilters(source_types=["paper"]),
+        RetrievalFilters(exclude_sources=["A"])  # B still provides the chunk
+    ):
+        assert index.search("vaccine trial", filters=filters)
+        # Cited as B, the provider that passes, not as the excluded or mismatched A
+        attributed = attribute_to_filters(MERGED_PAYLOAD, filters)
+        assert (attributed["source_name"], attributed["source_url"], attributed["source_type"], attributed["page"]) == (
+            "B", "upload://b", "paper", 4
+        )
+        assert attributed["also_in_sources"] == []
+        assert attributed["text"] == WIRE_STORY
+
+    assert not index.search("vaccine trial", filters=RetrievalFilters(source_names=["A"], exclude_sources=["A"]))
+    assert not index.search("vaccine trial", filters=RetrievalFilters(source_names=["C"]))
+    assert attribute_to_filters(MERGED_PAYLOAD, RetrievalFilters(source_names=["C"])) is None
+
+
+def test_unfiltered_and_own_source_matches_keep_the_owner():
+    assert attribute_to_filters(MERGED_PAYLOAD, None) is MERGED_PAYLOAD
+    attributed = attribute_to_filters(MERGED_PAYLOAD, RetrievalFilters(source_names=["A", "B"]))
+    assert attributed["source_name"] == "A"
+    assert [entry["source_name"] for entry in attributed["also_in_sources"]] == ["B"]
+
+
+def test_lexical_provenance_updates():
+    index = merged_chunk_index()
+    index.update_provenance("p1", {"source_name": "A", "source_type": "news", "is_trusted": True})
+
+    assert not index.search("vaccine trial", filters=RetrievalFilters(source_names=["B"]))
+    assert index.search("vaccine trial", filters=RetrievalFilters(source_names=["A"]))
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """A vector store without a Qdrant client, using a fresh dedup index"""
+    monkeypatch.setattr(vector_store, "near_duplicate_index", NearDuplicateIndex())
+    monkeypatch.setattr(vector_store.settings, "dedup_enabled", True)
+    return vector_store.VectorStoreService.__new__(vector_store.VectorStoreService)
+
+
+def test_duplicates_within_a_batch_are_merged_into_the_first(store):
+    payloads = [
+        {"text": WIRE_STORY, "source_name": "A", "source_type": "news", "is_trusted": True},
+        {"text": WIRE_STORY + " officials said", "source_name": "B", "source_type": "paper", "is_trusted": True},
+    ]
+    unique, provenance_updates = store._merge_near_duplicates(payloads)
+
+    assert [i for _, i in unique] == [0]
+    assert provenance_updates == {}
+    assert payloads[0]["also_in_sources"] == [{"source_name": "B", "source_type": "paper", "is_trusted": True}]
+
+
+def test_csv_row_chunks_are_never_merged(store):
+    rows = "trial, rows 1-2:\nsite: s0 | patients: 100\nsite: s1 | patients: 101"
+    payloads = [
+        {"text": rows, "source_name": "A", "source_type": "user_upload", "is_trusted": True,
+         "row_start": 1, "row_end": 2, "numeric_values": [100.0, 101.0]},
+        {"text": rows, "source_name": "A", "source_type": "user_upload", "is_trusted": True,
+         "row_start": 1, "row_end": 2, "numeric_values": [100.0, 101.0]},
+    ]
+    unique, provenance_updates = store._merge_near_duplicates(payloads)
+
+    assert [i for _, i in unique] == [0, 1]
+    assert provenance_updates == {}
+    assert len(vector_store.near_duplicate_index) == 0
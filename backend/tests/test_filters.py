@@ -0,0 +1,57 @@
+from app.models.requests import RetrievalFilters
+from app.services.vector_store import VectorStoreService
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+import pytest
+
+POINTS = {
+    1: {"source_name": "A", "source_type": "news", "is_trusted": True},
+    2: {"source_name": "B", "source_type": "paper", "is_trusted": False},
+    # Stored before the trust flag existed
+    3: {"source_name": "C", "source_type": "webpage"},
+    4: {
+        "source_name": "D", "source_type": "news", "is_trusted": True,
+        "also_in_sources": [{"source_name": "E", "source_type": "paper", "is_trusted": True}]
+    },
+}
+
+
+@pytest.fixture
+def store():
+    """A vector store over a small in-memory collection"""
+    store = VectorStoreService.__new__(VectorStoreService)
+    store.collection_name = "filters"
+    store.client = QdrantClient(location=":memory:")
+    store.client.create_collection("filters", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    store.client.upsert("filters", points=[
+        PointStruct(id=point_id, vector=[1.0, 0.0], payload=payload) for point_id, payload in POINTS.items()
+    ])
+    return store
+
+
+def matching(store, filters):
+    records, _ = store.client.scroll("filters", scroll_filter=store._build_filter(filters), limit=10)
+    return {record.id for record in records}
+
+
+def test_no_conditions_means_no_filter(store):
+    assert store._build_filter(None) is None
+    assert store._build_filter(RetrievalFilters()) is None
+
+
+@pytest.mark.parametrize("filters, expected", [
+    (RetrievalFilters(source_types=["paper"]), {2, 4}),
+    (RetrievalFilters(source_names=["A", "E"]), {1, 4}),
+    (RetrievalFilters(exclude_sources=["A", "B"]), {3, 4}),
+    (RetrievalFilters(exclude_sources=["D"]), {1, 2, 3, 4}),
+    (RetrievalFilters(trusted_only=True), {1, 3, 4}),
+    (RetrievalFilters(source_types=["paper"], trusted_only=True), {4}),
+    (RetrievalFilters(source_types=["paper"], exclude_sources=["E"]), {2}),
+])
+def test_filters_match_own_or_merged_sources(store, filters, expected):
+    assert matching(store, filters) == expected
+
+
+def test_conditions_apply_to_one_provider_at_a_time(store):
+    # D is news and E is named E, but no single provider is a news source named E
+    assert matching(store, RetrievalFilters(source_types=["news"], source_names=["E"])) == set()
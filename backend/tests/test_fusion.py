@@ -0,0 +1,75 @@
+from app.config import settings
+from app.services import retrieval
+from app.services.lexical import reciprocal_rank_fusion
+from app.services.retrieval import RetrievalService
+import pytest
+
+
+class FakeVectorStore:
+    """Serves lexical-only hits the way get_points does, dropping filtered-out ids"""
+
+    def __init__(self, points, hidden=()):
+        self.points = points
+        self.hidden = set(hidden)
+        self.requested = []
+
+    async def get_points(self, point_ids, filters=None):
+        self.requested.append(list(point_ids))
+        return [self.points[doc_id] for doc_id in point_ids if doc_id not in self.hidden]
+
+
+def chunk(doc_id, score=None):
+    return {"id": doc_id, "text": f"text {doc_id}", "score": score}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "rrf_k", 60)
+    monkeypatch.setattr(settings, "numeric_lookup_weight", 0.5)
+    return RetrievalService()
+
+
+def test_rrf_rewards_agreement_between_rankings():
+    fused = dict(reciprocal_rank_fusion([["a", "b", "c"], ["c", "b"]], k=60))
+
+    assert fused["b"] == pytest.approx(1 / 62 + 1 / 62)
+    assert fused["c"] == pytest.approx(1 / 63 + 1 / 61)
+    assert [doc_id for doc_id, _ in reciprocal_rank_fusion([["a", "b", "c"], ["c", "b"]])] == ["c", "b", "a"]
+
+
+def test_rrf_weights_scale_each_ranking():
+    fused = reciprocal_rank_fusion([["a"], ["b"]], k=0, weights=[1.0, 0.25])
+    assert fused == [("a", 1.0), ("b", 0.25)]
+
+
+async def test_fuse_merges_dense_and_lexical_hits(service, monkeypatch):
+    store = FakeVectorStore({"lex": chunk("lex"), "gone": chunk("gone")}, hidden={"gone"})
+    monkeypatch.setattr(retrieval, "vector_store_service", store)
+
+    results = await service._fuse(
+        [chunk("both", 0.8), chunk("dense", 0.7)],
+        [("lex", 9.0), ("gone", 8.0), ("both", 4.0)],
+        limit=10
+    )
+
+    assert store.requested == [["lex", "gone"]]
+    assert [result["id"] for result in results] == ["both", "lex", "dense"]
+    assert results[0]["lexical_score"] == 4.0 and results[0]["score"] == 0.8
+    assert results[1]["lexical_score"] == 9.0 and results[1]["score"] is None
+    assert results[2]["lexical_score"] is None
+    assert not any(result["numeric_match"] for result in results)
+
+
+async def test_numeric_only_hits_rank_below_agreed_chunks(service, monkeypatch):
+    monkeypatch.setattr(retrieval, "vector_store_service", FakeVectorStore({}))
+
+    results = await service._fuse(
+        [chunk("dense", 0.7)],
+        [("dense", 2.0)],
+        limit=2,
+        numeric_results=[chunk("row"), chunk("other-row")]
+    )
+
+    assert [result["id"] for result in results] == ["dense", "row"]
+    assert results[1]["numeric_match"] and not results[0]["numeric_match"]
+    assert results[0]["fused_score"] > results[1]["fused_score"]
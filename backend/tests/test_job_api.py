@@ -0,0 +1,86 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import jobs as jobs_api
+from app.services.jobs import JobManager
+from app.utils.http import FINAL_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+from app.models.responses import JobStatus
+import pytest
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = JobManager()
+    monkeypatch.setattr(jobs_api, "job_manager", manager)
+    return manager
+
+
+@pytest.fixture
+def client(manager):
+    app = FastAPI()
+    app.include_router(jobs_api.router, prefix="/api")
+    return TestClient(app)
+
+
+def test_running_job_is_revalidated_by_etag(client, manager):
+    manager.create_job("a")
+    manager.update_job("a", status=JobStatus.RUNNING, progress=10)
+
+    response = client.get("/api/job/a")
+    assert response.status_code == 200
+    assert response.json()["status"] == "running"
+    assert response.headers["Cache-Control"] == REVALIDATE_CACHE_CONTROL
+    etag = response.headers["ETag"]
+
+    unchanged = client.get("/api/job/a", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    manager.update_job("a", progress=50)
+    changed = client.get("/api/job/a", headers={"If-None-Match": f"W/{etag}"})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["progress"] == 50
+
+
+async def test_completed_job_is_cacheable(client, manager, make_result):
+    manager.create_job("a")
+    await manager.complete_job("a", make_result())
+
+    response = client.get("/api/job/a")
+    assert response.headers["Cache-Control"] == FINAL_CACHE_CONTROL
+    assert response.json()["result"]["compact"]["verdict"] == "True"
+
+
+def test_field_selection_has_its_own_etag(client, manager):
+    manager.create_job("a")
+
+    full = client.get("/api/job/a")
+    partial = client.get("/api/job/a", params={"fields": "status,progress"})
+    assert partial.json() == {"status": "queued", "progress": 0}
+    assert partial.headers["ETag"] != full.headers["ETag"]
+    assert client.get("/api/job/a", params={"fields": "status,secret"}).status_code == 400
+
+
+def test_unknown_job(client):
+    assert client.get("/api/job/missing").status_code == 404
+    assert client.delete("/api/job/missing").status_code == 404
+
+
+def test_cancel_job(client, manager):
+    manager.create_job("a")
+
+    response = client.delete("/api/job/a")
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
+    # Cancelling again is a no-op
+    assert client.delete("/api/job/a").json()["status"] == "cancelled"
+
+
+def test_finished_job_cannot_be_cancelled(client, manager):
+    manager.create_job("a")
+    manager.fail_job("a", "boom")
+
+    response = client.delete("/api/job/a")
+    assert response.status_code == 409
+    assert manager.get_job("a").status == JobStatus.FAILED
@@ -0,0 +1,102 @@
+from app.models.responses import JobStatus
+from app.services.jobs import JobManager
+import asyncio
+import json
+import os
+
+
+def make_manager(tmp_path, clock, **kwargs) -> JobManager:
+    return JobManager(ttl_seconds=60, spill_dir=str(tmp_path / "spill"), clock=lambda: clock[0], **kwargs)
+
+
+def test_jobs_expire_after_their_ttl(tmp_path):
+    clock = [1000.0]
+    manager = make_manager(tmp_path, clock)
+    manager.create_job("old")
+    clock[0] += 30
+    manager.create_job("new")
+
+    assert manager.expire_jobs(now=1059.0) == 0
+    assert manager.expire_jobs(now=1060.0) == 1
+    assert manager.get_job("old") is None
+    assert manager.get_job("new") is not None
+    assert manager.count_by_status()[JobStatus.QUEUED] == 1
+    assert manager.get_stats()["expired"] == 1
+
+
+async def test_results_past_the_memory_limit_are_spilled(tmp_path, make_result):
+    clock = [0.0]
+    manager = make_manager(tmp_path, clock, memory_limit_bytes=1)
+    manager.create_job("a")
+    assert await manager.complete_job("a", make_result())
+
+    job = manager.get_job("a")
+    stats = manager.get_stats()
+    assert job.result_spilled and job.result_json is None
+    assert stats["results_spilled"] == 1 and stats["result_memory_bytes"] == 0
+    assert json.loads(await manager.load_result(job))["compact"]["verdict"] == "True"
+
+    # Expiry deletes the spilled file with the job
+    spill_path = manager._spill_path
+    manager.expire_jobs(now=clock[0] + 60)
+    assert os.listdir(spill_path) == []
+    manager.close()
+
+
+async def test_failed_spill_keeps_results_accounted(tmp_path, make_result):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    manager = JobManager(memory_limit_bytes=1, spill_dir=str(blocker / "spill"))
+    for job_id in ("a", "b"):
+        manager.create_job(job_id)
+        await manager.complete_job(job_id, make_result())
+
+    stats = manager.get_stats()
+    assert stats["results_in_memory"] == 2 and stats["results_spilled"] == 0
+    assert stats["result_memory_bytes"] == sum(len(manager.get_job(job_id).result_json) for job_id in ("a", "b"))
+
+    # Retried, oldest first, once the spill directory is usable
+    manager.spill_root = str(tmp_path / "spill")
+    manager.create_job("c")
+    await manager.complete_job("c", make_result())
+    assert manager.get_stats()["results_spilled"] == 3
+    assert all(manager.get_job(job_id).result_spilled for job_id in ("a", "b", "c"))
+    manager.close()
+
+
+async def test_cancel_stops_the_task_and_blocks_completion(make_result):
+    manager = JobManager()
+    manager.create_job("a")
+    task = asyncio.create_task(asyncio.sleep(60))
+    manager.track_task("a", task)
+
+    job = manager.cancel_job("a")
+    assert job.status == JobStatus.CANCELLED
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert not await manager.complete_job("a", make_result())
+    assert not manager.fail_job("a", "too late")
+    assert manager.get_job("a").status == JobStatus.CANCELLED
+
+
+async def test_expired_jobs_stop_their_task(tmp_path):
+    clock = [1000.0]
+    manager = make_manager(tmp_path, clock)
+    manager.create_job("a")
+    task = asyncio.create_task(asyncio.sleep(60))
+    manager.track_task("a", task)
+
+    assert await asyncio.to_thread(manager.expire_jobs, 1060.0) == 1
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert manager.get_job("a") is None
+
+
+def test_finished_jobs_are_not_cancelled():
+    manager = JobManager()
+    manager.create_job("a")
+    manager.fail_job("a", "boom")
+
+    assert manager.cancel_job("a").status == JobStatus.FAILED
+    assert manager.cancel_job("missing") is None
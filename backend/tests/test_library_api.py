@@ -0,0 +1,52 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import library as library_api
+from app.utils.http import BOOT_ID
+import pytest
+
+
+class FakeVectorStore:
+    library_version = 3
+
+    def __init__(self, sources=None, error=None):
+        self.sources = sources or []
+        self.error = error
+
+    async def get_all_sources(self):
+        if self.error:
+            raise self.error
+        return self.sources
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(library_api.router, prefix="/api")
+    return TestClient(app)
+
+
+def test_library_listing_is_tagged_with_the_library_version(client, monkeypatch):
+    sources = [{"source_name": "A", "chunk_count": 2}]
+    monkeypatch.setattr(library_api, "vector_store_service", FakeVectorStore(sources))
+
+    response = client.get("/api/library")
+    assert response.status_code == 200
+    assert response.json() == sources
+    assert response.headers["ETag"] == f'"{BOOT_ID}.3"'
+
+    unchanged = client.get("/api/library", headers={"If-None-Match": response.headers["ETag"]})
+    assert unchanged.status_code == 304
+
+
+def test_failed_library_listing_is_an_error_without_etag(client, monkeypatch):
+    store = FakeVectorStore(error=RuntimeError("qdrant unavailable"))
+    monkeypatch.setattr(library_api, "vector_store_service", store)
+
+    response = client.get("/api/library")
+    assert response.status_code == 500
+    assert "ETag" not in response.headers
+
+    # Once the store recovers the same version is listed, not an empty library
+    store.error = None
+    store.sources = [{"source_name": "A", "chunk_count": 2}]
+    assert client.get("/api/library").json() == store.sources
@@ -0,0 +1,75 @@
+from app.config import settings
+from app.services.reranker import RerankerService
+import pytest
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "rerank_batch_size", 2)
+    monkeypatch.setattr(settings, "rerank_min_results", 2)
+    monkeypatch.setattr(settings, "rerank_score_gap", 0.15)
+    monkeypatch.setattr(settings, "rerank_budget_ms", 10000)
+    service = RerankerService()
+    service.scored_batches = []
+
+    async def score_batch(query, batch):
+        service.scored_batches.append([candidate["id"] for candidate in batch])
+        return [candidate["relevance"] for candidate in batch]
+
+    service._score_batch = score_batch
+    return service
+
+
+def candidates(*relevances):
+    return [{"id": f"c{i}", "text": f"passage {i}", "relevance": relevance} for i, relevance in enumerate(relevances)]
+
+
+async def test_scoring_stops_once_a_batch_falls_behind(service):
+    results = await service.rerank("query", candidates(0.9, 0.8, 0.3, 0.2, 0.95, 0.9), limit=2)
+
+    # The third batch is never scored, even though it would have ranked first
+    assert service.scored_batches == [["c0", "c1"], ["c2", "c3"]]
+    assert [(result["id"], result["rerank_score"]) for result in results] == [("c0", 0.9), ("c1", 0.8)]
+    stats = service.get_stats()
+    assert stats["early_stops"] == 1
+    assert stats["candidates_scored"] == 4
+
+
+async def test_competitive_batches_keep_scoring(service):
+    results = await service.rerank("query", candidates(0.5, 0.4, 0.9, 0.45), limit=2)
+
+    assert len(service.scored_batches) == 2
+    assert [result["id"] for result in results] == ["c2", "c0"]
+    assert service.get_stats()["early_stops"] == 0
+
+
+async def test_results_are_cut_at_the_first_score_gap(service):
+    results = await service.rerank("query", candidates(0.9, 0.85, 0.8, 0.4, 0.35), limit=5)
+
+    assert [result["id"] for result in results] == ["c0", "c1", "c2"]
+    assert service.get_stats()["gap_cuts"] == 1
+
+
+async def test_gap_cut_keeps_the_minimum_results(service):
+    results = await service.rerank("query", candidates(0.9, 0.3), limit=5)
+
+    assert [result["id"] for result in results] == ["c0", "c1"]
+    assert service.get_stats()["gap_cuts"] == 0
+
+
+async def test_exhausted_budget_keeps_retrieval_order(service, monkeypatch):
+    monkeypatch.setattr(settings, "rerank_budget_ms", -1)
+    results = await service.rerank("query", candidates(0.1, 0.9, 0.5), limit=2)
+
+    assert service.scored_batches == []
+    assert [(result["id"], result["rerank_score"]) for result in results] == [("c0", None), ("c1", None)]
+    assert service.get_stats()["budget_exhausted"] == 1
+
+
+async def test_scoring_errors_fall_back_to_retrieval_order(service):
+    async def broken(query, batch):
+        raise RuntimeError("model unavailable")
+
+    service._score_batch = broken
+    results = await service.rerank("query", candidates(0.1, 0.9, 0.5), limit=2)
+    assert [result["id"] for result in results] == ["c0", "c1"]
@@ -0,0 +1,110 @@
+from app.core.scheduler import BATCH, INTERACTIVE, LLMScheduler, current_client, current_lane
+import asyncio
+import pytest
+
+
+def make_scheduler(slots: int = 1, interactive_client_limit: int = 4) -> LLMScheduler:
+    return LLMScheduler(slots, {INTERACTIVE: 8.0, BATCH: 1.0}, interactive_client_limit)
+
+
+async def run_calls(scheduler: LLMScheduler, calls, order):
+    """Queue (lane, client, tag) calls behind a held slot, then release it and record the grant order"""
+    await scheduler.acquire(BATCH, "holder")
+
+    async def call(lane, client, tag):
+        await scheduler.acquire(lane, client)
+        order.append(tag)
+        await asyncio.sleep(0)
+        scheduler.release()
+
+    tasks = [asyncio.create_task(call(*entry)) for entry in calls]
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+
+async def test_interactive_calls_go_ahead_of_queued_batch_work():
+    scheduler = make_scheduler()
+    order = []
+
+    async def call(lane, client, tag):
+        await scheduler.acquire(lane, client)
+        order.append(tag)
+        await asyncio.sleep(0.01)
+        scheduler.release()
+
+    batch = [asyncio.create_task(call(BATCH, "bulk", f"b{i}")) for i in range(10)]
+    while len(order) < 3:
+        await asyncio.sleep(0.001)
+    interactive = [asyncio.create_task(call(INTERACTIVE, "user", f"i{i}")) for i in range(3)]
+    await asyncio.gather(*batch, *interactive)
+
+    # Submitted while b2 held the slot, they run before the rest of the batch queue
+    assert order[:6] == ["b0", "b1", "b2", "i0", "i1", "i2"]
+    assert scheduler.get_stats()["in_use"] == 0
+
+
+async def test_batch_keeps_its_weighted_share():
+    scheduler = make_scheduler()
+    order = []
+    calls = [(INTERACTIVE, "user", f"i{i}") for i in range(18)] + [(BATCH, "bulk", f"b{i}") for i in range(2)]
+    await run_calls(scheduler, calls, order)
+
+    # Weights 8:1 give batch one grant in every nine
+    assert order.index("b0") <= 9
+    assert order.index("b1") <= 18
+
+
+async def test_clients_share_a_lane_fairly():
+    scheduler = make_scheduler()
+    order = []
+    calls = [(BATCH, "a", f"a{i}") for i in range(6)] + [(BATCH, "b", f"b{i}") for i in range(2)]
+    await run_calls(scheduler, calls, order)
+
+    assert order[:4] == ["a0", "b0", "a1", "b1"]
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    scheduler = make_scheduler()
+    await scheduler.acquire(BATCH, "holder")
+    waiter = asyncio.create_task(scheduler.acquire(BATCH, "bulk"))
+    await asyncio.sleep(0)
+    assert scheduler.get_stats()["waiting"] == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.get_stats()["waiting"] == 0
+
+    scheduler.release()
+    assert scheduler.get_stats()["in_use"] == 0
+
+
+async def test_slot_granted_while_cancelling_is_released():
+    scheduler = make_scheduler()
+    await scheduler.acquire(BATCH, "holder")
+    waiter = asyncio.create_task(scheduler.acquire(BATCH, "bulk"))
+    await asyncio.sleep(0)
+
+    # The slot is handed over and the waiter cancelled before it runs
+    scheduler.release()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.get_stats()["in_use"] == 0
+
+
+def test_interactive_jobs_beyond_the_client_limit_run_as_batch():
+    scheduler = make_scheduler(interactive_client_limit=2)
+
+    with scheduler.job_context(INTERACTIVE, "user") as first, scheduler.job_context(INTERACTIVE, "user") as second:
+        with scheduler.job_context(INTERACTIVE, "user") as third:
+            assert (first, second, third) == (INTERACTIVE, INTERACTIVE, BATCH)
+            assert (current_lane.get(), current_client.get()) == (BATCH, "user")
+        with scheduler.job_context(INTERACTIVE, "other") as other:
+            assert other == INTERACTIVE
+
+    stats = scheduler.get_stats()
+    assert stats["demoted"] == 1 and stats["interactive_jobs"] == 0
+    with scheduler.job_context(INTERACTIVE, "user") as lane:
+        assert lane == INTERACTIVE
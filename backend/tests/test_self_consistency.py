@@ -0,0 +1,87 @@
+from app.config import settings
+from app.models.responses import Source, Verdict
+from app.services.llm import FactCheckService, SAMPLES_DISAGREED_EXPLANATION
+import asyncio
+import json
+import time
+import pytest
+
+SOURCES = [Source(name="Atlas", url="https://who.int/atlas", excerpt="Paris is the capital of France", type="paper")]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "self_consistency_samples", 3)
+    monkeypatch.setattr(settings, "self_consistency_min_agreement", 2)
+    return FactCheckService()
+
+
+def script(service, plan):
+    """Answer each sample from ``plan[seed] = (verdict, delay)``, recording which seeds finished"""
+    finished = []
+
+    async def chat(prompt, options=None):
+        verdict, delay = plan[options["seed"]]
+        await asyncio.sleep(delay)
+        finished.append(options["seed"])
+        return json.dumps({"verdict": verdict, "confidence": 80, "explanation": f"sample {options['seed']}"})
+
+    service._chat = chat
+    return finished
+
+
+async def check(service, deadline=None):
+    return await service._self_consistent_fact_check("Paris is the capital of France", SOURCES, "prompt", deadline)
+
+
+async def test_agreeing_samples_stop_early(service):
+    finished = script(service, {0: ("True", 0.01), 1: ("true", 0.02), 2: ("False", 5)})
+
+    result = await check(service)
+    assert result.verdict == Verdict.TRUE
+    assert result.explanation in ("sample 0", "sample 1")
+    assert sorted(finished) == [0, 1]
+
+    stats = service.get_consistency_stats()
+    assert stats["early_stops"] == 1
+    assert stats["samples"] == 2
+    assert stats["avg_consensus"] == 1.0
+
+
+async def test_lone_sample_past_the_budget_earns_no_consensus(service):
+    script(service, {0: ("True", 0.01), 1: ("True", 0.01), 2: ("True", 0.01)})
+    unanimous = await check(service)
+
+    lone = FactCheckService()
+    script(lone, {0: ("True", 0.01), 1: ("True", 5), 2: ("True", 5)})
+    result = await check(lone, deadline=time.monotonic() + 0.1)
+
+    assert result.verdict == Verdict.TRUE
+    assert result.confidence < unanimous.confidence
+    stats = lone.get_consistency_stats()
+    assert stats["budget_exhausted"] == 1
+    assert stats["avg_consensus"] == 0.0
+
+
+async def test_tied_samples_are_unclear_with_a_neutral_explanation(service, monkeypatch):
+    monkeypatch.setattr(settings, "self_consistency_samples", 2)
+    script(service, {0: ("True", 0.01), 1: ("False", 0.02)})
+
+    result = await check(service)
+    assert result.verdict == Verdict.UNCLEAR
+    assert result.explanation == SAMPLES_DISAGREED_EXPLANATION
+
+
+async def test_failed_samples_are_discarded(service):
+    script(service, {0: ("True", 0.01), 1: ("True", 0.02), 2: ("True", 0.03)})
+    chat = service._chat
+
+    async def flaky(prompt, options=None):
+        if options["seed"] == 0:
+            return "not json"
+        return await chat(prompt, options)
+
+    service._chat = flaky
+    result = await check(service)
+    assert result.verdict == Verdict.TRUE
+    assert service.get_consistency_stats()["samples"] == 2
@@ -0,0 +1,75 @@
+from app.core.sources import SourceManager
+import numpy as np
+import pytest
+
+URLS = [
+    "https://pubmed.ncbi.nlm.nih.gov/123456/",
+    "https://www.who.int/news/item/measles",
+    "https://www.bbc.com/news/health?ref=who.int",
+    "https://arxiv.org/abs/2401.00001",
+    "https://www.biorxiv.org/content/10.1101/2024",
+    "https://scholar.google.com/scholar?q=vaccine",
+    "https://example.com/blog/cdc.gov-mirror",
+    "https://nhs.uk.example.net/fake",
+    "https://unknown.example.org/",
+    "upload://3f1c",
+    "",
+]
+
+
+def scan_lookup(manager: SourceManager, url: str):
+    """Trust flag and priority as the original linear scans computed them"""
+    if any(blocked in url for blocked in manager.user_blocked_sources):
+        trusted = False
+    elif any(source in url for source in manager.user_trusted_sources):
+        trusted = True
+    else:
+        trusted = any(source.base_url in url for source in manager.trusted_sources)
+
+    priority = next((source.priority for source in manager.trusted_sources if source.base_url in url), 999)
+    return trusted, priority
+
+
+@pytest.fixture
+def manager():
+    manager = SourceManager()
+    manager.add_user_trusted_source("example.com")
+    manager.add_user_trusted_source("upload://")
+    manager.add_user_blocked_source("bbc.com/news/health")
+    manager.add_user_blocked_source("nih.gov/123")
+    return manager
+
+
+def test_lookup_matches_the_linear_scan(manager):
+    for url in URLS:
+        assert manager.lookup(url) == scan_lookup(manager, url), url
+        assert manager.is_trusted_source(url) == scan_lookup(manager, url)[0]
+        assert manager.get_source_priority(url) == scan_lookup(manager, url)[1]
+
+
+def test_first_listed_default_decides_priority(manager):
+    # Blocked, but still ranked as the WHO source listed before the BBC
+    assert manager.lookup("https://www.bbc.com/news/health?ref=who.int") == (False, 1)
+    assert manager.lookup("https://www.bbc.com/sport?ref=arxiv.org") == (True, 3)
+
+
+def test_list_changes_invalidate_cached_lookups(manager):
+    url = "https://unknown.example.org/"
+    assert manager.lookup(url) == (False, 999)
+
+    manager.add_user_trusted_source("unknown.example.org")
+    assert manager.lookup(url) == (True, 999)
+    manager.add_user_blocked_source("example.org")
+    assert manager.lookup(url) == (False, 999)
+    manager.set_user_trusted_sources([])
+    assert manager.lookup("upload://3f1c") == scan_lookup(manager, "upload://3f1c") == (False, 999)
+
+
+def test_lookup_many_returns_aligned_arrays(manager):
+    trusted, priority = manager.lookup_many(URLS)
+
+    expected = [scan_lookup(manager, url) for url in URLS]
+    assert trusted.dtype == bool and priority.dtype == np.int64
+    assert trusted.tolist() == [flag for flag, _ in expected]
+    assert priority.tolist() == [rank for _, rank in expected]
+    assert [array.tolist() for array in manager.lookup_many([])] == [[], []]
@@ -0,0 +1,62 @@
+from app.config import settings
+from app.models.responses import Verdict
+from app.services import triage
+from app.services.llm import FactCheckService
+from app.services.triage import DECISION_REASONING, TriageService
+import pytest
+
+CLAIM = "The vaccine trial reduced hospital admissions by ninety percent"
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "triage_enabled", True)
+    monkeypatch.setattr(settings, "triage_min_evidence_score", 0.55)
+    monkeypatch.setattr(settings, "triage_min_rerank_score", 0.5)
+    monkeypatch.setattr(settings, "triage_min_term_coverage", 0.6)
+    monkeypatch.setattr(triage.reranker_service, "model_name", None)
+    return TriageService()
+
+
+def test_dense_score_is_compared_to_its_own_threshold(service):
+    assert service._has_evidence(CLAIM, [{"text": "unrelated", "score": 0.6}])
+    assert not service._has_evidence(CLAIM, [{"text": "unrelated", "score": 0.5}])
+    assert not service._has_evidence(CLAIM, [])
+
+
+def test_numeric_matches_are_evidence(service):
+    assert service._has_evidence(CLAIM, [{"text": "site: s1 | admissions: 90", "numeric_match": True}])
+
+
+def test_rerank_score_only_counts_with_a_reranker(service, monkeypatch):
+    results = [{"text": "unrelated", "score": 0.1, "rerank_score": 0.9}]
+    assert not service._has_evidence(CLAIM, results)
+
+    monkeypatch.setattr(triage.reranker_service, "model_name", "cross-encoder")
+    assert service._has_evidence(CLAIM, results)
+    assert not service._has_evidence(CLAIM, [{"text": "unrelated", "score": 0.1, "rerank_score": 0.2}])
+
+
+def test_lexical_hits_need_term_coverage(service):
+    covering = {"text": "In the vaccine trial, hospital admissions fell by ninety percent", "lexical_score": 3.2}
+    partial = {"text": "The vaccine trial enrolled adults", "lexical_score": 7.5}
+
+    assert service._has_evidence(CLAIM, [covering])
+    assert not service._has_evidence(CLAIM, [partial])
+
+
+def test_weak_evidence_is_answered_as_no_evidence(service):
+    decision, result = service.after_retrieval(CLAIM, [{"text": "unrelated", "score": 0.2}], [])
+    assert decision == "no_evidence"
+    assert result.verdict == Verdict.UNCLEAR
+    assert service.after_retrieval(CLAIM, [{"text": "unrelated", "score": 0.9}], []) is None
+
+
+def test_triaged_results_explain_their_decision(service):
+    decision, compact = service.before_retrieval("hello there")
+    assert decision == "non_claim"
+
+    detailed = FactCheckService()._triaged_detailed_result(compact, [], decision)
+    assert detailed.reasoning_steps == DECISION_REASONING["non_claim"][0]
+    assert detailed.limitations == DECISION_REASONING["non_claim"][1]
+    assert len({tuple(steps) for steps, _ in DECISION_REASONING.values()}) == len(DECISION_REASONING)
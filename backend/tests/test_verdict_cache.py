@@ -0,0 +1,79 @@
+from app.models.requests import RetrievalFilters
+from app.models.responses import CompactResult, Verdict
+from app.services.verdict_cache import VerdictCache
+
+CLAIM = "Water boils at 100 degrees Celsius at sea level."
+
+
+def compact(claim=CLAIM, verdict=Verdict.TRUE):
+    return CompactResult(claim=claim, verdict=verdict, confidence=90.0, explanation="Well established", top_sources=[])
+
+
+def test_exact_hits_ignore_case_whitespace_and_punctuation():
+    cache = VerdictCache()
+    cache.put(CLAIM, None, compact())
+
+    assert cache.get("  water boils at 100 degrees   celsius at sea level!") is not None
+    assert cache.get(CLAIM, RetrievalFilters(source_types=["paper"])) is None
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_library_change_drops_every_entry():
+    cache = VerdictCache()
+    cache.put(CLAIM, None, compact(), [1.0, 0.0], library_version=3)
+    assert cache.get(CLAIM, library_version=3) is not None
+
+    assert cache.get(CLAIM, library_version=4) is None
+    assert cache.get_similar(CLAIM, [1.0, 0.0], library_version=4) is None
+    assert len(cache) == 0
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_results_verified_against_an_older_library_are_not_stored():
+    cache = VerdictCache()
+    cache.get(CLAIM, library_version=5)
+    cache.put(CLAIM, None, compact(), library_version=4)
+
+    assert len(cache) == 0
+    assert cache.get(CLAIM, library_version=5) is None
+
+
+def test_paraphrases_reuse_the_nearest_verdict():
+    cache = VerdictCache(similarity_threshold=0.9)
+    cache.put(CLAIM, None, compact(), [1.0, 0.0])
+    cache.put("Paris is the capital of France.", None, compact("Paris is the capital of France."), [0.0, 1.0])
+
+    result, similarity = cache.get_similar("At sea level water boils at 100 degrees Celsius.", [0.99, 0.1])
+    assert result.claim == CLAIM
+    assert similarity > 0.99
+    assert cache.get_similar("Something else entirely.", [0.7, 0.7]) is None
+
+
+def test_negated_paraphrases_are_rejected():
+    cache = VerdictCache(similarity_threshold=0.9)
+    cache.put(CLAIM, None, compact(), [1.0, 0.0])
+
+    assert cache.get_similar("Water does not boil at 100 degrees Celsius at sea level.", [1.0, 0.01]) is None
+    assert cache.get_similar("Water doesn't boil at 100 degrees Celsius at sea level.", [1.0, 0.01]) is None
+    assert cache.get_stats()["semantic_rejected"] == 2
+
+
+def test_paraphrases_with_different_numbers_are_rejected():
+    cache = VerdictCache(similarity_threshold=0.9)
+    cache.put(CLAIM, None, compact(), [1.0, 0.0])
+
+    assert cache.get_similar("Water boils at 90 degrees Celsius at sea level.", [1.0, 0.01]) is None
+    assert cache.get_similar("At sea level, water boils at 100 degrees Celsius.", [1.0, 0.01]) is not None
+
+
+def test_evicted_entries_leave_the_semantic_index():
+    cache = VerdictCache(max_size=2, similarity_threshold=0.9)
+    cache.put("First claim about rivers.", None, compact("First claim about rivers."), [1.0, 0.0, 0.0])
+    cache.put("Second claim about lakes.", None, compact("Second claim about lakes."), [0.0, 1.0, 0.0])
+    cache.put("Third claim about seas.", None, compact("Third claim about seas."), [0.0, 0.0, 1.0])
+
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_similar("First claim about rivers.", [1.0, 0.0, 0.0]) is None
+    # The row swapped into the evicted slot still maps to its own verdict
+    result, _ = cache.get_similar("Third claim about seas.", [0.0, 0.0, 1.0])
+    assert result.claim == "Third claim about seas."
@@ -23,18 +23,30 @@ export const useFactCheck = (): UseFactCheckReturn => {
   const MAX_ATTEMPTS = 10;
 
   const timeoutRef = useRef<number | null>(null);
+  const activeJobRef = useRef<string | null>(null);
+
+  // Stop waiting on the current job and cancel it on the server
+  const abandonActiveJob = useCallback(() => {
+    const jobId = activeJobRef.current;
+    activeJobRef.current = null;
+    if (jobId) {
+      factCheckService.cancelJob(jobId).catch(() => {});
+    }
+  }, []);
 
   const startRetrievingJobStatus = useCallback((jobId: string) => {
     // Clear any existing timeout
     if (timeoutRef.current) {
       clearInterval(timeoutRef.current);
     }
+    abandonActiveJob();
+    activeJobRef.current = jobId;
     
     // Set new timeout
     timeoutRef.current = setInterval(() => {
       fetchJobStatus(jobId);
     }, 2000);
-  }, []);
+  }, [abandonActiveJob]);
 
   const fetchJobStatus = useCallback(async (jobId: string) => {
     console.log('Fetching job status for jobId:', jobId);
@@ -49,11 +61,16 @@ export const useFactCheck = (): UseFactCheckReturn => {
         setResults(prev => [status.result!, ...prev]);
       } else if (status.status === 'failed' && status.error) {
         setError(status.error);
+      } else if (status.status === 'cancelled') {
+        setError('Fact-check was cancelled');
       } else {
         setAttemptCount((prev) => (prev ?? 0) + 1);
         return;
       }
 
+      if (activeJobRef.current === jobId) {
+        activeJobRef.current = null;
+      }
       setIsLoading(false);
       clearInterval(timeoutRef.current!);
     } catch (error) {
@@ -76,6 +93,16 @@ export const useFactCheck = (): UseFactCheckReturn => {
     }
   };
 
+  // A check still running when the component goes away is not needed any more
+  useEffect(() => {
+    return () => {
+      if (timeoutRef.current) {
+        clearInterval(timeoutRef.current);
+      }
+      abandonActiveJob();
+    };
+  }, [abandonActiveJob]);
+
   const addResult = useCallback((result: FactCheckResult) => {
     setResults(prev => [result, ...prev]);
   }, []);
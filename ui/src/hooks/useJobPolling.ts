@@ -30,6 +30,8 @@ export const useJobPolling = ({
   
   const intervalRef = useRef<number | null>(null);
   const abortControllerRef = useRef<AbortController | null>(null);
+  const activeJobRef = useRef<string | null>(null);
+  const settledJobRef = useRef<string | null>(null);
 
   const stopPolling = useCallback(() => {
     if (intervalRef.current) {
@@ -47,6 +49,9 @@ export const useJobPolling = ({
     if (attempts >= JOB_POLLING.maxAttempts) {
       onError('Job polling timed out');
       stopPolling();
+      // Nobody is waiting for the result any more
+      factCheckService.cancelJob(jobId).catch(() => {});
+      settledJobRef.current = jobId;
       return;
     }
 
@@ -58,12 +63,19 @@ export const useJobPolling = ({
       setProgress(jobStatus.progress || 0);
       setAttempts(prev => prev + 1);
 
+      if (['completed', 'failed', 'cancelled'].includes(jobStatus.status)) {
+        settledJobRef.current = jobId;
+      }
+
       if (jobStatus.status === 'completed' && jobStatus.result) {
         onComplete(jobStatus.result);
         stopPolling();
       } else if (jobStatus.status === 'failed') {
         onError(jobStatus.error || 'Job failed');
         stopPolling();
+      } else if (jobStatus.status === 'cancelled') {
+        onError('Job was cancelled');
+        stopPolling();
       }
     } catch (err) {
       if (err instanceof Error && err.name === 'AbortError') {
@@ -102,6 +114,24 @@ export const useJobPolling = ({
     };
   }, [stopPolling]);
 
+  // Cancel a job that is still running once it is abandoned, on unmount or when jobId changes
+  useEffect(() => {
+    if (!jobId) {
+      return;
+    }
+    activeJobRef.current = jobId;
+
+    return () => {
+      activeJobRef.current = null;
+      // Deferred so a remount polling the same job (React StrictMode) keeps it alive
+      setTimeout(() => {
+        if (activeJobRef.current !== jobId && settledJobRef.current !== jobId) {
+          factCheckService.cancelJob(jobId).catch(() => {});
+        }
+      }, 0);
+    };
+  }, [jobId]);
+
   return {
     status,
     progress,
@@ -4,12 +4,17 @@ import { apiClient } from "./api";
 
 export class FactCheckService {
   async submitCheck(input: FactCheckInput): Promise<JobResponse> {
-    return apiClient.post<JobResponse>('/api/check', input);
+    // Someone is waiting on the result; API clients default to the batch lane
+    return apiClient.post<JobResponse>('/api/check', { priority: 'interactive', ...input });
   }
 
   async getJobStatus(jobId: string): Promise<JobStatusResponse> {
     return apiClient.get<JobStatusResponse>(`/api/job/${jobId}`);
   }
+
+  async cancelJob(jobId: string): Promise<JobStatusResponse> {
+    return apiClient.delete<JobStatusResponse>(`/api/job/${jobId}`);
+  }
 }
 
 export const factCheckService = new FactCheckService();
\ No newline at end of file
@@ -1,12 +1,12 @@
 export interface JobResponse {
   job_id: string;
-  status: 'queued' | 'running' | 'completed' | 'failed';
+  status: 'queued' | 'running' | 'completed' | 'failed' | 'cancelled';
   estimated_seconds?: number;
 }
 
 export interface JobStatusResponse {
   job_id: string;
-  status: 'queued' | 'running' | 'completed' | 'failed';
+  status: 'queued' | 'running' | 'completed' | 'failed' | 'cancelled';
   result?: FactCheckResult;
   error?: string;
   progress?: number;
@@ -2,6 +2,7 @@ export interface FactCheckInput {
   claim?: string;
   url?: string;
   type: 'claim' | 'url' | 'upload';
+  priority?: 'interactive' | 'batch';
 }
 
 export interface UploadMetadata {